@@ -28,6 +28,76 @@ def create_app(config_name=None):
     # Initialize extensions
     init_extensions(app)
 
+    # Liveness/readiness probes and background dependency checks
+    from app.core.health import register_health
+
+    register_health(app)
+
+    # Sampled request tracing with spans exported as OTLP/JSON
+    from app.core.tracing import register_tracing
+
+    register_tracing(app)
+
+    # Circuit breakers and request deadlines for outbound calls
+    from app.core.resilience import register_resilience
+
+    register_resilience(app)
+
+    # Async views: pooled async HTTP client, closed with per-view loops
+    from app.core.async_http import register_async_http
+
+    register_async_http(app)
+
+    # Cross-worker cache invalidation (``flask cache invalidate <namespace>``)
+    from app.core.invalidation import register_cache_bus
+
+    register_cache_bus(app)
+
+    # Server-sent event relays and their cache of completed results
+    from app.core.sse import register_sse
+
+    register_sse(app)
+
+    # Serve content from a snapshot segment shared by all workers
+    from app.models.snapshot import register_content_snapshot
+
+    register_content_snapshot(app)
+
+    # Report worker memory (private vs shared) on /metrics
+    from app.core.memory import register_memory_metrics
+
+    register_memory_metrics(app)
+
+    # Per-request allocation accounting and tracemalloc diffs (MEMORY_TRACING)
+    from app.core.allocations import register_allocations
+
+    register_allocations(app)
+
+    # Minify template HTML once, when each template is compiled
+    from app.core.minify import register_minify
+
+    register_minify(app)
+
+    # Register per-request analytics events and the local store when selected
+    from app.analytics import register_analytics
+
+    register_analytics(app)
+
+    # Classify crawlers: no analytics, cached pages and their own metrics
+    from app.analytics.bots import register_bots
+
+    register_bots(app)
+
+    # Expose in-process metrics for Prometheus
+    from app.core.metrics import register_metrics
+
+    register_metrics(app)
+
+    # Label request threads for the on-demand sampling profiler
+    from app.core.profiler import register_profiler
+
+    register_profiler(app)
+
     # Register Vite asset helper as Jinja context processor
     from app.core.utils import get_vite_asset
 
@@ -36,6 +106,21 @@ def create_app(config_name=None):
         """Make vite_asset function available in templates."""
         return dict(vite_asset=get_vite_asset)
 
+    # Register content-hashed static URLs and their cache headers
+    from app.core.static_files import register_static_urls
+
+    register_static_urls(app)
+
+    # Register preload Link headers for critical assets
+    from app.core.early_hints import register_early_hints
+
+    register_early_hints(app)
+
+    # Register responsive image variants and the responsive_image helper
+    from app.core.images import register_images
+
+    register_images(app)
+
     # Register hero configuration as Jinja context processor
     from config.base import HeroConfig
 
@@ -55,6 +140,16 @@ def create_app(config_name=None):
     register_error_handlers(app)
     register_offline_route(app)
 
+    # Serve the service worker with its precache manifest
+    from app.core.service_worker import register_service_worker
+
+    register_service_worker(app)
+
+    # Register CLI commands
+    from app.core.commands import register_commands
+
+    register_commands(app)
+
     # Add SEO routes
     @app.route("/robots.txt")
     def robots_txt():
@@ -102,4 +197,20 @@ Sitemap: {request.url_root.rstrip("/")}/sitemap.xml""",
             mimetype="application/xml",
         )
 
+    # Shed load by priority when requests queue too long (wraps the WSGI app)
+    from app.core.admission import register_admission_control
+
+    register_admission_control(app)
+
+    # Answer scanner probes before Flask dispatch (wraps the WSGI app)
+    from app.core.scanners import register_scanner_filter
+
+    register_scanner_filter(app)
+
+    # Take the client address from the trusted proxy (wraps the WSGI app)
+    if app.config["PROXY_FIX_X_FOR"]:
+        from werkzeug.middleware.proxy_fix import ProxyFix
+
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config["PROXY_FIX_X_FOR"])
+
     return app
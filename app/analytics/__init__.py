@@ -0,0 +1,73 @@
+"""Analytics sinks, storage and rollups."""
+
+import os
+from urllib.parse import urlsplit
+
+from flask import Flask, current_app, has_request_context, request
+
+from app.core.utils import emit_route_event, start_request_timer
+
+from .rollups import RollupStore
+from .store import EventStore
+
+ANALYTICS_SINKS = {"posthog", "local", "both"}
+
+
+def register_analytics(app: Flask) -> None:
+    """Emit route events per request and set up the local sink when selected."""
+    # One merged event per tracked request, sent after the response is built
+    app.before_request(start_request_timer)
+    app.after_request(emit_route_event)
+
+    sink = app.config.get("ANALYTICS_SINK", "posthog")
+    if sink not in ANALYTICS_SINKS:
+        app.logger.warning(f"Unknown ANALYTICS_SINK {sink!r} - using posthog")
+        app.config["ANALYTICS_SINK"] = sink = "posthog"
+
+    if sink in ("local", "both"):
+        directory = app.config.get("ANALYTICS_STORE_DIR") or os.path.join(
+            app.instance_path, "analytics"
+        )
+        app.extensions["event_store"] = EventStore(
+            directory, segment_rows=app.config["ANALYTICS_SEGMENT_ROWS"]
+        )
+        app.extensions["analytics_rollups"] = RollupStore(
+            os.path.join(directory, "rollups.json"),
+            save_interval=app.config["ANALYTICS_ROLLUP_SAVE_INTERVAL"],
+            logger=app.logger,
+        )
+        app.logger.info(f"Local analytics store at {directory}")
+
+
+def _external_referrer(referrer: str | None) -> str | None:
+    """Referrer host, ignoring navigation within the site."""
+    if not referrer:
+        return None
+    host = urlsplit(referrer).hostname
+    if not host or (has_request_context() and host == request.host.split(":")[0]):
+        return None
+    return host
+
+
+def record_local_event(name: str, metadata: dict | None = None) -> None:
+    """Append an event to the local store and update the rollups."""
+    metadata = metadata or {}
+    route = metadata.get("route")
+    visitor = None
+    if has_request_context():
+        route = route or request.endpoint
+        visitor = f"{request.remote_addr}|{request.headers.get('User-Agent', '')}"
+
+    event_store = current_app.extensions.get("event_store")
+    if event_store is not None:
+        event_store.append(name, route or "")
+
+    rollups = current_app.extensions.get("analytics_rollups")
+    if rollups is not None:
+        rollups.record(
+            name,
+            route=route or "",
+            visitor=visitor,
+            referrer=_external_referrer(metadata.get("referrer")),
+            project=metadata.get("project_title"),
+        )
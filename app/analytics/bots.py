@@ -0,0 +1,157 @@
+"""Crawler and uptime-checker detection.
+
+Bots are classified once per user agent (memoized in a bounded LRU), are
+left out of analytics, and get their HTML pages from a small in-process
+cache. Bot copies are cached by the app only: they are sent as ``private``
+rather than with ``Vary: User-Agent``, which would split every shared cache
+entry by user agent string.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from flask import Flask, Response, current_app, g, request
+
+from app.core.admission import LEVEL_DEGRADED, load_level, shed_response
+from app.core.health import WARM_UP_ENVIRON_KEY
+from app.core.invalidation import on_invalidate
+from app.core.metrics import metrics
+
+# Category -> user agent fragments; the earliest match in the string decides
+BOT_PATTERNS = {
+    "search": r"googlebot|bingbot|slurp|duckduckbot|baiduspider|yandex(?:bot)?"
+    r"|applebot|petalbot|seznambot|sogou",
+    "social": r"facebookexternalhit|facebot|twitterbot|linkedinbot|slackbot"
+    r"|discordbot|telegrambot|whatsapp|pinterest|redditbot|embedly",
+    "monitor": r"uptimerobot|pingdom|statuscake|site24x7|betteruptime|uptime-kuma"
+    r"|healthcheck|kube-probe|elb-healthchecker|googlehc|monitor",
+    "seo": r"ahrefsbot|semrushbot|mj12bot|dotbot|rogerbot|screaming frog|dataforseo",
+    "ai": r"gptbot|chatgpt-user|oai-searchbot|claudebot|anthropic-ai|ccbot"
+    r"|perplexitybot|bytespider|amazonbot|google-extended",
+    "tool": r"curl/|wget/|python-requests|python-urllib|httpx|aiohttp|go-http-client"
+    r"|java/|okhttp|libwww-perl|headlesschrome|phantomjs|lighthouse",
+    "crawler": r"bot/|\bbot\b|crawl|spider|scrape|archiver|fetcher",
+}
+
+# One alternation with a named group per category
+BOT_RE = re.compile(
+    "|".join(f"(?P<{name}>{pattern})" for name, pattern in BOT_PATTERNS.items()),
+    re.IGNORECASE,
+)
+
+metrics.counter("bot_requests_total", "Requests from crawlers by category")
+metrics.counter("bot_page_cache_total", "Bot page cache lookups by result")
+
+
+@lru_cache(maxsize=2048)
+def classify_user_agent(user_agent: str) -> str | None:
+    """
+    Bot category of a user agent, or None for browsers.
+
+    A missing or empty user agent says nothing about the client (privacy
+    tools and some proxies strip it), so it is treated as a browser.
+    """
+    match = BOT_RE.search(user_agent)
+    return match.lastgroup if match else None
+
+
+class PageCache:
+    """Bounded LRU of rendered pages with a time-to-live."""
+
+    def __init__(self, size: int, ttl: float):
+        """Keep at most ``size`` pages for ``ttl`` seconds each."""
+        self.size = size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._pages: OrderedDict[str, tuple[float, bytes, str]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bytes, str] | None:
+        """Cached ``(body, mimetype)`` if present and fresh."""
+        with self._lock:
+            entry = self._pages.get(key)
+            if entry is None:
+                return None
+            stored, body, mimetype = entry
+            if time.monotonic() - stored > self.ttl:
+                del self._pages[key]
+                return None
+            self._pages.move_to_end(key)
+            return body, mimetype
+
+    def put(self, key: str, body: bytes, mimetype: str) -> None:
+        """Store a page, evicting the least recently used."""
+        with self._lock:
+            self._pages[key] = (time.monotonic(), body, mimetype)
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.size:
+                self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached page."""
+        with self._lock:
+            self._pages.clear()
+
+
+def classify_request():
+    """Tag bot requests and answer them from the page cache when possible."""
+    if request.environ.get(WARM_UP_ENVIRON_KEY):
+        # Worker warm-up renders pages for itself: not a visitor, not a bot
+        g.bot = "warm-up"
+        return None
+    g.bot = classify_user_agent(request.headers.get("User-Agent", ""))
+    if g.bot is None:
+        return None
+
+    metrics.inc("bot_requests_total", category=g.bot)
+    cache = current_app.extensions.get("bot_page_cache")
+    cached = None
+    if cache is not None and request.method == "GET" and not request.cookies:
+        cached = cache.get(request.full_path)
+        metrics.inc("bot_page_cache_total", result="hit" if cached else "miss")
+    if cached is None:
+        # Under load, crawlers only get pages that are already rendered
+        if load_level() >= LEVEL_DEGRADED:
+            return shed_response("bot")
+        return None
+    g.bot_cache_hit = True
+    body, mimetype = cached
+    return Response(body, mimetype=mimetype)
+
+
+def cache_bot_response(response: Response) -> Response:
+    """Give bot page responses cache headers and keep them for reuse."""
+    if (
+        g.get("bot") is None
+        or request.method != "GET"
+        or response.status_code != 200
+        or response.mimetype != "text/html"
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Set-Cookie" in response.headers
+        or response.cache_control.no_store
+        or response.cache_control.private
+    ):
+        return response
+
+    max_age = current_app.config["BOT_CACHE_MAX_AGE"]
+    # Private: shared caches must not hand bot copies (no analytics) to people
+    response.headers["Cache-Control"] = f"private, max-age={max_age}"
+
+    cache = current_app.extensions.get("bot_page_cache")
+    if cache is not None and not g.get("bot_cache_hit") and not request.cookies:
+        cache.put(request.full_path, response.get_data(), response.mimetype)
+    return response
+
+
+def register_bots(app: Flask) -> None:
+    """Classify every request and serve cached pages to crawlers."""
+    if app.config.get("BOT_PAGE_CACHE_SIZE"):
+        cache = app.extensions["bot_page_cache"] = PageCache(
+            app.config["BOT_PAGE_CACHE_SIZE"], app.config["BOT_PAGE_CACHE_TTL"]
+        )
+        on_invalidate(app, "pages", cache.clear)
+    app.before_request(classify_request)
+    app.after_request(cache_bot_response)
@@ -0,0 +1,33 @@
+"""CLI commands for the local analytics store."""
+
+import time
+
+import click
+from flask import current_app
+
+from app.core.commands import analytics_cli
+
+
+@analytics_cli.command("report")
+@click.option("--hours", type=float, default=None, help="Only the last N hours.")
+@click.option("--top", type=int, default=10, help="Rows per table.")
+def report_command(hours, top):
+    """Print event and route counts from the local store."""
+    event_store = current_app.extensions.get("event_store")
+    if event_store is None:
+        raise click.ClickException("Set ANALYTICS_SINK=local or both to use this")
+
+    since = time.time() - hours * 3600 if hours else None
+    started = time.perf_counter()
+    events = event_store.count_by("ev", since=since)
+    routes = event_store.count_by("rt", since=since)
+    elapsed = time.perf_counter() - started
+
+    click.echo(
+        f"{sum(events.values())} events in {len(event_store.segments())} segments"
+    )
+    for title, counts in (("Events", events), ("Routes", routes)):
+        click.echo(f"\n{title}:")
+        for name, count in counts.most_common(top):
+            click.echo(f"  {count:>10}  {name or '-'}")
+    click.echo(f"\nScanned in {elapsed:.3f}s")
@@ -0,0 +1,325 @@
+"""Incremental analytics rollups persisted as mergeable per-worker deltas.
+
+Each worker counts events into an in-memory delta, and a background thread
+periodically merges it into one shared JSON file under a file lock, so
+requests never wait on the file. Counters add up, and the per-day sketches
+(HyperLogLog for unique visitors, count-min top-k for referrers and
+projects) merge losslessly, so the shared file stays the same size no
+matter how many events it summarises.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+
+from .sketches import HyperLogLog, TopK
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines; single process there
+    fcntl = None
+
+# Bucket size in seconds and number of buckets kept per granularity
+GRANULARITIES = {"minute": (60, 24 * 60), "hour": (3600, 7 * 24), "day": (86400, 365)}
+
+# Days of unique-visitor sketches kept
+VISITOR_DAYS = 30
+
+# Days of top referrer/project sketches kept; the dashboard shows today's
+TOP_DAYS = 2
+
+# Stores to save at exit, held weakly so that discarded apps can go
+_stores: "weakref.WeakSet[RollupStore]" = weakref.WeakSet()
+
+
+class Rollups:
+    """Time-bucketed counters and sketches for one stream of events."""
+
+    def __init__(self):
+        """Create empty rollups."""
+        self.counts: dict[str, dict[int, dict[str, int]]] = {
+            granularity: {} for granularity in GRANULARITIES
+        }
+        self.visitors: dict[int, HyperLogLog] = {}
+        self.referrers: dict[int, TopK] = {}
+        self.projects: dict[int, TopK] = {}
+
+    def record(
+        self,
+        event: str,
+        route: str = "",
+        visitor: str | None = None,
+        referrer: str | None = None,
+        project: str | None = None,
+        timestamp: float | None = None,
+    ) -> None:
+        """Count one event in every granularity and update the sketches."""
+        if timestamp is None:
+            timestamp = time.time()
+        keys = ("total", f"event:{event}", f"route:{route}")
+
+        for granularity, (size, _keep) in GRANULARITIES.items():
+            bucket = int(timestamp // size * size)
+            counters = self.counts[granularity].setdefault(bucket, {})
+            for key in keys:
+                counters[key] = counters.get(key, 0) + 1
+
+        day = int(timestamp // 86400 * 86400)
+        if visitor:
+            self.visitors.setdefault(day, HyperLogLog()).add(visitor)
+        if referrer:
+            self.referrers.setdefault(day, TopK()).add(referrer)
+        if project:
+            self.projects.setdefault(day, TopK()).add(project)
+
+    def merge(self, other: "Rollups") -> None:
+        """Add another set of rollups into this one."""
+        for granularity, buckets in other.counts.items():
+            mine = self.counts[granularity]
+            for bucket, counters in buckets.items():
+                target = mine.setdefault(bucket, {})
+                for key, count in counters.items():
+                    target[key] = target.get(key, 0) + count
+
+        for mine, theirs in (
+            (self.visitors, other.visitors),
+            (self.referrers, other.referrers),
+            (self.projects, other.projects),
+        ):
+            for day, sketch in theirs.items():
+                if day in mine:
+                    mine[day].merge(sketch)
+                else:
+                    mine[day] = type(sketch).from_dict(sketch.to_dict())
+
+    def prune(self, now: float) -> None:
+        """Drop buckets older than each granularity's retention."""
+        for granularity, (size, keep) in GRANULARITIES.items():
+            oldest = now - size * keep
+            buckets = self.counts[granularity]
+            for bucket in [b for b in buckets if b < oldest]:
+                del buckets[bucket]
+
+        for days, keep in (
+            (self.visitors, VISITOR_DAYS),
+            (self.referrers, TOP_DAYS),
+            (self.projects, TOP_DAYS),
+        ):
+            oldest_day = now - 86400 * keep
+            for day in [d for d in days if d < oldest_day]:
+                del days[day]
+
+    def _sum(self, granularity: str, since: float) -> dict[str, int]:
+        """Sum counters of all buckets starting at or after ``since``."""
+        totals: dict[str, int] = {}
+        for bucket, counters in self.counts[granularity].items():
+            if bucket >= since:
+                for key, count in counters.items():
+                    totals[key] = totals.get(key, 0) + count
+        return totals
+
+    def _uniques(self, since: float) -> int:
+        """Estimated unique visitors over the days since ``since``."""
+        merged = HyperLogLog()
+        for day, sketch in self.visitors.items():
+            if day >= since:
+                merged.merge(sketch)
+        return merged.count()
+
+    @staticmethod
+    def _top(days: dict[int, TopK], day: int, top: int) -> list[tuple[str, int]]:
+        """Heaviest items of one day's top-k sketch."""
+        sketch = days.get(day)
+        return sketch.top(top) if sketch is not None else []
+
+    def summary(self, now: float | None = None, top: int = 10) -> dict:
+        """
+        Dashboard figures, computed from a bounded number of buckets.
+
+        The cost depends on the retention settings, not on event volume.
+        """
+        if now is None:
+            now = time.time()
+        hour_start = int(now // 3600 * 3600)
+        day_start = int(now // 86400 * 86400)
+
+        last_hour = self._sum("minute", now - 3600)
+        last_day = self._sum("hour", hour_start - 23 * 3600)
+        last_week = self._sum("day", day_start - 6 * 86400)
+
+        def ranked(prefix: str) -> list[tuple[str, int]]:
+            items = [
+                (key.removeprefix(prefix), count)
+                for key, count in last_day.items()
+                if key.startswith(prefix)
+            ]
+            return sorted(items, key=lambda kv: kv[1], reverse=True)[:top]
+
+        hourly = self.counts["hour"]
+        daily = self.counts["day"]
+        return {
+            "generated_at": now,
+            "events_last_hour": last_hour.get("total", 0),
+            "events_last_day": last_day.get("total", 0),
+            "events_last_week": last_week.get("total", 0),
+            "unique_visitors_today": self._uniques(day_start),
+            "unique_visitors_week": self._uniques(day_start - 6 * 86400),
+            "top_routes": ranked("route:"),
+            "top_events": ranked("event:"),
+            "top_referrers": self._top(self.referrers, day_start, top),
+            "top_projects": self._top(self.projects, day_start, top),
+            "hourly": [
+                (bucket, hourly.get(bucket, {}).get("total", 0))
+                for bucket in range(hour_start - 23 * 3600, hour_start + 1, 3600)
+            ],
+            "daily": [
+                (bucket, daily.get(bucket, {}).get("total", 0))
+                for bucket in range(day_start - 13 * 86400, day_start + 1, 86400)
+            ],
+        }
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON-compatible dict."""
+        return {
+            "counts": {
+                granularity: {str(bucket): c for bucket, c in buckets.items()}
+                for granularity, buckets in self.counts.items()
+            },
+            "visitors": {str(day): s.to_dict() for day, s in self.visitors.items()},
+            "referrers": {str(day): s.to_dict() for day, s in self.referrers.items()},
+            "projects": {str(day): s.to_dict() for day, s in self.projects.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Rollups":
+        """Deserialize from a dict produced by to_dict()."""
+        rollups = cls()
+        for granularity, buckets in data.get("counts", {}).items():
+            if granularity in rollups.counts:
+                rollups.counts[granularity] = {
+                    int(bucket): counters for bucket, counters in buckets.items()
+                }
+        rollups.visitors = {
+            int(day): HyperLogLog.from_dict(sketch)
+            for day, sketch in data.get("visitors", {}).items()
+        }
+        # Files from before the sketches were per day hold one all-time
+        # sketch (keyed "k", "sketch", "items"); it cannot be windowed
+        rollups.referrers = {
+            int(day): TopK.from_dict(sketch)
+            for day, sketch in data.get("referrers", {}).items()
+            if day.isdigit()
+        }
+        rollups.projects = {
+            int(day): TopK.from_dict(sketch)
+            for day, sketch in data.get("projects", {}).items()
+            if day.isdigit()
+        }
+        return rollups
+
+
+class RollupStore:
+    """Shared rollups file fed by per-worker in-memory deltas."""
+
+    def __init__(self, path: str, save_interval: float = 10.0, logger=None):
+        """Initialize the store; deltas are merged every ``save_interval``."""
+        self.path = path
+        self.save_interval = save_interval
+        self.logger = logger
+        self._lock = threading.Lock()
+        self._thread_pid: int | None = None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._reset()
+        _stores.add(self)
+
+    def _reset(self) -> None:
+        """Start an empty delta for the current process."""
+        self._pid = os.getpid()
+        self._delta = Rollups()
+
+    def record(self, event: str, **fields) -> None:
+        """Count one event; the save thread merges it into the file later."""
+        self._ensure_thread()
+        with self._lock:
+            if os.getpid() != self._pid:
+                # Forked worker: the parent's unsaved delta is not ours
+                self._reset()
+            self._delta.record(event, **fields)
+
+    def _ensure_thread(self) -> None:
+        """Start the save thread once per process (threads do not fork)."""
+        if self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+        threading.Thread(
+            target=_save_loop,
+            args=(weakref.ref(self), self.save_interval),
+            name="rollup-save",
+            daemon=True,
+        ).start()
+
+    def _read(self) -> Rollups:
+        """Read the shared rollups file."""
+        try:
+            with open(self.path) as f:
+                return Rollups.from_dict(json.load(f))
+        except (FileNotFoundError, ValueError):
+            return Rollups()
+
+    def save(self) -> None:
+        """Merge this worker's delta into the shared file."""
+        with self._lock:
+            if os.getpid() != self._pid:
+                return
+            delta, self._delta = self._delta, Rollups()
+        if not delta.counts["minute"]:
+            # Nothing recorded since the last save
+            return
+
+        with open(f"{self.path}.lock", "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            rollups = self._read()
+            rollups.merge(delta)
+            rollups.prune(time.time())
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(rollups.to_dict(), f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+
+    def snapshot(self) -> Rollups:
+        """Shared rollups plus this worker's unsaved delta."""
+        rollups = self._read()
+        with self._lock:
+            if os.getpid() == self._pid:
+                rollups.merge(self._delta)
+        return rollups
+
+
+def _save_loop(ref: "weakref.ref[RollupStore]", interval: float) -> None:
+    """Save a store every ``interval`` seconds until it is discarded."""
+    while True:
+        time.sleep(interval)
+        store = ref()
+        if store is None:
+            return
+        try:
+            store.save()
+        except OSError as e:
+            if store.logger is not None:
+                store.logger.warning(f"Saving analytics rollups failed: {e}")
+        del store
+
+
+@atexit.register
+def _save_stores() -> None:
+    """Merge the deltas still unsaved when the process exits."""
+    for store in list(_stores):
+        store.save()
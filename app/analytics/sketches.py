@@ -0,0 +1,149 @@
+"""Mergeable probabilistic sketches for analytics rollups."""
+
+import base64
+import hashlib
+import math
+from array import array
+
+
+def hash64(value: str, salt: bytes = b"") -> int:
+    """Stable 64-bit hash of a string."""
+    digest = hashlib.blake2b(value.encode(), digest_size=8, salt=salt).digest()
+    return int.from_bytes(digest, "big")
+
+
+class HyperLogLog:
+    """HyperLogLog cardinality estimator (about 1.6% error at p=12)."""
+
+    def __init__(self, p: int = 12, registers: bytes | None = None):
+        """Initialize with 2**p registers."""
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(registers or bytes(self.m))
+
+    def add(self, value: str) -> None:
+        """Add a value to the set."""
+        h = hash64(value)
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct values."""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0**-r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Small-range correction (linear counting)
+            estimate = self.m * math.log(self.m / zeros)
+        return round(estimate)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        """Union with another sketch of the same precision."""
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON-compatible dict."""
+        return {"p": self.p, "registers": base64.b64encode(self.registers).decode()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "HyperLogLog":
+        """Deserialize from a dict produced by to_dict()."""
+        return cls(data["p"], base64.b64decode(data["registers"]))
+
+
+class CountMinSketch:
+    """Count-min sketch for approximate per-item counts."""
+
+    def __init__(self, width: int = 1024, depth: int = 4, table: bytes | None = None):
+        """Initialize a depth x width table of counters."""
+        self.width = width
+        self.depth = depth
+        self.table = array("Q", table or bytes(8 * width * depth))
+
+    def _cells(self, item: str):
+        """Table indexes of an item, one per row (double hashing)."""
+        h1 = hash64(item)
+        h2 = hash64(item, salt=b"cms") | 1
+        return [
+            row * self.width + (h1 + row * h2) % self.width for row in range(self.depth)
+        ]
+
+    def add(self, item: str, count: int = 1) -> int:
+        """Add to an item's count and return its new estimate."""
+        cells = self._cells(item)
+        for cell in cells:
+            self.table[cell] += count
+        return min(self.table[cell] for cell in cells)
+
+    def estimate(self, item: str) -> int:
+        """Estimated count of an item (never below the true count)."""
+        return min(self.table[cell] for cell in self._cells(item))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        """Add another sketch of the same shape."""
+        self.table = array("Q", map(sum, zip(self.table, other.table, strict=True)))
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON-compatible dict."""
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "table": base64.b64encode(self.table.tobytes()).decode(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CountMinSketch":
+        """Deserialize from a dict produced by to_dict()."""
+        return cls(data["width"], data["depth"], base64.b64decode(data["table"]))
+
+
+class TopK:
+    """Heavy hitters: a count-min sketch plus the k largest candidates."""
+
+    def __init__(self, k: int = 20, sketch: CountMinSketch | None = None):
+        """Track the k most frequent items."""
+        self.k = k
+        self.sketch = sketch or CountMinSketch()
+        self.candidates: dict[str, int] = {}
+
+    def add(self, item: str, count: int = 1) -> None:
+        """Count an item and keep it if it is among the top k."""
+        estimate = self.sketch.add(item, count)
+        self._offer(item, estimate)
+
+    def _offer(self, item: str, estimate: int) -> None:
+        """Keep an item if it beats the smallest candidate."""
+        if item in self.candidates or len(self.candidates) < self.k:
+            self.candidates[item] = estimate
+            return
+        smallest = min(self.candidates, key=self.candidates.get)
+        if estimate > self.candidates[smallest]:
+            del self.candidates[smallest]
+            self.candidates[item] = estimate
+
+    def top(self, n: int | None = None) -> list[tuple[str, int]]:
+        """Items with their estimated counts, largest first."""
+        ranked = sorted(self.candidates.items(), key=lambda kv: kv[1], reverse=True)
+        return ranked[:n]
+
+    def merge(self, other: "TopK") -> None:
+        """Merge another top-k; candidates are re-estimated from the union."""
+        self.sketch.merge(other.sketch)
+        items = set(self.candidates) | set(other.candidates)
+        self.candidates = {}
+        for item in items:
+            self._offer(item, self.sketch.estimate(item))
+
+    def to_dict(self) -> dict:
+        """Serialize to a JSON-compatible dict."""
+        return {"k": self.k, "sketch": self.sketch.to_dict(), "items": self.candidates}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "TopK":
+        """Deserialize from a dict produced by to_dict()."""
+        top = cls(data["k"], CountMinSketch.from_dict(data["sketch"]))
+        top.candidates = dict(data["items"])
+        return top
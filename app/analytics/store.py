@@ -0,0 +1,218 @@
+"""Local columnar event store with memory-mapped, segment-rotated files.
+
+Each segment is a set of column files named ``<pid>-<token>-<seq>.<column>``:
+
+- ``.ts`` - event timestamps (float64, seconds since the epoch)
+- ``.ev`` - event name codes (uint32)
+- ``.rt`` - route codes (uint32)
+- ``.str`` - JSON string table mapping codes back to strings
+
+Every worker process writes its own segments, so no locking is needed
+across processes. The random token keeps a reused PID (PID 1 after a
+container restart, or a second store in one process) from writing into
+another writer's segments. Readers memory-map the column files and scan
+them through memoryviews without materialising rows as Python objects.
+"""
+
+import atexit
+import json
+import mmap
+import os
+import threading
+import time
+import uuid
+import weakref
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+COLUMNS = {"ts": "d", "ev": "I", "rt": "I"}
+
+# Stores to flush at exit, held weakly so that discarded apps can go
+_stores: "weakref.WeakSet[EventStore]" = weakref.WeakSet()
+
+
+class EventStore:
+    """Append-only columnar store for analytics events."""
+
+    def __init__(
+        self,
+        directory: str,
+        segment_rows: int = 1_000_000,
+        flush_rows: int = 256,
+        flush_interval: float = 5.0,
+    ):
+        """Initialize the store; events are buffered and flushed in batches."""
+        self.directory = directory
+        self.segment_rows = segment_rows
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._start_process()
+        _stores.add(self)
+
+    def _start_process(self) -> None:
+        """Reset writer state; called on creation and after a fork."""
+        self._pid = os.getpid()
+        self._token = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._new_segment()
+
+    def _new_segment(self) -> None:
+        """Start a new, empty segment with its own string table."""
+        self._seq += 1
+        self._segment = os.path.join(
+            self.directory, f"{self._pid}-{self._token}-{self._seq:06d}"
+        )
+        self._strings: list[str] = []
+        self._codes: dict[str, int] = {}
+        self._strings_written = 0
+        self._segment_count = 0
+        self._buffers = {column: array(code) for column, code in COLUMNS.items()}
+        self._last_flush = time.monotonic()
+
+    def _code(self, value: str) -> int:
+        """Dictionary-encode a string for the current segment."""
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self._strings)
+            self._strings.append(value)
+        return code
+
+    def append(self, event: str, route: str = "", timestamp: float | None = None):
+        """Buffer one event, flushing when the batch is full or old enough."""
+        with self._lock:
+            if os.getpid() != self._pid:
+                # Forked worker: never write into the parent's segment files
+                self._start_process()
+
+            self._buffers["ts"].append(
+                timestamp if timestamp is not None else time.time()
+            )
+            self._buffers["ev"].append(self._code(event))
+            self._buffers["rt"].append(self._code(route or ""))
+
+            pending = len(self._buffers["ts"])
+            if (
+                pending >= self.flush_rows
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            ):
+                self._flush_locked()
+
+    def flush(self) -> None:
+        """Write buffered events to the current segment."""
+        with self._lock:
+            if os.getpid() == self._pid:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        """Write buffered events; the caller holds the lock."""
+        self._last_flush = time.monotonic()
+        rows = len(self._buffers["ts"])
+        if not rows:
+            return
+
+        # Strings first, so every code a reader sees can be resolved
+        if len(self._strings) != self._strings_written:
+            tmp_path = f"{self._segment}.str.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._strings, f)
+            os.replace(tmp_path, f"{self._segment}.str")
+            self._strings_written = len(self._strings)
+
+        for column, buffer in self._buffers.items():
+            with open(f"{self._segment}.{column}", "ab") as f:
+                buffer.tofile(f)
+            del buffer[:]
+
+        self._segment_count += rows
+        if self._segment_count >= self.segment_rows:
+            self._new_segment()
+
+    def segments(self) -> list[str]:
+        """Paths (without extension) of all segments, oldest first."""
+        names = {
+            name.rsplit(".", 1)[0]
+            for name in os.listdir(self.directory)
+            if name.endswith(".str")
+        }
+        return sorted(
+            (os.path.join(self.directory, name) for name in names),
+            key=lambda path: os.path.getmtime(f"{path}.str"),
+        )
+
+    @contextmanager
+    def open_segment(self, segment: str):
+        """
+        Memory-map a segment's columns.
+
+        Yields ``(columns, strings)`` where columns are memoryviews of equal
+        length, or None if the segment has no rows yet.
+        """
+        with ExitStack() as stack:
+            views = {}
+            for column, code in COLUMNS.items():
+                with open(f"{segment}.{column}", "rb") as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        yield None
+                        return
+                    mapped = stack.enter_context(
+                        mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    )
+                view = stack.enter_context(memoryview(mapped))
+                itemsize = array(code).itemsize
+                usable = len(view) - len(view) % itemsize
+                views[column] = stack.enter_context(view[:usable].cast(code))
+
+            # A concurrent flush may have extended some columns already
+            rows = min(len(view) for view in views.values())
+            columns = {
+                column: stack.enter_context(view[:rows])
+                for column, view in views.items()
+            }
+            with open(f"{segment}.str") as f:
+                strings = json.load(f)
+            yield columns, strings
+
+    def count_by(
+        self, column: str = "ev", since: float | None = None, until: float | None = None
+    ) -> Counter:
+        """
+        Count events per event name (``ev``) or route (``rt``).
+
+        Timestamps are appended in order within a segment, so the time range
+        is located by binary search on the mapped timestamp column.
+        """
+        self.flush()
+        totals = Counter()
+        for segment in self.segments():
+            try:
+                with self.open_segment(segment) as opened:
+                    if opened is None:
+                        continue
+                    columns, strings = opened
+                    ts = columns["ts"]
+                    lo = bisect_left(ts, since) if since is not None else 0
+                    hi = bisect_left(ts, until) if until is not None else len(ts)
+                    if lo >= hi:
+                        continue
+                    with columns[column][lo:hi] as codes:
+                        counts = Counter(codes)
+                    for code, count in counts.items():
+                        totals[strings[code]] += count
+            except FileNotFoundError:
+                continue
+        return totals
+
+    def total(self, since: float | None = None, until: float | None = None) -> int:
+        """Number of events in a time range."""
+        return sum(self.count_by("ev", since, until).values())
+
+
+@atexit.register
+def _flush_stores() -> None:
+    """Write out the events still buffered when the process exits."""
+    for store in list(_stores):
+        store.flush()
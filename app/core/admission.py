@@ -0,0 +1,194 @@
+"""Admission control: shed load by priority before a worker falls behind.
+
+nginx stamps each proxied request with ``X-Request-Start: t=<epoch seconds>``.
+The time between that stamp and the moment a worker picks the request up is
+its queue time. Together with this worker's in-flight count, it sets the
+load level. The in-flight limit only means something where a worker serves
+requests concurrently: by default it is reached when every request thread
+of the worker is busy (gunicorn ``gthread`` threads, or ``ASGI_THREADS``),
+and a single-threaded worker is judged by queue time alone.
+
+- ``LEVEL_OK``: everything is served.
+- ``LEVEL_DEGRADED``: low-priority paths (admin dashboards) get a fast 503.
+  Served requests skip non-essential work: no analytics events, and
+  crawlers only get pages that are already in the bot page cache.
+- ``LEVEL_OVERLOADED``: the request has waited so long it cannot be served
+  in time, so normal requests get a 503 too.
+
+Probes and static files are never shed.
+"""
+
+import threading
+import time
+
+from flask import Flask, Response, current_app, request
+from werkzeug.wsgi import ClosingIterator
+
+from app.core.metrics import metrics
+
+LEVEL_OK = 0
+LEVEL_DEGRADED = 1
+LEVEL_OVERLOADED = 2
+
+# WSGI environ key carrying the load level into the Flask app
+LOAD_LEVEL_ENVIRON_KEY = "kusse.load_level"
+
+# Queue times beyond this are clock or proxy misconfiguration, not load
+MAX_PLAUSIBLE_QUEUE = 3600.0
+
+metrics.counter("admission_shed_total", "Requests answered 503 by priority")
+metrics.counter("request_queue_seconds_total", "Time requests spent queued")
+metrics.counter("request_queue_samples_total", "Requests with a queue time")
+
+
+def parse_request_start(value: str | None, now: float) -> float | None:
+    """
+    Queue time in seconds from an ``X-Request-Start`` header.
+
+    Accepts ``t=<seconds>`` (nginx ``$msec``) as well as milliseconds and
+    microseconds since the epoch, with or without the ``t=`` prefix.
+    """
+    if not value:
+        return None
+    try:
+        started = float(value.strip().removeprefix("t="))
+    except ValueError:
+        return None
+    if started > 1e14:
+        started /= 1e6
+    elif started > 1e11:
+        started /= 1e3
+    queued = now - started
+    if queued > MAX_PLAUSIBLE_QUEUE:
+        return None
+    return max(queued, 0.0)
+
+
+class AdmissionControl:
+    """WSGI middleware rejecting work the worker cannot serve in time."""
+
+    body = b"Service temporarily overloaded"
+
+    def __init__(self, wsgi_app, app: Flask):
+        """Wrap ``wsgi_app`` using the admission settings of ``app``."""
+        self.wsgi_app = wsgi_app
+        config = app.config
+        self.degrade_queue = config["ADMISSION_DEGRADE_QUEUE_MS"] / 1000
+        self.reject_queue = config["ADMISSION_REJECT_QUEUE_MS"] / 1000
+        self.configured_max_in_flight = config["ADMISSION_MAX_IN_FLIGHT"]
+        self.max_in_flight = self.configured_max_in_flight
+        self.retry_after = str(config["ADMISSION_RETRY_AFTER"])
+        self.critical_prefixes = tuple(config["ADMISSION_CRITICAL_PREFIXES"])
+        self.low_priority_prefixes = tuple(config["ADMISSION_LOW_PRIORITY_PREFIXES"])
+        static_path = app.static_url_path.rstrip("/") + "/"
+        self.critical_prefixes += (static_path,)
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def set_concurrency(self, threads: int) -> None:
+        """Derive the in-flight limit from the worker's request threads."""
+        if self.configured_max_in_flight is not None:
+            return
+        # Degraded once a request takes the last free thread
+        self.max_in_flight = threads - 1 if threads > 1 else None
+
+    def priority(self, environ) -> str:
+        """``critical``, ``normal`` or ``low`` for a request."""
+        path = environ.get("PATH_INFO", "")
+        if path.startswith(self.critical_prefixes):
+            return "critical"
+        if path.startswith(self.low_priority_prefixes):
+            return "low"
+        return "normal"
+
+    def load_level(self, queued: float | None, in_flight: int) -> int:
+        """Load level from the request's queue time and the in-flight count."""
+        if queued is not None and queued >= self.reject_queue:
+            return LEVEL_OVERLOADED
+        if (queued is not None and queued >= self.degrade_queue) or (
+            self.max_in_flight is not None and in_flight > self.max_in_flight
+        ):
+            return LEVEL_DEGRADED
+        return LEVEL_OK
+
+    def __call__(self, environ, start_response):
+        """Admit, degrade or shed the request."""
+        priority = self.priority(environ)
+        if priority == "critical":
+            return self.wsgi_app(environ, start_response)
+
+        queued = parse_request_start(environ.get("HTTP_X_REQUEST_START"), time.time())
+        if queued is not None:
+            metrics.inc("request_queue_seconds_total", queued)
+            metrics.inc("request_queue_samples_total")
+
+        with self._lock:
+            self.in_flight += 1
+            in_flight = self.in_flight
+        level = self.load_level(queued, in_flight)
+
+        if level == LEVEL_OVERLOADED or (level and priority == "low"):
+            self._release()
+            metrics.inc("admission_shed_total", priority=priority)
+            return self._reject(start_response)
+
+        environ[LOAD_LEVEL_ENVIRON_KEY] = level
+        try:
+            app_iter = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self._release()
+            raise
+        # Streamed responses stay in flight until their iterator is closed
+        return ClosingIterator(app_iter, [self._release])
+
+    def _release(self) -> None:
+        """One request fewer in flight."""
+        with self._lock:
+            self.in_flight -= 1
+
+    def _reject(self, start_response):
+        """Fast 503 with Retry-After."""
+        start_response(
+            "503 Service Unavailable",
+            [
+                ("Content-Type", "text/plain; charset=utf-8"),
+                ("Content-Length", str(len(self.body))),
+                ("Retry-After", self.retry_after),
+                ("Cache-Control", "no-store"),
+            ],
+        )
+        return [self.body]
+
+
+def load_level() -> int:
+    """Load level of the current request (LEVEL_OK outside admission control)."""
+    return request.environ.get(LOAD_LEVEL_ENVIRON_KEY, LEVEL_OK)
+
+
+def shed_response(priority: str) -> Response:
+    """503 for work dropped inside the app (e.g. uncached bot renders)."""
+    metrics.inc("admission_shed_total", priority=priority)
+    response = Response(AdmissionControl.body, status=503, mimetype="text/plain")
+    response.headers["Retry-After"] = str(current_app.config["ADMISSION_RETRY_AFTER"])
+    response.headers["Cache-Control"] = "no-store"
+    return response
+
+
+def register_admission_control(app: Flask) -> None:
+    """Put admission control in front of the Flask application."""
+    if not app.config.get("ADMISSION_CONTROL", True):
+        return
+    middleware = app.extensions["admission"] = AdmissionControl(app.wsgi_app, app)
+    app.wsgi_app = middleware
+    metrics.gauge(
+        "admission_in_flight",
+        "Requests in flight in this worker",
+        lambda: middleware.in_flight,
+    )
+
+
+def set_worker_concurrency(app: Flask, threads: int) -> None:
+    """Tell admission control how many requests the worker serves at once."""
+    middleware = app.extensions.get("admission")
+    if middleware is not None:
+        middleware.set_concurrency(threads)
@@ -0,0 +1,244 @@
+"""Opt-in allocation accounting and tracemalloc snapshot diffs.
+
+With ``MEMORY_TRACING`` enabled, tracemalloc runs in every worker and each
+request records, per endpoint:
+
+- peak bytes: the most memory the request had allocated at once;
+- retained bytes: memory still allocated when the request ended;
+- blocks: the net change in allocated memory blocks
+  (``sys.getallocatedblocks()``).
+
+Together these separate routes that churn through memory from routes that
+leak it. tracemalloc's counters are process-wide, so with threaded workers
+concurrent requests are attributed to each other; the numbers are exact
+with sync workers.
+
+Snapshots are taken every ``MEMORY_SNAPSHOT_INTERVAL`` seconds. The
+``/admin/memory`` endpoint diffs the latest snapshot against the first, or
+against the previous one, so allocation sites that keep growing stand out.
+Tracing costs CPU and memory, so it is off by default.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+
+from flask import Flask, g, request
+
+from app.core.metrics import metrics
+
+# Allocations made by the tracing machinery itself
+SNAPSHOT_FILTERS = tuple(
+    tracemalloc.Filter(inclusive=False, filename_pattern=pattern)
+    for pattern in (
+        tracemalloc.__file__,
+        "<frozen importlib._bootstrap>",
+        "<frozen importlib._bootstrap_external>",
+        "<unknown>",
+    )
+)
+
+
+class AllocationStats:
+    """Per-endpoint allocation totals."""
+
+    def __init__(self):
+        """Start with no requests recorded."""
+        self._lock = threading.Lock()
+        self.endpoints: dict[str, dict[str, float]] = {}
+
+    def record(self, endpoint: str, peak: int, retained: int, blocks: int) -> None:
+        """Add one request's allocations."""
+        with self._lock:
+            totals = self.endpoints.setdefault(
+                endpoint,
+                {"requests": 0, "peak": 0, "max_peak": 0, "retained": 0, "blocks": 0},
+            )
+            totals["requests"] += 1
+            totals["peak"] += peak
+            totals["max_peak"] = max(totals["max_peak"], peak)
+            totals["retained"] += retained
+            totals["blocks"] += blocks
+
+    def samples(self, field: str) -> dict[tuple, float]:
+        """One field per endpoint for the metrics registry."""
+        with self._lock:
+            return {
+                (("endpoint", endpoint),): totals[field]
+                for endpoint, totals in self.endpoints.items()
+            }
+
+    def summary(self) -> list[dict]:
+        """Per-request averages by endpoint, heaviest peak first."""
+        with self._lock:
+            rows = [
+                {
+                    "endpoint": endpoint,
+                    "requests": totals["requests"],
+                    "avg_peak_bytes": totals["peak"] // totals["requests"],
+                    "max_peak_bytes": totals["max_peak"],
+                    "avg_retained_bytes": totals["retained"] // totals["requests"],
+                    "avg_blocks": totals["blocks"] / totals["requests"],
+                }
+                for endpoint, totals in self.endpoints.items()
+            ]
+        return sorted(rows, key=lambda row: row["avg_peak_bytes"], reverse=True)
+
+
+class SnapshotHistory:
+    """The first, previous and latest tracemalloc snapshots of a worker."""
+
+    def __init__(self, interval: float):
+        """Take a snapshot every ``interval`` seconds once started."""
+        self.interval = interval
+        self.baseline: tracemalloc.Snapshot | None = None
+        self.previous: tracemalloc.Snapshot | None = None
+        self.latest: tracemalloc.Snapshot | None = None
+        self.taken_at: float | None = None
+        self._lock = threading.Lock()
+        self._thread_pid: int | None = None
+
+    def take(self) -> tracemalloc.Snapshot:
+        """Take a snapshot now."""
+        snapshot = tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+        with self._lock:
+            if self.baseline is None:
+                self.baseline = snapshot
+            self.previous, self.latest = self.latest, snapshot
+            self.taken_at = time.time()
+        return snapshot
+
+    def diff(self, against: str = "baseline", key: str = "lineno", limit: int = 25):
+        """Top allocation sites by growth since the baseline or previous snapshot."""
+        with self._lock:
+            older = self.baseline if against == "baseline" else self.previous
+            latest = self.latest
+        if older is None or latest is None or older is latest:
+            return []
+        stats = latest.compare_to(older, key)
+        return [
+            {
+                "site": [
+                    f"{frame.filename}:{frame.lineno}" for frame in stat.traceback
+                ],
+                "size_diff": stat.size_diff,
+                "size": stat.size,
+                "count_diff": stat.count_diff,
+                "count": stat.count,
+            }
+            for stat in stats[:limit]
+        ]
+
+    def ensure_thread(self) -> None:
+        """Start the periodic snapshot thread once per process."""
+        if self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+        threading.Thread(
+            target=self._snapshot_loop, name="tracemalloc-snapshots", daemon=True
+        ).start()
+
+    def _snapshot_loop(self) -> None:
+        """Take snapshots for as long as tracing is on."""
+        while tracemalloc.is_tracing():
+            self.take()
+            time.sleep(self.interval)
+
+
+allocation_stats = AllocationStats()
+
+
+def start_allocation_tracking() -> None:
+    """Note the memory in use as the request starts."""
+    tracemalloc.reset_peak()
+    g.allocations_start = (tracemalloc.get_traced_memory()[0], sys.getallocatedblocks())
+
+
+def record_request_allocations(exc=None) -> None:
+    """Attribute the request's allocations to its endpoint."""
+    start = g.pop("allocations_start", None)
+    if start is None:
+        return
+    current, peak = tracemalloc.get_traced_memory()
+    start_bytes, start_blocks = start
+    allocation_stats.record(
+        request.endpoint or "unmatched",
+        peak=max(peak - start_bytes, 0),
+        retained=current - start_bytes,
+        blocks=sys.getallocatedblocks() - start_blocks,
+    )
+
+
+def measure_allocations(client, path: str, repeat: int = 5, **kwargs) -> dict:
+    """
+    Allocations of one route, for benchmark tests.
+
+    The route is requested once to warm caches, then ``repeat`` times; the
+    smallest peak and retained sizes are returned, which filters out noise
+    from unrelated lazy initialization.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        client.get(path, **kwargs).close()
+        peaks, retained = [], []
+        for _ in range(repeat):
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            client.get(path, **kwargs).close()
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return {"peak": min(peaks), "retained": min(retained)}
+
+
+def register_allocations(app: Flask) -> None:
+    """Trace allocations per request and take periodic snapshots (opt-in)."""
+    if not app.config.get("MEMORY_TRACING"):
+        return
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(app.config["MEMORY_TRACING_FRAMES"])
+    history = app.extensions["memory_snapshots"] = SnapshotHistory(
+        app.config["MEMORY_SNAPSHOT_INTERVAL"]
+    )
+
+    def start_snapshots():
+        history.ensure_thread()
+
+    app.before_request(start_snapshots)
+    app.before_request(start_allocation_tracking)
+    app.teardown_request(record_request_allocations)
+
+    metrics.gauge(
+        "request_alloc_requests_total",
+        "Requests measured by allocation tracing, by endpoint",
+        lambda: allocation_stats.samples("requests"),
+        kind="counter",
+    )
+    metrics.gauge(
+        "request_alloc_peak_bytes_total",
+        "Sum of per-request peak allocated bytes, by endpoint",
+        lambda: allocation_stats.samples("peak"),
+        kind="counter",
+    )
+    metrics.gauge(
+        "request_alloc_retained_bytes_total",
+        "Sum of bytes still allocated after each request, by endpoint",
+        lambda: allocation_stats.samples("retained"),
+        kind="counter",
+    )
+    metrics.gauge(
+        "tracemalloc_traced_bytes",
+        "Memory currently traced by tracemalloc",
+        lambda: tracemalloc.get_traced_memory()[0],
+    )
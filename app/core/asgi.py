@@ -0,0 +1,107 @@
+"""ASGI deployment mode: the Flask app behind a WSGI-to-ASGI adapter.
+
+Under an ASGI server (uvicorn) every request runs the WSGI app in a thread
+from a bounded pool, while async views are driven on the server's event
+loop. Upstream calls awaited by async views then share one loop and one
+pooled connection set per worker, so connections stay alive across
+requests. The request's pool thread still waits for its view to finish,
+so this does not serve more requests at once than the pool has threads.
+
+asgiref's own ``WsgiToAsgi`` runs every request in one shared thread and
+never closes the WSGI response, which would serialize the app and leak
+admission-control slots; the adapter here fixes both.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from flask import Flask
+
+from app.core.admission import set_worker_concurrency
+from app.core.async_http import ASGI_ENVIRON_KEY
+
+DEFAULT_THREADS = 32
+
+
+class _AdapterInstance(WsgiToAsgiInstance):
+    """One request: the WSGI app runs in the adapter's thread pool."""
+
+    def __init__(self, wsgi_application, executor: ThreadPoolExecutor):
+        """Run ``wsgi_application`` on ``executor``."""
+        super().__init__(wsgi_application)
+        self.executor = executor
+
+    def build_environ(self, scope, body):
+        """WSGI environ marked as served on a lasting event loop."""
+        environ = super().build_environ(scope, body)
+        environ[ASGI_ENVIRON_KEY] = True
+        return environ
+
+    async def run_wsgi_app(self, body):
+        """Run the WSGI app off the event loop."""
+        await sync_to_async(
+            self._run_wsgi_app, thread_sensitive=False, executor=self.executor
+        )(body)
+
+    def _run_wsgi_app(self, body):
+        """Send the response as the app yields it, then close it."""
+        environ = self.build_environ(self.scope, body)
+        app_iter = self.wsgi_application(environ, self.start_response)
+        try:
+            for output in app_iter:
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                if output:
+                    self.sync_send(
+                        {
+                            "type": "http.response.body",
+                            "body": output,
+                            "more_body": True,
+                        }
+                    )
+        finally:
+            if hasattr(app_iter, "close"):
+                app_iter.close()
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({"type": "http.response.body"})
+
+
+class ASGIAdapter(WsgiToAsgi):
+    """Serve a WSGI app to an ASGI server from a bounded thread pool."""
+
+    def __init__(self, wsgi_application, threads: int = DEFAULT_THREADS):
+        """Run at most ``threads`` WSGI requests at once."""
+        super().__init__(wsgi_application)
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix="asgi-wsgi")
+
+    async def __call__(self, scope, receive, send):
+        """Handle one ASGI connection scope."""
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        await _AdapterInstance(self.wsgi_application, self.executor)(
+            scope, receive, send
+        )
+
+    async def _lifespan(self, receive, send):
+        """Acknowledge startup; release the thread pool at shutdown."""
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def create_asgi_app(app: Flask) -> ASGIAdapter:
+    """Wrap a Flask app for an ASGI server (``ASGI_THREADS`` sets the pool)."""
+    threads = int(os.environ.get("ASGI_THREADS", DEFAULT_THREADS))
+    set_worker_concurrency(app, threads)
+    return ASGIAdapter(app, threads)
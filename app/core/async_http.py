@@ -0,0 +1,126 @@
+"""Pooled async HTTP client and helpers for async views.
+
+Flask runs an ``async def`` view by driving it to completion on an event
+loop, so a view can ``await`` several upstream calls at once with
+``gather_calls`` and hold its worker thread for the slowest call rather
+than the sum of all of them.
+
+``get_async_client()`` returns one ``httpx.AsyncClient`` per event loop;
+its connection pool is shared by every call made on that loop. Under the
+ASGI entry point (``asgi.py``) all async views run on the server's loop,
+so connections are kept alive across requests. Under WSGI each async view
+gets a short-lived loop of its own, and the client is closed when the view
+returns.
+"""
+
+import asyncio
+import functools
+import weakref
+from collections.abc import Awaitable
+
+import httpx
+from flask import Flask, current_app, has_app_context, has_request_context, request
+
+from app.core.metrics import metrics
+
+# WSGI environ key set by the ASGI adapter: async views run on a lasting loop
+ASGI_ENVIRON_KEY = "kusse.asgi"
+
+# Pool settings outside an app context
+DEFAULT_LIMITS = {
+    "ASYNC_HTTP_MAX_CONNECTIONS": 100,
+    "ASYNC_HTTP_MAX_KEEPALIVE": 20,
+    "ASYNC_HTTP_KEEPALIVE_EXPIRY": 30.0,
+}
+
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+_clients = weakref.WeakKeyDictionary()
+
+
+def _pool_setting(name: str):
+    """A pool setting from the app config, or its default."""
+    if has_app_context():
+        return current_app.config.get(name, DEFAULT_LIMITS[name])
+    return DEFAULT_LIMITS[name]
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """The pooled client of the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=_pool_setting("ASYNC_HTTP_MAX_CONNECTIONS"),
+                max_keepalive_connections=_pool_setting("ASYNC_HTTP_MAX_KEEPALIVE"),
+                keepalive_expiry=_pool_setting("ASYNC_HTTP_KEEPALIVE_EXPIRY"),
+            ),
+            event_hooks={"request": [_count_request]},
+        )
+    return client
+
+
+async def _count_request(request: httpx.Request) -> None:
+    """Count outbound async requests by host."""
+    metrics.inc("async_http_requests_total", host=request.url.host)
+
+
+async def close_async_client() -> None:
+    """Close the running loop's client, if it has one."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def gather_calls(**calls: Awaitable) -> dict:
+    """
+    Await upstream calls concurrently; results by keyword.
+
+    Calls made through ``call_dependency_async`` already turn failures into
+    fallbacks. Any other exception is logged and yields None, so one broken
+    call never fails the others. Cancellation and other ``BaseException``
+    subclasses are re-raised rather than returned as results.
+    """
+    results = await asyncio.gather(*calls.values(), return_exceptions=True)
+    gathered = {}
+    for name, result in zip(calls, results, strict=True):
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+        if isinstance(result, Exception):
+            if has_app_context():
+                current_app.logger.error(f"Concurrent call {name!r} failed: {result}")
+            result = None
+        gathered[name] = result
+    return gathered
+
+
+def _async_to_sync(func):
+    """Flask's ``async_to_sync``, closing per-view loops' clients afterwards."""
+    try:
+        from asgiref.sync import async_to_sync
+    except ImportError:
+        raise RuntimeError(
+            "Install Flask with the 'async' extra in order to use async views."
+        ) from None
+
+    @functools.wraps(func)
+    async def run(*args, **kwargs):
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            if not (has_request_context() and request.environ.get(ASGI_ENVIRON_KEY)):
+                # The loop ends with this call; don't leave sockets behind
+                await close_async_client()
+
+    return async_to_sync(run)
+
+
+def register_async_http(app: Flask) -> None:
+    """Run async views so the pooled client never outlives its loop."""
+    app.async_to_sync = _async_to_sync
+    metrics.counter("async_http_requests_total", "Outbound async HTTP requests")
+    metrics.gauge(
+        "async_http_clients",
+        "Pooled async HTTP clients (one per live event loop)",
+        lambda: len(_clients),
+    )
@@ -0,0 +1,44 @@
+"""Flask CLI command groups."""
+
+from flask import Flask
+from flask.cli import AppGroup
+
+# Build-time asset commands, e.g. ``flask assets precache``
+assets_cli = AppGroup("assets", help="Build asset manifests after `npm run build`.")
+
+# Local analytics commands, e.g. ``flask analytics report``
+analytics_cli = AppGroup("analytics", help="Inspect the local analytics store.")
+
+# Template tooling, e.g. ``flask templates minify-report``
+templates_cli = AppGroup("templates", help="Inspect the Jinja templates.")
+
+# Cross-worker cache control, e.g. ``flask cache invalidate pages``
+cache_cli = AppGroup("cache", help="Invalidate per-worker caches.")
+
+# Shared content snapshot, e.g. ``flask content snapshot``
+content_cli = AppGroup("content", help="Manage the shared content snapshot.")
+
+# Worker memory inspection, e.g. ``flask memory report``
+memory_cli = AppGroup("memory", help="Report per-process private and shared memory.")
+
+
+def register_commands(app: Flask) -> None:
+    """Register CLI command groups with the Flask application."""
+    # Import modules that attach commands to the groups above
+    from app.analytics import commands  # noqa: F401
+    from app.core import (  # noqa: F401
+        images,
+        invalidation,
+        memory,
+        minify,
+        service_worker,
+        static_files,
+    )
+    from app.models import snapshot  # noqa: F401
+
+    app.cli.add_command(assets_cli)
+    app.cli.add_command(analytics_cli)
+    app.cli.add_command(templates_cli)
+    app.cli.add_command(cache_cli)
+    app.cli.add_command(content_cli)
+    app.cli.add_command(memory_cli)
@@ -0,0 +1,122 @@
+"""Preload Link headers and 103 Early Hints for critical page assets."""
+
+from flask import Flask, current_app, g, request
+
+from app.core.static_files import static_url
+from app.core.utils import get_vite_asset, load_vite_manifest
+
+# Assets base.html loads when no Vite manifest exists (e.g. in development)
+DEFAULT_PRELOAD_ASSETS = [("css/main.css", "style"), ("js/main.js", "script")]
+
+_graph_cache: tuple[dict, list[tuple[str, str]]] | None = None
+
+
+def build_preload_graph(manifest: dict) -> list[tuple[str, str]]:
+    """
+    Walk the Vite manifest from its entries and list assets to preload.
+
+    Entry scripts are loaded by a classic ``<script>`` tag and preloaded as
+    scripts; the chunks they import are module-preloaded and every CSS file
+    on the way, CSS entries included, is preloaded as a style. Returns
+    ``(dist file, kind)`` pairs.
+    """
+    assets: dict[str, str] = {}
+
+    def visit(key: str, kind: str) -> None:
+        chunk = manifest.get(key)
+        if chunk is None or chunk["file"] in assets:
+            return
+        for css in chunk.get("css", []):
+            assets.setdefault(css, "style")
+        file = chunk["file"]
+        assets[file] = "style" if file.endswith(".css") else kind
+        for imported in chunk.get("imports", []):
+            visit(imported, "modulepreload")
+
+    for key, chunk in manifest.items():
+        if chunk.get("isEntry"):
+            visit(key, "script")
+
+    return list(assets.items())
+
+
+def get_preload_graph(static_folder: str) -> list[tuple[str, str]]:
+    """Return the preload graph, rebuilt only when the manifest changes."""
+    global _graph_cache
+
+    manifest = load_vite_manifest(static_folder)
+    if _graph_cache is None or _graph_cache[0] is not manifest:
+        _graph_cache = (manifest, build_preload_graph(manifest))
+    return _graph_cache[1]
+
+
+def format_link(url: str, kind: str) -> str:
+    """Format a single Link header value."""
+    if kind == "modulepreload":
+        return f"<{url}>; rel=modulepreload"
+    return f"<{url}>; rel=preload; as={kind}"
+
+
+def critical_links() -> list[str]:
+    """Link header values for the assets every page loads."""
+    graph = get_preload_graph(current_app.static_folder)
+    if graph:
+        return [format_link(static_url(f"dist/{file}"), kind) for file, kind in graph]
+    return [
+        format_link(get_vite_asset(name), kind) for name, kind in DEFAULT_PRELOAD_ASSETS
+    ]
+
+
+def preload(url: str, as_: str = "image") -> str:
+    """
+    Declare an extra asset to preload for the current page.
+
+    Usable from templates, e.g. ``{{ preload(static_url('images/hero.webp')) }}``;
+    renders nothing.
+    """
+    links = g.setdefault("preload_links", [])
+    link = format_link(url, as_)
+    if link not in links:
+        links.append(link)
+    return ""
+
+
+def send_early_hints():
+    """Send a 103 response for critical assets when the server supports it."""
+    early_hints = request.environ.get("wsgi.early_hints")
+    if (
+        callable(early_hints)
+        and request.method == "GET"
+        and request.endpoint != "static"
+    ):
+        early_hints([("Link", link) for link in critical_links()])
+
+
+def add_preload_links(response):
+    """Attach preload Link headers to successful HTML responses."""
+    if (
+        request.method != "GET"
+        or response.status_code != 200
+        or response.mimetype != "text/html"
+    ):
+        return response
+
+    links = critical_links() + g.get("preload_links", [])
+    existing = response.headers.get("Link")
+    response.headers["Link"] = ", ".join(([existing] if existing else []) + links)
+    return response
+
+
+def register_early_hints(app: Flask) -> None:
+    """Register preload Link headers and the per-page preload helper."""
+    if not app.config.get("PRELOAD_LINKS", True):
+        return
+
+    app.after_request(add_preload_links)
+    if app.config.get("EARLY_HINTS", False):
+        app.before_request(send_early_hints)
+
+    @app.context_processor
+    def inject_preload():
+        """Make preload function available in templates."""
+        return dict(preload=preload)
@@ -1,20 +1,94 @@
-"""Error handlers for the application."""
+"""Error handlers for the application.
 
-from flask import Flask, render_template
+The 404, 500 and offline pages do not depend on the request, so they are
+rendered once and served from memory until the ``pages`` cache namespace is
+invalidated (see ``app.core.invalidation``).
+"""
+
+import threading
+from datetime import UTC, datetime
+
+from flask import Flask, Response, current_app, render_template, request
+from markupsafe import escape
+
+from app.core.invalidation import on_invalidate
+
+ERROR_TEMPLATES = {
+    "404": "errors/404.html",
+    "500": "errors/500.html",
+    "offline": "errors/offline.html",
+}
+
+# Per-request values of the 500 page, rendered as markers and filled in later
+PAGE_MARKERS = {"request_id": "__REQUEST_ID__", "error_time": "__ERROR_TIME__"}
+
+
+class ErrorPages:
+    """Error pages pre-rendered to bytes."""
+
+    def __init__(self, app: Flask):
+        """Bind to an app; pages are rendered on first use."""
+        self.app = app
+        self._pages: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def render(self, name: str) -> bytes:
+        """Render one page outside of any real request."""
+        with self.app.test_request_context("/"):
+            return render_template(ERROR_TEMPLATES[name], **PAGE_MARKERS).encode()
+
+    def get(self, name: str) -> bytes:
+        """Rendered page, from memory outside debug mode."""
+        if self.app.debug:
+            # Template edits show up immediately while developing
+            return self.render(name)
+
+        with self._lock:
+            page = self._pages.get(name)
+        if page is None:
+            page = self.render(name)
+            with self._lock:
+                page = self._pages.setdefault(name, page)
+        return page
+
+    def clear(self) -> None:
+        """Forget rendered pages; they are rendered again on next use."""
+        with self._lock:
+            self._pages.clear()
+
+
+def error_page(name: str, status: int) -> Response:
+    """Serve a pre-rendered error page."""
+    body = current_app.extensions["error_pages"].get(name)
+    if name == "500":
+        values = {
+            "request_id": request.headers.get("X-Request-ID", "N/A"),
+            "error_time": datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        for key, value in values.items():
+            body = body.replace(PAGE_MARKERS[key].encode(), str(escape(value)).encode())
+    return Response(body, status=status, mimetype="text/html")
 
 
 def register_error_handlers(app: Flask) -> None:
     """Register error handlers with the Flask application."""
+    error_pages = app.extensions["error_pages"] = ErrorPages(app)
+    on_invalidate(app, "pages", error_pages.clear)
 
     @app.errorhandler(404)
     def not_found_error(error):
         """Handle 404 errors."""
-        return render_template("errors/404.html"), 404
+        return error_page("404", 404)
 
     @app.errorhandler(500)
     def internal_error(error):
         """Handle 500 errors."""
-        return render_template("errors/500.html"), 500
+        try:
+            return error_page("500", 500)
+        except Exception as e:
+            # The templates themselves may be what is broken
+            app.logger.error(f"Error page rendering failed: {e}")
+            return Response("Internal Server Error", status=500, mimetype="text/plain")
 
 
 def register_offline_route(app: Flask) -> None:
@@ -23,4 +97,4 @@ def register_offline_route(app: Flask) -> None:
     @app.route("/offline.html")
     def offline():
         """Serve offline page for service worker."""
-        return render_template("errors/offline.html")
+        return error_page("offline", 200)
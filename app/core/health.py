@@ -0,0 +1,199 @@
+"""Liveness, readiness, warm-up and cached dependency checks.
+
+- Liveness (``/livez``) only says the process answers requests.
+- Readiness (``/readyz``) stays false until ``warm_up()`` has primed the
+  caches and rendered every page route once, and turns false again while a
+  critical dependency check fails.
+
+Dependency checks run in a background thread every
+``HEALTH_CHECK_INTERVAL`` seconds; probes only read the cached results.
+"""
+
+import os
+import shutil
+import threading
+import time
+from collections.abc import Callable
+
+from flask import Flask, current_app
+
+# Routes never rendered during warm-up: probes, admin and machine endpoints
+WARM_UP_SKIPPED = {"/livez", "/readyz", "/health", "/metrics", "/sw.js"}
+WARM_UP_SKIPPED_PREFIXES = ("/analytics", "/admin")
+
+# WSGI environ key marking warm-up requests (no analytics, no bot counters)
+WARM_UP_ENVIRON_KEY = "kusse.warm_up"
+
+
+class HealthState:
+    """Readiness flag and the cached results of dependency checks."""
+
+    def __init__(self, app: Flask, interval: float):
+        """Track health for ``app``; checks rerun every ``interval`` seconds."""
+        self.app = app
+        self.interval = interval
+        self.ready = threading.Event()
+        self.warm_up_seconds: float | None = None
+        self.checks: dict[str, tuple[Callable[[], str | None], bool]] = {}
+        self.results: dict[str, dict] = {}
+        self.checked_at: float | None = None
+        self._lock = threading.Lock()
+        self._thread_pid: int | None = None
+
+    def add_check(
+        self, name: str, check: Callable[[], str | None], critical: bool = False
+    ) -> None:
+        """
+        Register a dependency check.
+
+        ``check`` returns None when healthy or a short problem description.
+        A failing critical check makes the worker unready.
+        """
+        self.checks[name] = (check, critical)
+
+    def run_checks(self) -> dict[str, dict]:
+        """Run every check now and cache the results."""
+        results = {}
+        with self.app.app_context():
+            for name, (check, critical) in self.checks.items():
+                started = time.perf_counter()
+                try:
+                    problem = check()
+                except Exception as e:
+                    problem = f"{type(e).__name__}: {e}"
+                results[name] = {
+                    "ok": problem is None,
+                    "critical": critical,
+                    "detail": problem,
+                    "ms": round((time.perf_counter() - started) * 1000, 2),
+                }
+        # Replace the whole dict so probes never see a partial update
+        self.results = results
+        self.checked_at = time.time()
+        return results
+
+    def ensure_checker(self) -> None:
+        """Start the background checker once per process (threads do not fork)."""
+        if self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            thread = threading.Thread(
+                target=self._check_loop, name="health-checks", daemon=True
+            )
+            thread.start()
+
+    def _check_loop(self) -> None:
+        """Rerun the checks forever."""
+        while True:
+            try:
+                self.run_checks()
+            except Exception as e:
+                self.app.logger.error(f"Health checks failed to run: {e}")
+            time.sleep(self.interval)
+
+    def is_ready(self) -> bool:
+        """Warmed up and no critical check failing."""
+        if not self.ready.is_set():
+            return False
+        return all(r["ok"] or not r["critical"] for r in self.results.values())
+
+
+def warm_up(app: Flask) -> float:
+    """
+    Prime caches and render every page route once, then mark the app ready.
+
+    Returns the time taken in seconds.
+    """
+    from app.core.preload import warm_caches
+
+    started = time.perf_counter()
+    warm_caches(app)
+
+    client = app.test_client()
+    for path in page_routes(app):
+        try:
+            response = client.get(path, environ_base={WARM_UP_ENVIRON_KEY: True})
+            response.close()
+            if response.status_code >= 500:
+                app.logger.warning(f"Warm-up of {path} returned {response.status}")
+        except Exception as e:
+            app.logger.warning(f"Warm-up of {path} failed: {e}")
+
+    state = app.extensions["health"]
+    state.warm_up_seconds = time.perf_counter() - started
+    state.ensure_checker()
+    state.run_checks()
+    state.ready.set()
+    app.logger.info(f"Warm-up finished in {state.warm_up_seconds:.2f}s")
+    return state.warm_up_seconds
+
+
+def page_routes(app: Flask) -> list[str]:
+    """GET routes without URL parameters, excluding probes and admin pages."""
+    paths = []
+    for rule in app.url_map.iter_rules():
+        if (
+            "GET" not in rule.methods
+            or rule.arguments
+            or rule.endpoint == "static"
+            or rule.rule in WARM_UP_SKIPPED
+            or rule.rule.startswith(WARM_UP_SKIPPED_PREFIXES)
+        ):
+            continue
+        paths.append(rule.rule)
+    return sorted(paths)
+
+
+def check_disk() -> str | None:
+    """The instance folder exists, is writable and has free space."""
+    path = current_app.instance_path
+    os.makedirs(path, exist_ok=True)
+    if not os.access(path, os.W_OK):
+        return f"{path} is not writable"
+    free = shutil.disk_usage(path).free
+    minimum = current_app.config["HEALTH_MIN_FREE_BYTES"]
+    if free < minimum:
+        return f"only {free // (1024 * 1024)} MiB free"
+    return None
+
+
+def check_analytics_outbox() -> str | None:
+    """The local analytics store (when enabled) can still be written."""
+    store = current_app.extensions.get("event_store")
+    if store is None:
+        return None
+    if not os.access(store.directory, os.W_OK):
+        return f"{store.directory} is not writable"
+    return None
+
+
+def check_content_snapshot() -> str | None:
+    """Content is served from a mapped snapshot segment."""
+    from app.models.snapshot import current_snapshot
+
+    if current_app.config.get("CONTENT_SNAPSHOT", True) and current_snapshot() is None:
+        return "content snapshot not loaded"
+    return None
+
+
+def add_health_check(
+    app: Flask, name: str, check: Callable[[], str | None], critical: bool = False
+) -> None:
+    """Register a dependency check on the app's health state."""
+    app.extensions["health"].add_check(name, check, critical=critical)
+
+
+def register_health(app: Flask) -> None:
+    """Create the health state with the built-in dependency checks."""
+    state = app.extensions["health"] = HealthState(
+        app, app.config["HEALTH_CHECK_INTERVAL"]
+    )
+    state.add_check("disk", check_disk, critical=True)
+    state.add_check("analytics_outbox", check_analytics_outbox)
+    state.add_check("content_snapshot", check_content_snapshot)
+    if app.config.get("TESTING") or app.debug:
+        # No warm-up gate for the test client and the reloading dev server
+        state.ready.set()
@@ -0,0 +1,316 @@
+"""Responsive image variants, srcset helpers and the variant disk cache."""
+
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import lru_cache
+
+import click
+from flask import Flask, abort, current_app, request, send_file, url_for
+from markupsafe import Markup
+from werkzeug.security import safe_join
+
+from app.core.commands import assets_cli
+from app.core.static_files import static_file_hash, static_url
+from app.core.utils import file_content_hash
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Pillow is optional; pages fall back to plain <img> tags
+    Image = None
+
+SOURCE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
+
+FORMAT_MIMETYPES = {
+    "avif": "image/avif",
+    "webp": "image/webp",
+    "jpeg": "image/jpeg",
+    "png": "image/png",
+}
+
+
+def fallback_format(filename: str) -> str:
+    """Format used for the <img> fallback; PNGs keep their transparency."""
+    return "png" if filename.lower().endswith(".png") else "jpeg"
+
+
+@lru_cache(maxsize=512)
+def read_file_hash(path: str, mtime: float) -> str:
+    """Content hash of a file (cached per file version)."""
+    return file_content_hash(path)
+
+
+@lru_cache(maxsize=512)
+def read_image_size(path: str, mtime: float) -> tuple[int, int]:
+    """Read image dimensions from the file header (cached per file version)."""
+    with Image.open(path) as image:
+        return ImageOps.exif_transpose(image).size
+
+
+class ImagePipeline:
+    """Encode resized image variants into a content-addressed disk cache."""
+
+    def __init__(
+        self,
+        static_folder: str,
+        cache_dir: str,
+        widths: list[int],
+        formats: list[str],
+        quality: dict[str, int],
+        workers: int = 2,
+    ):
+        """Initialize the pipeline; encodes run on a bounded worker pool."""
+        self.static_folder = static_folder
+        self.cache_dir = cache_dir
+        self.widths = sorted(widths)
+        self.formats = [fmt for fmt in formats if self.can_encode(fmt)]
+        self.quality = quality
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="image-encode"
+        )
+        self._pending: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def can_encode(fmt: str) -> bool:
+        """Check whether the installed Pillow can write a format."""
+        if Image is None:
+            return False
+        if fmt in ("avif", "webp"):
+            return bool(features.check(fmt))
+        return fmt in FORMAT_MIMETYPES
+
+    def source_path(self, filename: str) -> str | None:
+        """Resolve a source image inside the static folder."""
+        if os.path.splitext(filename)[1].lower() not in SOURCE_EXTENSIONS:
+            return None
+        path = safe_join(self.static_folder, filename)
+        return path if path and os.path.isfile(path) else None
+
+    def source_hash(self, filename: str) -> str:
+        """Content hash of a source image, following edits like static URLs."""
+        digest = static_file_hash(self.static_folder, filename)
+        if digest is None:
+            # Added after startup, so not in the static hash table
+            path = self.source_path(filename)
+            digest = read_file_hash(path, os.path.getmtime(path))
+        return digest
+
+    def image_size(self, filename: str) -> tuple[int, int]:
+        """Intrinsic width and height of a source image."""
+        path = self.source_path(filename)
+        return read_image_size(path, os.path.getmtime(path))
+
+    def variant_widths(self, filename: str) -> list[int]:
+        """Widths to generate; images are never upscaled."""
+        original_width = self.image_size(filename)[0]
+        widths = [w for w in self.widths if w < original_width]
+        widths.append(min(original_width, self.widths[-1]))
+        return sorted(set(widths))
+
+    def variant_path(self, filename: str, width: int, fmt: str) -> str:
+        """Cache path of a variant, addressed by source content and settings."""
+        digest = self.source_hash(filename)
+        quality = self.quality.get(fmt, 0)
+        name = f"{digest}-{width}w-q{quality}.{fmt}"
+        return os.path.join(self.cache_dir, digest[:2], name)
+
+    def submit(self, filename: str, width: int, fmt: str) -> Future:
+        """Queue a variant for encoding unless it is cached or in progress."""
+        dest = self.variant_path(filename, width, fmt)
+        with self._lock:
+            future = self._pending.get(dest)
+            if future is not None:
+                return future
+            if os.path.exists(dest):
+                future = Future()
+                future.set_result(dest)
+                return future
+
+            future = self._executor.submit(
+                self._encode, self.source_path(filename), dest, width, fmt
+            )
+            self._pending[dest] = future
+
+        # Registered outside the lock: it runs inline if the encode is done
+        future.add_done_callback(lambda _: self._forget(dest))
+        return future
+
+    def get_variant(self, filename: str, width: int, fmt: str) -> str:
+        """Return the path of a variant, encoding it on first request."""
+        return self.submit(filename, width, fmt).result()
+
+    def _forget(self, dest: str) -> None:
+        """Drop a finished encode from the in-progress table."""
+        with self._lock:
+            self._pending.pop(dest, None)
+
+    def _encode(self, source: str, dest: str, width: int, fmt: str) -> str:
+        """Resize and re-encode a source image, writing the file atomically."""
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            if image.width > width:
+                height = round(image.height * width / image.width)
+                image = image.resize((width, height), Image.Resampling.LANCZOS)
+            if fmt == "jpeg" and image.mode not in ("RGB", "L"):
+                image = image.convert("RGB")
+
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            tmp_path = f"{dest}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                image.save(
+                    tmp_path, format=fmt.upper(), quality=self.quality.get(fmt, 80)
+                )
+                os.replace(tmp_path, dest)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+        return dest
+
+    def build_all(self, filenames: list[str]) -> int:
+        """Encode every variant of the given images; returns the variant count."""
+        futures = [
+            self.submit(filename, width, fmt)
+            for filename in filenames
+            for width in self.variant_widths(filename)
+            for fmt in [*self.formats, fallback_format(filename)]
+        ]
+        wait(futures)
+        for future in futures:
+            future.result()
+        return len(futures)
+
+
+def get_image_pipeline() -> ImagePipeline:
+    """Return the image pipeline of the current application."""
+    return current_app.extensions["image_pipeline"]
+
+
+def variant_url(filename: str, width: int, fmt: str) -> str:
+    """URL of an image variant, versioned by the source content hash."""
+    version = get_image_pipeline().source_hash(filename)
+    return url_for("image_variant", filename=filename, w=width, f=fmt, v=version)
+
+
+def _render_attrs(attrs: dict) -> Markup:
+    """Render escaped HTML attributes, skipping ones set to None."""
+    return Markup(" ").join(
+        Markup('{}="{}"').format(name, value)
+        for name, value in attrs.items()
+        if value is not None
+    )
+
+
+def responsive_image(filename: str, alt: str, sizes: str = "100vw", **attrs) -> Markup:
+    """
+    Render a <picture> element with srcset variants for a static image.
+
+    Width and height come from the source so the browser can reserve space
+    before the image loads. Renders nothing when the image does not exist,
+    so templates can fall back to a placeholder.
+    """
+    pipeline = get_image_pipeline()
+    if pipeline.source_path(filename) is None:
+        return Markup("")
+
+    img_attrs = {"alt": alt, "loading": "lazy", "decoding": "async", **attrs}
+    if Image is None:
+        img_attrs = {"src": static_url(filename), **img_attrs}
+        return Markup("<img {} />").format(_render_attrs(img_attrs))
+
+    width, height = pipeline.image_size(filename)
+    widths = pipeline.variant_widths(filename)
+
+    def srcset(fmt: str) -> str:
+        return ", ".join(f"{variant_url(filename, w, fmt)} {w}w" for w in widths)
+
+    sources = Markup("").join(
+        Markup("<source {} />").format(
+            _render_attrs(
+                {"type": FORMAT_MIMETYPES[fmt], "srcset": srcset(fmt), "sizes": sizes}
+            )
+        )
+        for fmt in pipeline.formats
+    )
+    fmt = fallback_format(filename)
+    img_attrs = {
+        "src": variant_url(filename, widths[-1], fmt),
+        "srcset": srcset(fmt),
+        "sizes": sizes,
+        "width": width,
+        "height": height,
+        **img_attrs,
+    }
+    return Markup("<picture>{}<img {} /></picture>").format(
+        sources, _render_attrs(img_attrs)
+    )
+
+
+def serve_image_variant(filename):
+    """Serve a resized image variant, encoding it on first request."""
+    pipeline = get_image_pipeline()
+    fmt = request.args.get("f", "")
+    width = request.args.get("w", type=int)
+
+    if Image is None or pipeline.source_path(filename) is None:
+        abort(404)
+    if fmt not in (*pipeline.formats, fallback_format(filename)):
+        abort(404)
+    if width not in pipeline.variant_widths(filename):
+        abort(404)
+
+    response = send_file(
+        pipeline.get_variant(filename, width, fmt),
+        mimetype=FORMAT_MIMETYPES[fmt],
+        conditional=True,
+    )
+    response.cache_control.public = True
+    if request.args.get("v") == pipeline.source_hash(filename):
+        response.cache_control.max_age = current_app.config["STATIC_IMMUTABLE_MAX_AGE"]
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = current_app.config["STATIC_DEFAULT_MAX_AGE"]
+    return response
+
+
+def register_images(app: Flask) -> None:
+    """Register the image pipeline, its route and the template helper."""
+    if Image is None:
+        app.logger.warning("Pillow not installed - responsive images disabled")
+
+    app.extensions["image_pipeline"] = ImagePipeline(
+        static_folder=app.static_folder,
+        cache_dir=app.config.get("IMAGE_CACHE_DIR")
+        or os.path.join(app.instance_path, "image-cache"),
+        widths=app.config["IMAGE_WIDTHS"],
+        formats=app.config["IMAGE_FORMATS"],
+        quality=app.config["IMAGE_QUALITY"],
+        workers=app.config["IMAGE_ENCODE_WORKERS"],
+    )
+    app.add_url_rule("/img/<path:filename>", "image_variant", serve_image_variant)
+
+    @app.context_processor
+    def inject_responsive_image():
+        """Make responsive_image function available in templates."""
+        return dict(responsive_image=responsive_image)
+
+
+@assets_cli.command("images")
+def images_command():
+    """Pre-generate responsive variants for every image in static/images."""
+    pipeline = get_image_pipeline()
+    if Image is None:
+        raise click.ClickException("Pillow is required to build image variants")
+
+    images_dir = os.path.join(current_app.static_folder, "images")
+    filenames = []
+    for dirpath, _dirnames, names in os.walk(images_dir):
+        for name in names:
+            path = os.path.join(dirpath, name)
+            relpath = os.path.relpath(path, current_app.static_folder)
+            if pipeline.source_path(relpath.replace(os.sep, "/")):
+                filenames.append(relpath.replace(os.sep, "/"))
+
+    count = pipeline.build_all(filenames)
+    click.echo(f"Built {count} variants for {len(filenames)} images")
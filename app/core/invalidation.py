@@ -0,0 +1,210 @@
+"""Cross-worker cache invalidation through shared generation counters.
+
+Every worker maps the same small file into memory. It holds one global
+generation plus a counter per cache namespace (``assets``, ``templates``,
+``pages``, ...). ``invalidate()`` bumps the counters under a file lock;
+each worker compares the global generation with the one it last saw at the
+start of every request - a memory read, no system call - and only when it
+moved does it run the callbacks of the namespaces whose counters changed.
+"""
+
+import mmap
+import os
+import struct
+import threading
+from collections.abc import Callable
+from contextlib import contextmanager
+
+import click
+from flask import Flask, current_app, has_app_context
+
+from app.core.commands import cache_cli
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines; single process there
+    fcntl = None
+
+# File layout: global generation, then fixed slots of (name, generation)
+HEADER = struct.Struct("<Q")
+SLOT = struct.Struct("<32sQ")
+SLOT_COUNT = 64
+FILE_SIZE = HEADER.size + SLOT.size * SLOT_COUNT
+
+# Invalidating a namespace also invalidates the caches built from it
+DEPENDENT_NAMESPACES = {
+    "assets": ["pages"],
+    "templates": ["pages"],
+    "content": ["pages"],
+}
+
+
+class InvalidationBus:
+    """Generation counters in a shared memory-mapped file."""
+
+    def __init__(self, path: str):
+        """Map (creating if needed) the generation file at ``path``."""
+        self.path = path
+        self._lock = threading.Lock()
+        self._callbacks: dict[str, list[Callable[[], None]]] = {}
+        self._seen: dict[str, int] = {}
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            with self._file_lock(fd):
+                if os.fstat(fd).st_size < FILE_SIZE:
+                    os.ftruncate(fd, FILE_SIZE)
+            self._map = mmap.mmap(fd, FILE_SIZE)
+        finally:
+            os.close(fd)
+        self._global_seen = self.global_generation()
+
+    @contextmanager
+    def _file_lock(self, fd: int):
+        """Exclusive lock on the generation file across threads and processes."""
+        with self._lock:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+
+    def global_generation(self) -> int:
+        """Generation bumped by every invalidation."""
+        return HEADER.unpack_from(self._map, 0)[0]
+
+    def _slots(self):
+        """Yield ``(offset, name, generation)`` for every used slot."""
+        for index in range(SLOT_COUNT):
+            offset = HEADER.size + index * SLOT.size
+            raw_name, generation = SLOT.unpack_from(self._map, offset)
+            name = raw_name.rstrip(b"\0").decode()
+            if not name:
+                return
+            yield offset, name, generation
+
+    def generation(self, namespace: str) -> int:
+        """Current generation of a namespace (0 if never invalidated)."""
+        for _offset, name, generation in self._slots():
+            if name == namespace:
+                return generation
+        return 0
+
+    def generations(self) -> dict[str, int]:
+        """All namespaces that were ever invalidated, with generations."""
+        return {name: generation for _offset, name, generation in self._slots()}
+
+    def subscribe(self, namespace: str, callback: Callable[[], None]) -> None:
+        """Run ``callback`` in this worker whenever ``namespace`` is invalidated."""
+        with self._lock:
+            self._callbacks.setdefault(namespace, []).append(callback)
+            self._seen.setdefault(namespace, self.generation(namespace))
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Bump namespaces (and their dependents) for every worker."""
+        names = list(namespaces)
+        for namespace in namespaces:
+            names.extend(DEPENDENT_NAMESPACES.get(namespace, []))
+
+        fd = os.open(self.path, os.O_RDWR)
+        try:
+            with self._file_lock(fd):
+                for namespace in dict.fromkeys(names):
+                    self._bump(namespace)
+                (generation,) = HEADER.unpack_from(self._map, 0)
+                HEADER.pack_into(self._map, 0, generation + 1)
+        finally:
+            os.close(fd)
+        # Apply to this worker now rather than on its next request
+        self.poll()
+
+    def _bump(self, namespace: str) -> None:
+        """Increment one namespace's slot; the caller holds the file lock."""
+        encoded = namespace.encode()
+        if not encoded or len(encoded) > SLOT.size - 8:
+            raise ValueError(f"Invalid cache namespace {namespace!r}")
+
+        used = 0
+        for offset, name, generation in self._slots():
+            if name == namespace:
+                SLOT.pack_into(self._map, offset, encoded, generation + 1)
+                return
+            used += 1
+        if used >= SLOT_COUNT:
+            raise ValueError("No free cache namespace slots")
+        SLOT.pack_into(self._map, HEADER.size + used * SLOT.size, encoded, 1)
+
+    def poll(self) -> None:
+        """Run callbacks for namespaces invalidated since the last poll."""
+        current = self.global_generation()
+        if current == self._global_seen:
+            return
+
+        with self._lock:
+            self._global_seen = current
+            generations = self.generations()
+            stale = [
+                namespace
+                for namespace, seen in self._seen.items()
+                if generations.get(namespace, 0) != seen
+            ]
+            for namespace in stale:
+                self._seen[namespace] = generations.get(namespace, 0)
+
+        for namespace in stale:
+            for callback in self._callbacks.get(namespace, []):
+                callback()
+            if has_app_context():
+                current_app.logger.info(f"Cache namespace invalidated: {namespace}")
+
+
+def on_invalidate(app: Flask, namespace: str, callback: Callable[[], None]) -> None:
+    """Subscribe a cache's reset function if the app has a bus."""
+    bus = app.extensions.get("cache_bus")
+    if bus is not None:
+        bus.subscribe(namespace, callback)
+
+
+def stat_checks_enabled() -> bool:
+    """Whether file-backed caches should re-check mtimes on every use."""
+    if not has_app_context():
+        return True
+    return current_app.config.get("CACHE_STAT_CHECKS", True)
+
+
+def register_cache_bus(app: Flask) -> None:
+    """Create the bus, subscribe the process-wide caches and poll per request."""
+    path = app.config.get("CACHE_BUS_PATH") or os.path.join(
+        app.instance_path, "cache-generations"
+    )
+    bus = app.extensions["cache_bus"] = InvalidationBus(path)
+
+    from app.core import service_worker, static_files, utils
+
+    bus.subscribe("assets", utils._vite_manifest_cache.clear)
+    bus.subscribe("assets", static_files.reset_static_hashes)
+    bus.subscribe("assets", service_worker._manifest_cache.clear)
+    if app.jinja_env.cache is not None:
+        bus.subscribe("templates", app.jinja_env.cache.clear)
+
+    app.before_request(bus.poll)
+
+
+@cache_cli.command("invalidate")
+@click.argument("namespaces", nargs=-1, required=True)
+def invalidate_command(namespaces):
+    """Invalidate cache namespaces in every worker, e.g. assets or pages."""
+    current_app.extensions["cache_bus"].invalidate(*namespaces)
+    click.echo(f"Invalidated: {', '.join(namespaces)}")
+
+
+@cache_cli.command("status")
+def status_command():
+    """Show the generation of every cache namespace."""
+    bus = current_app.extensions["cache_bus"]
+    click.echo(f"global: {bus.global_generation()}")
+    for name, generation in bus.generations().items():
+        click.echo(f"{name}: {generation}")
@@ -0,0 +1,204 @@
+"""Per-process memory and garbage collector statistics.
+
+Memory comes from ``/proc`` (Linux only). RSS counts shared pages in every
+process that maps them, so it overstates what each gunicorn worker costs.
+PSS splits shared pages between the processes sharing them, and USS
+(private pages) is what a worker would free if it exited.
+"""
+
+import gc
+import os
+import time
+
+import click
+from flask import Flask, current_app
+
+from app.core.commands import memory_cli
+from app.core.metrics import metrics
+
+# smaps fields reported, in bytes
+SMAPS_FIELDS = (
+    "Rss",
+    "Pss",
+    "Shared_Clean",
+    "Shared_Dirty",
+    "Private_Clean",
+    "Private_Dirty",
+    "Swap",
+)
+
+
+def _parse_smaps(lines, path: str | None = None) -> dict[str, int]:
+    """Sum smaps fields, optionally only over mappings of ``path``."""
+    totals = dict.fromkeys(SMAPS_FIELDS, 0)
+    include = path is None
+    for line in lines:
+        if not line[:1].isupper():
+            # Mapping header: "start-end perms offset major:minor inode [path]"
+            if path is not None:
+                include = line.rstrip("\n").endswith(path)
+            continue
+        key, _, rest = line.partition(":")
+        if include and key in totals:
+            totals[key] += int(rest.split()[0]) * 1024
+    return totals
+
+
+def process_memory(pid: int | str = "self") -> dict[str, int]:
+    """RSS, PSS, USS and shared bytes of a process ({} where unsupported)."""
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            fields = _parse_smaps(f)
+    except OSError:
+        return {}
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+        "shared": fields["Shared_Clean"] + fields["Shared_Dirty"],
+        "swap": fields["Swap"],
+    }
+
+
+def mapping_memory(path: str, pid: int | str = "self") -> dict[str, int]:
+    """Resident, shared and private bytes of one mapped file in a process."""
+    try:
+        with open(f"/proc/{pid}/smaps") as f:
+            fields = _parse_smaps(f, path)
+    except OSError:
+        return {}
+    return {
+        "rss": fields["Rss"],
+        "shared": fields["Shared_Clean"] + fields["Shared_Dirty"],
+        "private": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def gunicorn_pids() -> list[int]:
+    """PIDs of the gunicorn master and workers visible to this process."""
+    pids = []
+    for entry in os.scandir("/proc"):
+        if not entry.name.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry.name}/cmdline", "rb") as f:
+                cmdline = f.read()
+        except OSError:
+            continue
+        if b"gunicorn" in cmdline:
+            pids.append(int(entry.name))
+    return sorted(pids)
+
+
+def _memory_samples() -> dict[tuple, int]:
+    """Gauge samples of this worker's memory by kind."""
+    return {(("kind", kind),): value for kind, value in process_memory().items()}
+
+
+class GCStats:
+    """
+    Collection counts and pause times, recorded from ``gc.callbacks``.
+
+    The callback runs in the middle of arbitrary allocations, possibly while
+    a lock is held, so it only updates plain lists; the values are read at
+    scrape time.
+    """
+
+    def __init__(self):
+        """Start with zeroed per-generation statistics."""
+        self.collections = [0, 0, 0]
+        self.collected = [0, 0, 0]
+        self.pause_seconds = [0.0, 0.0, 0.0]
+        self.max_pause_seconds = 0.0
+        self._started = None
+
+    def __call__(self, phase: str, info: dict) -> None:
+        """Record one collection's start or stop."""
+        if phase == "start":
+            self._started = time.perf_counter()
+            return
+        if self._started is None:
+            return
+        pause = time.perf_counter() - self._started
+        self._started = None
+        generation = info["generation"]
+        self.collections[generation] += 1
+        self.collected[generation] += info["collected"]
+        self.pause_seconds[generation] += pause
+        self.max_pause_seconds = max(self.max_pause_seconds, pause)
+
+    def samples(self, values: list) -> dict[tuple, float]:
+        """Per-generation samples for the metrics registry."""
+        return {
+            (("generation", str(generation)),): value
+            for generation, value in enumerate(values)
+        }
+
+
+gc_stats = GCStats()
+
+
+def register_memory_metrics(app: Flask) -> None:
+    """Expose this worker's memory breakdown and GC activity on /metrics."""
+    if gc_stats not in gc.callbacks:
+        gc.callbacks.append(gc_stats)
+
+    metrics.gauge(
+        "process_memory_bytes",
+        "Worker memory by kind (rss, pss, uss, shared, swap)",
+        _memory_samples,
+    )
+    metrics.gauge(
+        "gc_collections_total",
+        "Garbage collections by generation",
+        lambda: gc_stats.samples(gc_stats.collections),
+        kind="counter",
+    )
+    metrics.gauge(
+        "gc_collected_objects_total",
+        "Objects freed by the cyclic GC by generation",
+        lambda: gc_stats.samples(gc_stats.collected),
+        kind="counter",
+    )
+    metrics.gauge(
+        "gc_pause_seconds_total",
+        "Time spent in garbage collection by generation",
+        lambda: gc_stats.samples(gc_stats.pause_seconds),
+        kind="counter",
+    )
+    metrics.gauge(
+        "gc_pause_seconds_max",
+        "Longest single garbage collection pause",
+        lambda: gc_stats.max_pause_seconds,
+    )
+    metrics.gauge(
+        "gc_frozen_objects",
+        "Objects moved to the permanent generation by gc.freeze()",
+        gc.get_freeze_count,
+    )
+
+
+@memory_cli.command("report")
+@click.argument("pids", nargs=-1, type=int)
+def report_command(pids):
+    """Private/shared memory per process (default: all gunicorn processes)."""
+    from app.models.snapshot import snapshot_path
+
+    pids = pids or gunicorn_pids() or [os.getpid()]
+    segment = snapshot_path(current_app)
+    mib = 1024 * 1024
+
+    click.echo(
+        f"{'pid':>7} {'rss':>9} {'pss':>9} {'uss':>9} {'shared':>9} {'segment':>9}"
+    )
+    for pid in pids:
+        usage = process_memory(pid)
+        if not usage:
+            click.echo(f"{pid:>7} unavailable")
+            continue
+        mapped = mapping_memory(segment, pid).get("rss", 0)
+        click.echo(
+            f"{pid:>7} {usage['rss'] / mib:>8.1f}M {usage['pss'] / mib:>8.1f}M"
+            f" {usage['uss'] / mib:>8.1f}M {usage['shared'] / mib:>8.1f}M"
+            f" {mapped / 1024:>8.1f}K"
+        )
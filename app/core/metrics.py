@@ -0,0 +1,98 @@
+"""In-process metrics with a Prometheus text endpoint.
+
+Values are kept per worker process, so with several gunicorn workers a
+scrape reports the worker that happened to answer it.
+"""
+
+import threading
+from collections.abc import Callable
+
+from flask import Flask, Response
+
+from app.core.security import require_admin_token
+
+
+class MetricsRegistry:
+    """Thread-safe labelled counters and gauges."""
+
+    def __init__(self):
+        """Create an empty registry."""
+        self._lock = threading.Lock()
+        self._help: dict[str, tuple[str, str]] = {}
+        self._values: dict[str, dict[tuple, float]] = {}
+        self._gauges: dict[str, Callable] = {}
+
+    def counter(self, name: str, help_text: str) -> None:
+        """Declare a counter (idempotent)."""
+        with self._lock:
+            self._help.setdefault(name, ("counter", help_text))
+            self._values.setdefault(name, {})
+
+    def gauge(self, name: str, help_text: str, collect, kind: str = "gauge") -> None:
+        """
+        Declare a metric whose samples come from ``collect()`` at scrape time.
+
+        ``collect`` returns a number or a dict mapping label tuples
+        (``(("key", "value"), ...)``) to numbers. ``kind`` may be "counter"
+        for values that only grow but are kept outside the registry.
+        """
+        with self._lock:
+            self._help[name] = (kind, help_text)
+            self._gauges[name] = collect
+
+    def inc(self, name: str, amount: float = 1, **labels) -> None:
+        """Increment a counter's series for the given labels."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def value(self, name: str, **labels) -> float:
+        """Current value of a counter series."""
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            return self._values.get(name, {}).get(key, 0)
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric."""
+        with self._lock:
+            values = {name: dict(series) for name, series in self._values.items()}
+            gauges = dict(self._gauges)
+            described = dict(self._help)
+
+        for name, collect in gauges.items():
+            sample = collect()
+            values[name] = sample if isinstance(sample, dict) else {(): sample}
+
+        lines = []
+        for name in sorted(values):
+            kind, help_text = described.get(name, ("counter", ""))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in sorted(values[name].items()):
+                label_text = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels)
+                suffix = f"{{{label_text}}}" if label_text else ""
+                lines.append(f"{name}{suffix} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Process-wide registry shared by every module that records metrics
+metrics = MetricsRegistry()
+
+
+def register_metrics(app: Flask) -> None:
+    """Expose the registry at /metrics, guarded by the admin token."""
+
+    @require_admin_token
+    def metrics_endpoint():
+        """Prometheus scrape endpoint."""
+        return Response(
+            metrics.render(), mimetype="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+    app.add_url_rule("/metrics", "metrics", metrics_endpoint)
@@ -0,0 +1,101 @@
+"""Compile-time HTML minification for Jinja templates.
+
+``HTMLMinifyExtension`` rewrites template source before Jinja compiles it,
+so the whitespace and comments are gone from every response without any
+per-request work. Line breaks are kept (only indentation and runs of spaces
+collapse), so template error line numbers still match the files on disk.
+"""
+
+import os
+import re
+
+import click
+from flask import Flask, current_app
+from jinja2.ext import Extension
+
+from app.core.commands import templates_cli
+
+# Regions copied verbatim; everything between them is minified
+PROTECTED = re.compile(
+    r"(?P<raw>\{%-?\s*raw\s*-?%\}.*?\{%-?\s*endraw\s*-?%\})"
+    r"|(?P<jinja>\{#.*?#\}|\{%.*?%\}|\{\{.*?\}\})"
+    r"|(?P<comment><!--.*?-->)"
+    r"|(?P<element><(?P<tag>pre|textarea|script|style)\b.*?</(?P=tag)\s*>)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+WHITESPACE = re.compile(r"\s+")
+
+JINJA_MARKERS = ("{{", "{%", "{#")
+
+
+def _collapse(match: re.Match) -> str:
+    """A whitespace run becomes its line breaks, or one space without any."""
+    newlines = match.group().count("\n")
+    return "\n" * newlines if newlines else " "
+
+
+def minify_html(source: str) -> str:
+    """
+    Strip insignificant whitespace and HTML comments from template source.
+
+    ``<pre>``, ``<textarea>``, ``<script>`` and ``<style>`` elements, Jinja
+    tags and ``{% raw %}`` blocks are left untouched. Comments that contain
+    Jinja syntax or are IE conditional comments are kept as well.
+    """
+    parts = []
+    position = 0
+    for match in PROTECTED.finditer(source):
+        parts.append(WHITESPACE.sub(_collapse, source[position : match.start()]))
+        text = match.group()
+        if match.lastgroup == "comment" and not (
+            text.startswith("<!--[if") or any(m in text for m in JINJA_MARKERS)
+        ):
+            text = "\n" * text.count("\n")
+        parts.append(text)
+        position = match.end()
+    parts.append(WHITESPACE.sub(_collapse, source[position:]))
+    return "".join(parts)
+
+
+class HTMLMinifyExtension(Extension):
+    """Jinja extension that minifies ``.html`` template source on load."""
+
+    def preprocess(self, source, name, filename=None):
+        """Minify HTML templates; other templates pass through."""
+        if name and name.endswith(".html"):
+            return minify_html(source)
+        return source
+
+
+def register_minify(app: Flask) -> None:
+    """Add the minifying extension to the app's Jinja environment."""
+    if app.config.get("HTML_MINIFY", True):
+        app.jinja_env.add_extension(HTMLMinifyExtension)
+
+
+@templates_cli.command("minify-report")
+def minify_report():
+    """Show the bytes saved by minification for each template."""
+    template_folder = os.path.join(current_app.root_path, current_app.template_folder)
+    loader = current_app.jinja_env.loader
+    total_before = total_after = 0
+
+    for name in sorted(loader.list_templates()):
+        if not name.endswith(".html"):
+            continue
+        source, _filename, _uptodate = loader.get_source(current_app.jinja_env, name)
+        before = len(source.encode())
+        after = len(minify_html(source).encode())
+        total_before += before
+        total_after += after
+        saved = before - after
+        percent = saved / before * 100 if before else 0
+        click.echo(f"{saved:>8} B  {percent:5.1f}%  {name}")
+
+    saved = total_before - total_after
+    percent = saved / total_before * 100 if total_before else 0
+    click.echo(
+        f"{saved:>8} B  {percent:5.1f}%  total ({total_before} -> {total_after} bytes"
+        f" in {template_folder})"
+    )
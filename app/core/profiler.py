@@ -0,0 +1,176 @@
+"""On-demand sampling profiler for live workers.
+
+A background thread reads every thread's stack with ``sys._current_frames()``
+at a fixed interval. Each sample is labelled with the endpoint the thread is
+serving, and identical stacks are counted. Request threads are labelled for
+their whole request, profile or not, so requests already running when a
+profile starts are sampled too; the label is one dict write per request.
+Otherwise nothing is instrumented, and the cost is one stack walk per
+interval in the sampler thread.
+
+Results are written to ``PROFILER_DIR`` (default ``instance/profiles``) in
+two formats: collapsed stacks, for ``flamegraph.pl`` and similar tools, and
+speedscope JSON, which opens at https://www.speedscope.app.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import UTC, datetime
+
+from flask import Flask, request
+
+# Deepest stack recorded per sample
+MAX_DEPTH = 128
+
+# Thread id -> endpoint being served, for every request in progress
+_thread_routes: dict[int, str] = {}
+_active: "SamplingProfiler | None" = None
+_active_lock = threading.Lock()
+
+
+class SamplingProfiler(threading.Thread):
+    """Samples the stacks of request threads for a fixed duration."""
+
+    def __init__(self, seconds: float, interval: float, directory: str):
+        """Profile for ``seconds``, sampling every ``interval`` seconds."""
+        super().__init__(name="sampling-profiler", daemon=True)
+        self.seconds = seconds
+        self.interval = interval
+        self.directory = directory
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.started_at = datetime.now(UTC)
+        self.name_prefix = f"{self.started_at:%Y%m%dT%H%M%S}-{os.getpid()}"
+        self._root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+    def run(self) -> None:
+        """Sample until the duration is over, then write the results."""
+        global _active
+        try:
+            own = threading.get_ident()
+            deadline = time.monotonic() + self.seconds
+            while time.monotonic() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    route = _thread_routes.get(thread_id)
+                    if thread_id == own or route is None:
+                        continue
+                    self.stacks[(route, *self._stack(frame))] += 1
+                    self.samples += 1
+                time.sleep(self.interval)
+            self.save()
+        finally:
+            with _active_lock:
+                _active = None
+
+    def _stack(self, frame) -> list[str]:
+        """Frame labels from the outermost call to ``frame``."""
+        labels = []
+        while frame is not None and len(labels) < MAX_DEPTH:
+            code = frame.f_code
+            labels.append(
+                f"{code.co_qualname} ({self._short_path(code.co_filename)}"
+                f":{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        labels.reverse()
+        return labels
+
+    def _short_path(self, path: str) -> str:
+        """Path relative to the project, or its package-relative tail."""
+        if path.startswith(self._root):
+            return os.path.relpath(path, self._root)
+        marker = "site-packages" + os.sep
+        if marker in path:
+            return path.split(marker, 1)[1]
+        return os.path.basename(path)
+
+    def collapsed(self) -> str:
+        """Collapsed stacks: ``route;outer;...;inner count`` per line."""
+        return "".join(
+            f"{';'.join(stack)} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def speedscope(self) -> dict:
+        """The samples as a speedscope "sampled" profile."""
+        frames: list[dict] = []
+        index: dict[str, int] = {}
+        samples, weights = [], []
+        for stack, count in self.stacks.most_common():
+            sample = []
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    frames.append({"name": label})
+                sample.append(index[label])
+            samples.append(sample)
+            weights.append(count * self.interval)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name_prefix,
+            "exporter": "kusse-tech-studio",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"pid {os.getpid()}, {self.samples} samples",
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+            ],
+        }
+
+    def save(self) -> list[str]:
+        """Write both formats to the profile directory."""
+        os.makedirs(self.directory, exist_ok=True)
+        base = os.path.join(self.directory, self.name_prefix)
+        with open(f"{base}.collapsed.txt", "w") as f:
+            f.write(self.collapsed())
+        with open(f"{base}.speedscope.json", "w") as f:
+            json.dump(self.speedscope(), f)
+        return [f"{base}.collapsed.txt", f"{base}.speedscope.json"]
+
+
+def start_profile(
+    seconds: float, interval: float, directory: str
+) -> SamplingProfiler | None:
+    """Start profiling this worker, or return None if a profile is running."""
+    global _active
+    with _active_lock:
+        if _active is not None:
+            return None
+        _active = profiler = SamplingProfiler(seconds, interval, directory)
+    profiler.start()
+    return profiler
+
+
+def active_profile() -> SamplingProfiler | None:
+    """The profile running in this worker, if any."""
+    return _active
+
+
+def profile_dir(app: Flask) -> str:
+    """Configured profile directory, defaulting to the instance folder."""
+    return app.config.get("PROFILER_DIR") or os.path.join(app.instance_path, "profiles")
+
+
+def _label_thread() -> None:
+    """Remember which endpoint this thread serves."""
+    _thread_routes[threading.get_ident()] = request.endpoint or request.path
+
+
+def _unlabel_thread(exc=None) -> None:
+    """Forget the thread's endpoint at the end of the request."""
+    _thread_routes.pop(threading.get_ident(), None)
+
+
+def register_profiler(app: Flask) -> None:
+    """Label request threads so samples carry their route."""
+    app.before_request(_label_thread)
+    app.teardown_request(_unlabel_thread)
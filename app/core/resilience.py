@@ -0,0 +1,347 @@
+"""Circuit breakers, deadlines and fallbacks for outbound calls.
+
+Every external dependency (PostHog, GitHub, OpenAI) gets a circuit breaker.
+After ``CIRCUIT_FAILURE_THRESHOLD`` consecutive failures the breaker opens
+and calls are skipped. After ``CIRCUIT_RESET_TIMEOUT`` seconds one probe
+call is let through (half-open). A success closes the breaker and a failure
+opens it again.
+
+Each request also gets a deadline (``REQUEST_DEADLINE`` seconds). An
+outbound call's timeout is the smaller of the dependency's own timeout and
+the time left before the deadline. Once the deadline has passed, outbound
+calls are not made at all. Instead of failing the page, skipped or failed
+calls return the last good result or a fallback value.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+
+from flask import Flask, current_app, g, has_app_context, has_request_context
+
+from app.core.metrics import metrics
+from app.core.tracing import KIND_CLIENT, span
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Gauge values for circuit_state
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Dependencies guarded out of the box
+DEPENDENCIES = ("posthog", "github", "openai")
+
+DEFAULT_TIMEOUT = 10.0
+
+# Below this many seconds of budget a call cannot usefully be made
+MIN_CALL_BUDGET = 0.05
+
+
+class DependencyError(Exception):
+    """A dependency answered, but with an error that counts as a failure."""
+
+
+class DeadlineExceededError(DependencyError):
+    """The request deadline left no time for an outbound call."""
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker for one dependency."""
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        """Create a closed breaker."""
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """Whether a call may go out now (one probe at a time when half-open)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = HALF_OPEN
+                self._probing = False
+            # A probe whose outcome never came back (e.g. a dropped PostHog
+            # upload) must not keep the breaker half-open forever
+            if self._probing and time.monotonic() - self._probe_started < (
+                self.reset_timeout
+            ):
+                return False
+            self._probing = True
+            self._probe_started = time.monotonic()
+            return True
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the breaker at the threshold."""
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == OPEN:
+                return
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self.trips += 1
+                metrics.inc("circuit_trips_total", dependency=self.name)
+
+
+class FallbackCache:
+    """Last good result per call, served while a dependency is failing."""
+
+    def __init__(self, size: int = 256):
+        """Keep at most ``size`` results."""
+        self.size = size
+        self._values: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Last good result for ``key``, or None."""
+        with self._lock:
+            return self._values.get(key)
+
+    def put(self, key, value) -> None:
+        """Remember a good result, evicting the oldest beyond the size."""
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.size:
+                self._values.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every result."""
+        with self._lock:
+            self._values.clear()
+
+
+# Process-wide, like the metrics registry: breaker state is per worker
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+fallback_cache = FallbackCache()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """The breaker for a dependency, created from the app config on first use."""
+    breaker = _breakers.get(name)
+    if breaker is not None:
+        return breaker
+    threshold, reset_timeout = 5, 30.0
+    if has_app_context():
+        threshold = current_app.config["CIRCUIT_FAILURE_THRESHOLD"]
+        reset_timeout = current_app.config["CIRCUIT_RESET_TIMEOUT"]
+    with _breakers_lock:
+        return _breakers.setdefault(
+            name, CircuitBreaker(name, threshold, reset_timeout)
+        )
+
+
+def reset_breakers() -> None:
+    """Drop every breaker and cached fallback (tests, config changes)."""
+    with _breakers_lock:
+        _breakers.clear()
+    fallback_cache.clear()
+
+
+def start_deadline() -> None:
+    """Start the request's outbound-call budget."""
+    g.deadline = time.monotonic() + current_app.config["REQUEST_DEADLINE"]
+
+
+def remaining_budget(cap: float) -> float:
+    """
+    Timeout for an outbound call: ``cap`` limited by the request deadline.
+
+    Raises DeadlineExceededError when too little time is left.
+    """
+    if not has_request_context() or "deadline" not in g:
+        return cap
+    remaining = g.deadline - time.monotonic()
+    if remaining < MIN_CALL_BUDGET:
+        raise DeadlineExceededError("request deadline reached")
+    return min(cap, remaining)
+
+
+def dependency_timeout(name: str) -> float:
+    """Configured per-call timeout of a dependency."""
+    if not has_app_context():
+        return DEFAULT_TIMEOUT
+    return current_app.config["DEPENDENCY_TIMEOUTS"].get(name, DEFAULT_TIMEOUT)
+
+
+def _admit(name: str) -> tuple[float | None, str | None]:
+    """Timeout for a call, or the outcome explaining why it is skipped."""
+    try:
+        timeout = remaining_budget(dependency_timeout(name))
+    except DeadlineExceededError:
+        return None, "deadline"
+    if not get_breaker(name).allow():
+        return None, "rejected"
+    return timeout, None
+
+
+def _succeeded(name: str, result, cache_key, record_success: bool = True):
+    """Close the breaker and remember the result."""
+    if record_success:
+        get_breaker(name).record_success()
+    metrics.inc("dependency_calls_total", dependency=name, outcome="ok")
+    if cache_key is not None and result is not None:
+        fallback_cache.put((name, cache_key), result)
+    return result
+
+
+def _failed(name: str, error: Exception) -> str:
+    """Count a failure against the breaker."""
+    get_breaker(name).record_failure()
+    if has_app_context():
+        current_app.logger.error(f"{name} call failed: {error}")
+    return "failure"
+
+
+def _skipped(name: str, outcome: str, fallback, cache_key):
+    """Last good result for ``cache_key``, else ``fallback``."""
+    metrics.inc("dependency_calls_total", dependency=name, outcome=outcome)
+    if cache_key is not None:
+        cached = fallback_cache.get((name, cache_key))
+        if cached is not None:
+            return cached
+    return fallback
+
+
+def call_dependency(
+    name: str,
+    func: Callable[[float], object],
+    fallback=None,
+    cache_key=None,
+    record_success: bool = True,
+):
+    """
+    Call ``func(timeout)`` under the dependency's breaker and the deadline.
+
+    ``func`` raises to report a failure (network errors, 5xx, rate limits)
+    and returns None for answers that are not worth caching (e.g. a 404).
+    When the call is skipped or fails, the last good result for
+    ``cache_key`` is returned if there is one, else ``fallback``.
+
+    Pass ``record_success=False`` when ``func`` only hands work to a
+    background sender (PostHog's queue): returning proves nothing about the
+    dependency, and the sender reports the real outcome itself.
+    """
+    timeout, outcome = _admit(name)
+    if outcome is None:
+        try:
+            with span(name, KIND_CLIENT, **{"peer.service": name}):
+                result = func(timeout)
+        except Exception as e:
+            outcome = _failed(name, e)
+        else:
+            return _succeeded(name, result, cache_key, record_success)
+    return _skipped(name, outcome, fallback, cache_key)
+
+
+async def call_dependency_async(
+    name: str,
+    func: Callable[[float], Awaitable[object]],
+    fallback=None,
+    cache_key=None,
+):
+    """``call_dependency`` for coroutines: awaits ``func(timeout)``."""
+    timeout, outcome = _admit(name)
+    if outcome is None:
+        try:
+            with span(name, KIND_CLIENT, **{"peer.service": name}):
+                result = await func(timeout)
+        except Exception as e:
+            outcome = _failed(name, e)
+        else:
+            return _succeeded(name, result, cache_key)
+    return _skipped(name, outcome, fallback, cache_key)
+
+
+def _circuit_samples() -> dict[tuple, int]:
+    """Gauge samples of every breaker's state."""
+    return {
+        (("dependency", name),): STATE_VALUES[breaker.state]
+        for name, breaker in list(_breakers.items())
+    }
+
+
+def check_circuits() -> str | None:
+    """Health check: report dependencies whose breaker is not closed."""
+    tripped = [name for name, b in list(_breakers.items()) if b.state != CLOSED]
+    return f"circuit open: {', '.join(sorted(tripped))}" if tripped else None
+
+
+def _observe_posthog_uploads(consumer) -> None:
+    """
+    Report every PostHog upload attempt to the ``posthog`` breaker.
+
+    ``posthog.capture`` only queues events; the consumer thread sends them
+    with ``batch_post`` (retrying with backoff). Wrapping that function
+    gives the breaker the outcome of each real request.
+    """
+    send = consumer.batch_post
+    if getattr(send, "observed_by_breaker", False):
+        return
+
+    def batch_post(*args, **kwargs):
+        try:
+            response = send(*args, **kwargs)
+        except Exception:
+            get_breaker("posthog").record_failure()
+            raise
+        get_breaker("posthog").record_success()
+        return response
+
+    batch_post.observed_by_breaker = True
+    consumer.batch_post = batch_post
+
+
+def register_resilience(app: Flask) -> None:
+    """Start request deadlines, create the breakers and export their state."""
+    from app.core.health import add_health_check
+
+    with app.app_context():
+        for name in DEPENDENCIES:
+            get_breaker(name)
+
+    app.before_request(start_deadline)
+
+    metrics.counter("circuit_trips_total", "Times a dependency's circuit opened")
+    metrics.counter(
+        "dependency_calls_total",
+        "Outbound calls by outcome (ok, failure, rejected, deadline)",
+    )
+    metrics.gauge(
+        "circuit_state",
+        "Circuit breaker state per dependency (0 closed, 1 half-open, 2 open)",
+        _circuit_samples,
+    )
+    add_health_check(app, "circuits", check_circuits)
+
+    try:
+        from posthog import consumer
+    except ImportError:
+        return
+    # Uploads happen in PostHog's consumer thread; their results drive the
+    # breaker so track_event stops queueing events for a dead endpoint
+    _observe_posthog_uploads(consumer)
@@ -0,0 +1,142 @@
+"""WSGI short-circuit for vulnerability-scanner probes.
+
+Requests for paths like ``/wp-admin`` or ``/.env`` never match a route on
+this site. They are answered with a tiny 404 before Flask builds a request,
+routes it or renders anything.
+"""
+
+import re
+
+from flask import Flask
+
+from app.core.metrics import metrics
+
+# Path prefixes probed by scanners; matched case-insensitively
+SCANNER_PREFIXES = [
+    "/.env",
+    "/.git",
+    "/.svn",
+    "/.hg",
+    "/.aws",
+    "/.ssh",
+    "/.vscode",
+    "/.ds_store",
+    "/.htaccess",
+    "/.htpasswd",
+    "/wp-admin",
+    "/wp-login",
+    "/wp-content",
+    "/wp-includes",
+    "/wp-json",
+    "/wordpress",
+    "/xmlrpc.php",
+    "/phpmyadmin",
+    "/phpunit",
+    "/vendor/phpunit",
+    "/pma/",
+    "/myadmin",
+    "/mysql",
+    "/cgi-bin",
+    "/boaform",
+    "/hnap1",
+    "/actuator",
+    "/solr/",
+    "/druid/",
+    "/owa/",
+    "/ecp/",
+    "/autodiscover",
+    "/manager/html",
+    "/server-status",
+    "/telescope",
+    "/_ignition",
+    "/containers/json",
+    "/config.json",
+    "/debug/default",
+]
+
+# File extensions this site never serves
+SCANNER_EXTENSIONS = ["php", "php5", "php7", "asp", "aspx", "jsp", "cgi", "bak", "sql"]
+
+
+def trie_pattern(words: list[str]) -> str:
+    """
+    Regex source matching any of ``words`` as a prefix.
+
+    The words are folded into a character trie first, so shared prefixes
+    are compared once (``/wp-(?:admin|login|...)``) instead of once per word.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        if "" in node:
+            # A shorter word ends here; anything after it matches too
+            return ""
+        branches = [
+            re.escape(char) + build(child) for char, child in sorted(node.items())
+        ]
+        if len(branches) == 1:
+            return branches[0]
+        return f"(?:{'|'.join(branches)})"
+
+    return build(trie)
+
+
+def compile_scanner_pattern(prefixes: list[str], extensions: list[str]) -> re.Pattern:
+    """One anchored pattern for the path prefixes and file extensions."""
+    prefix_pattern = trie_pattern(sorted({prefix.lower() for prefix in prefixes}))
+    extension_pattern = "|".join(
+        re.escape(extension) for extension in sorted(extensions, key=len, reverse=True)
+    )
+    return re.compile(
+        rf"(?P<prefix>{prefix_pattern})|(?P<extension>.*\.(?:{extension_pattern})$)",
+        re.IGNORECASE,
+    )
+
+
+metrics.counter("scanner_requests_total", "Scanner probes answered before routing")
+metrics.counter("scanner_bytes_total", "Response bytes spent on scanner probes")
+
+
+class ScannerFilter:
+    """WSGI middleware answering scanner probes with a bare 404."""
+
+    body = b"Not Found"
+
+    def __init__(self, wsgi_app, pattern: re.Pattern):
+        """Wrap ``wsgi_app``; paths matching ``pattern`` never reach it."""
+        self.wsgi_app = wsgi_app
+        self.pattern = pattern
+
+    def __call__(self, environ, start_response):
+        """Answer matching paths directly, pass everything else on."""
+        match = self.pattern.match(environ.get("PATH_INFO", ""))
+        if match is None:
+            return self.wsgi_app(environ, start_response)
+
+        metrics.inc("scanner_requests_total", kind=match.lastgroup)
+        metrics.inc("scanner_bytes_total", len(self.body))
+        start_response(
+            "404 Not Found",
+            [
+                ("Content-Type", "text/plain; charset=utf-8"),
+                ("Content-Length", str(len(self.body))),
+                ("Cache-Control", "public, max-age=86400"),
+            ],
+        )
+        return [self.body]
+
+
+def register_scanner_filter(app: Flask) -> None:
+    """Put the scanner filter in front of the Flask application."""
+    if not app.config.get("SCANNER_FILTER", True):
+        return
+    pattern = compile_scanner_pattern(
+        SCANNER_PREFIXES + app.config.get("SCANNER_EXTRA_PREFIXES", []),
+        SCANNER_EXTENSIONS,
+    )
+    app.wsgi_app = ScannerFilter(app.wsgi_app, pattern)
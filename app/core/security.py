@@ -0,0 +1,42 @@
+"""Access control helpers."""
+
+import hmac
+from functools import partial, wraps
+
+from flask import abort, current_app, make_response, request
+
+
+def require_admin_token(f=None, *, allow_query: bool = True):
+    """
+    Restrict a view to requests carrying the configured ADMIN_TOKEN.
+
+    The token is read from an ``Authorization: Bearer`` header or, unless
+    ``allow_query`` is false, a ``token`` query parameter. Query strings are
+    written to access logs (and replayed from them), so operational
+    endpoints use ``@require_admin_token(allow_query=False)``. Without a
+    configured token the view is only reachable in debug mode; unauthorized
+    requests get a 404. Responses are marked ``private, no-store`` so no
+    cache keeps them.
+    """
+    if f is None:
+        return partial(require_admin_token, allow_query=allow_query)
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        expected = current_app.config.get("ADMIN_TOKEN")
+        if not expected:
+            if not current_app.debug:
+                abort(404)
+        else:
+            auth = request.headers.get("Authorization", "")
+            supplied = auth.removeprefix("Bearer ").strip()
+            if not supplied and allow_query:
+                supplied = request.args.get("token", "")
+            if not hmac.compare_digest(supplied.encode(), expected.encode()):
+                abort(404)
+
+        response = make_response(f(*args, **kwargs))
+        response.headers["Cache-Control"] = "private, no-store"
+        return response
+
+    return decorated_function
@@ -0,0 +1,145 @@
+"""Read-only data segments shared by every worker through mmap.
+
+A segment is a single file::
+
+    magic (8 bytes) | format version (uint32) | TOC length (uint32) | TOC JSON
+    | blob | blob | ...
+
+The TOC maps each entry name to ``[offset, length, typecode]``; blobs are
+8-byte aligned. Workers map the file read-only, so the page cache holds one
+copy for all of them, and entries are handed out as memoryviews without
+copying. A new segment is written to a temporary file and moved into place
+with ``os.replace``; readers swap to it atomically and the old mapping is
+released once nothing references it.
+"""
+
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+
+MAGIC = b"KTSSEG01"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sII")
+ALIGNMENT = 8
+
+
+class SegmentWriter:
+    """Collects entries and writes them as one segment file."""
+
+    def __init__(self, meta: dict | None = None):
+        """Start an empty segment with optional metadata."""
+        self.meta = meta or {}
+        self._entries: dict[str, tuple[bytes, str]] = {}
+
+    def add_bytes(self, name: str, data: bytes) -> None:
+        """Add a raw blob."""
+        self._entries[name] = (bytes(data), "B")
+
+    def add_array(self, name: str, typecode: str, values) -> None:
+        """Add a typed array, readable later as a cast memoryview."""
+        self._entries[name] = (array(typecode, values).tobytes(), typecode)
+
+    def add_json(self, name: str, value) -> None:
+        """Add a JSON document."""
+        encoded = json.dumps(value, separators=(",", ":")).encode()
+        self._entries[name] = (encoded, "json")
+
+    def write(self, path: str) -> None:
+        """Write the segment atomically to ``path``."""
+        toc = {}
+        offset = 0
+        for name, (data, typecode) in self._entries.items():
+            toc[name] = [offset, len(data), typecode]
+            offset += _aligned(len(data))
+
+        toc_bytes = json.dumps({"meta": self.meta, "entries": toc}).encode()
+        data_start = _aligned(HEADER.size + len(toc_bytes))
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(toc_bytes)))
+            f.write(toc_bytes)
+            f.write(bytes(data_start - HEADER.size - len(toc_bytes)))
+            for data, _typecode in self._entries.values():
+                f.write(data)
+                f.write(bytes(_aligned(len(data)) - len(data)))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+class Segment:
+    """A mapped segment file with zero-copy access to its entries."""
+
+    def __init__(self, path: str):
+        """Map the segment at ``path`` read-only."""
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.inode = os.fstat(f.fileno()).st_ino
+
+        magic, version, toc_length = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} segment")
+        toc = json.loads(self._map[HEADER.size : HEADER.size + toc_length])
+        self.meta = toc["meta"]
+        self._entries = toc["entries"]
+        self._data_start = _aligned(HEADER.size + toc_length)
+        self._view = memoryview(self._map)
+
+    def __contains__(self, name: str) -> bool:
+        """Whether the segment has an entry called ``name``."""
+        return name in self._entries
+
+    def names(self, prefix: str = "") -> list[str]:
+        """Entry names starting with ``prefix``."""
+        return [name for name in self._entries if name.startswith(prefix)]
+
+    def view(self, name: str) -> memoryview:
+        """Raw bytes of an entry, without copying."""
+        offset, length, _typecode = self._entries[name]
+        start = self._data_start + offset
+        return self._view[start : start + length]
+
+    def array(self, name: str) -> memoryview:
+        """A typed array entry as a memoryview cast to its typecode."""
+        typecode = self._entries[name][2]
+        return self.view(name).cast(typecode)
+
+    def json(self, name: str):
+        """Decode a JSON entry."""
+        return json.loads(self.view(name).tobytes())
+
+    @property
+    def size(self) -> int:
+        """Mapped size in bytes."""
+        return len(self._map)
+
+
+class SegmentStore:
+    """The current segment for a path, swapped when the file is replaced."""
+
+    def __init__(self, path: str):
+        """Open the segment at ``path``."""
+        self.path = path
+        self._lock = threading.Lock()
+        self.current = Segment(path)
+
+    def reload(self) -> bool:
+        """Swap to the file now at the path if it is a new segment."""
+        with self._lock:
+            if os.stat(self.path).st_ino == self.current.inode:
+                return False
+            # Readers holding the old segment keep using it; its mapping is
+            # released when the last reference goes away
+            self.current = Segment(self.path)
+            return True
+
+
+def _aligned(size: int) -> int:
+    """Round ``size`` up to the blob alignment."""
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
@@ -0,0 +1,194 @@
+"""Endpoint-aware Sentry trace and profile sampling.
+
+Sentry calls ``traces_sampler`` when a transaction starts, before anything
+is known about how the request will go. The policy therefore decides with
+what it knows at that point:
+
+- path rules (``SENTRY_SAMPLING_RULES``): health checks, static files,
+  robots.txt and the like are never sampled;
+- crawlers are sampled at ``SENTRY_BOT_SAMPLE_RATE``;
+- paths that were recently slow (over ``SENTRY_SLOW_REQUEST_MS``) or
+  answered 5xx are boosted to ``SENTRY_BOOST_SAMPLE_RATE`` for
+  ``SENTRY_BOOST_WINDOW`` seconds, so rare slow endpoints get traced when it
+  matters;
+- a budget: every minute the rates are scaled so the expected number of
+  transactions stays within ``SENTRY_TRACES_PER_MINUTE`` per worker.
+
+An incoming ``sentry-trace`` header decides for ordinary requests, so
+distributed traces stay whole, but it is still subject to the budget and
+never overrides the path rules or the crawler rate: anyone can send the
+header.
+
+Profiles are sampled relative to traces, and always for boosted paths. The
+sampler's own cost is exported on /metrics.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Flask, g, request
+
+from app.analytics.bots import classify_user_agent
+from app.core.metrics import metrics
+
+# Paths remembered as slow or failing; oldest forgotten first
+MAX_BOOSTED_PATHS = 1024
+
+metrics.counter("sentry_sampler_calls_total", "traces_sampler decisions")
+metrics.counter("sentry_sampler_seconds_total", "Time spent in traces_sampler")
+metrics.counter(
+    "sentry_sampler_decisions_total", "Sampling decisions by outcome and reason"
+)
+
+
+class SamplingPolicy:
+    """Per-path, budgeted and self-boosting sampling decisions."""
+
+    def __init__(
+        self,
+        default_rate: float,
+        profiles_rate: float,
+        rules: list[tuple[str, float]],
+        bot_rate: float = 0.0,
+        per_minute: float = 60,
+        slow_ms: float = 1000,
+        boost_rate: float = 1.0,
+        boost_window: float = 300,
+    ):
+        """Build a policy; ``rules`` are (path regex, rate), first match wins."""
+        self.default_rate = default_rate
+        self.profiles_rate = profiles_rate
+        self.rules = [(re.compile(pattern), rate) for pattern, rate in rules]
+        self.bot_rate = bot_rate
+        self.per_minute = per_minute
+        self.slow_seconds = slow_ms / 1000
+        self.boost_rate = boost_rate
+        self.boost_window = boost_window
+
+        self.factor = 1.0
+        self._expected = 0.0
+        self._window_start = time.monotonic()
+        self._boosted: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config) -> "SamplingPolicy":
+        """Build the policy from the app config."""
+        return cls(
+            default_rate=config["SENTRY_TRACES_SAMPLE_RATE"],
+            profiles_rate=config["SENTRY_PROFILES_SAMPLE_RATE"],
+            rules=config["SENTRY_SAMPLING_RULES"],
+            bot_rate=config["SENTRY_BOT_SAMPLE_RATE"],
+            per_minute=config["SENTRY_TRACES_PER_MINUTE"],
+            slow_ms=config["SENTRY_SLOW_REQUEST_MS"],
+            boost_rate=config["SENTRY_BOOST_SAMPLE_RATE"],
+            boost_window=config["SENTRY_BOOST_WINDOW"],
+        )
+
+    def base_rate(self, path: str, user_agent: str) -> tuple[float, str]:
+        """Rate before the budget is applied, with the reason for it."""
+        for pattern, rate in self.rules:
+            if pattern.match(path):
+                return rate, "rule"
+        if classify_user_agent(user_agent) is not None:
+            return self.bot_rate, "bot"
+        if self.is_boosted(path):
+            return max(self.boost_rate, self.default_rate), "boost"
+        return self.default_rate, "default"
+
+    def is_boosted(self, path: str) -> bool:
+        """Whether ``path`` was slow or failed within the boost window."""
+        flagged = self._boosted.get(path)
+        return flagged is not None and time.monotonic() - flagged < self.boost_window
+
+    def _budgeted(self, rate: float) -> float:
+        """Apply the budget factor and count the expected transactions."""
+        with self._lock:
+            now = time.monotonic()
+            elapsed = now - self._window_start
+            if elapsed >= 60:
+                # Scale so last minute's traffic would have fitted the budget
+                expected_per_minute = self._expected * 60 / elapsed
+                if expected_per_minute > 0:
+                    self.factor = min(1.0, self.per_minute / expected_per_minute)
+                else:
+                    self.factor = 1.0
+                self._expected = 0.0
+                self._window_start = now
+            self._expected += rate
+            return rate * self.factor
+
+    def decide(self, path: str, user_agent: str, parent_sampled) -> tuple[float, str]:
+        """Final trace sample rate for a request and the reason."""
+        rate, reason = self.base_rate(path, user_agent)
+        if (
+            parent_sampled is not None
+            and reason != "bot"
+            and not (reason == "rule" and rate == 0)
+        ):
+            # Keep distributed traces whole: follow the caller's decision,
+            # within the budget like any other sampled request
+            rate, reason = (1.0 if parent_sampled else 0.0), "parent"
+        if rate <= 0:
+            return 0.0, reason
+        budgeted = self._budgeted(rate)
+        return budgeted, "budget" if budgeted < rate else reason
+
+    def traces_sampler(self, sampling_context: dict) -> float:
+        """``traces_sampler`` for ``sentry_sdk.init``."""
+        started = time.perf_counter()
+        environ = sampling_context.get("wsgi_environ") or {}
+        rate, reason = self.decide(
+            environ.get("PATH_INFO", ""),
+            environ.get("HTTP_USER_AGENT", ""),
+            sampling_context.get("parent_sampled"),
+        )
+        # Decide here so the outcome can be counted; Sentry treats 0/1 as final
+        sampled = rate >= 1 or (rate > 0 and random.random() < rate)  # noqa: S311
+        metrics.inc(
+            "sentry_sampler_decisions_total",
+            decision="sampled" if sampled else "dropped",
+            reason=reason,
+        )
+        metrics.inc("sentry_sampler_calls_total")
+        metrics.inc("sentry_sampler_seconds_total", time.perf_counter() - started)
+        return 1.0 if sampled else 0.0
+
+    def profiles_sampler(self, sampling_context: dict) -> float:
+        """``profiles_sampler``: share of sampled transactions to profile."""
+        environ = sampling_context.get("wsgi_environ") or {}
+        if self.is_boosted(environ.get("PATH_INFO", "")):
+            return 1.0
+        return self.profiles_rate
+
+    def observe(self, path: str, seconds: float | None, status: int) -> None:
+        """Boost a path that was slow or failed."""
+        if status < 500 and (seconds is None or seconds < self.slow_seconds):
+            return
+        with self._lock:
+            self._boosted[path] = time.monotonic()
+            self._boosted.move_to_end(path)
+            while len(self._boosted) > MAX_BOOSTED_PATHS:
+                self._boosted.popitem(last=False)
+
+    def observe_response(self, response):
+        """after_request hook feeding ``observe``."""
+        started = g.get("request_started")
+        seconds = time.perf_counter() - started if started is not None else None
+        self.observe(request.path, seconds, response.status_code)
+        return response
+
+
+def register_sentry_sampling(app: Flask) -> SamplingPolicy:
+    """Create the policy and feed it request outcomes."""
+    policy = app.extensions["sentry_sampling"] = SamplingPolicy.from_config(app.config)
+    app.after_request(policy.observe_response)
+    metrics.gauge(
+        "sentry_sampling_factor",
+        "Budget scaling currently applied to Sentry trace sample rates",
+        lambda: policy.factor,
+    )
+    return policy
@@ -0,0 +1,158 @@
+"""Service worker serving and precache manifest generation."""
+
+import json
+import os
+
+import click
+from flask import Flask, Response, current_app, request
+
+from app.core.commands import assets_cli
+from app.core.invalidation import stat_checks_enabled
+from app.core.static_files import is_stable_static_file
+from app.core.utils import file_content_hash, find_vite_manifest, load_vite_manifest
+
+# Written next to the Vite build so `npm run clean` removes it as well
+PRECACHE_MANIFEST_PATH = os.path.join("dist", "precache-manifest.json")
+
+# Pages cached for offline use; they are revisioned by the content version
+PRECACHE_PAGES = ["/", "/offline.html", "/projects/", "/contact", "/about"]
+
+# Non-Vite static files cached on install
+PRECACHE_STATIC_FILES = ["images/ksb-logo.png", "manifest.json"]
+
+_manifest_cache: dict[str, tuple[tuple, dict]] = {}
+
+
+def read_content_version(static_folder: str) -> str:
+    """Read the deployed content version from ``version.json``."""
+    try:
+        with open(os.path.join(static_folder, "version.json")) as f:
+            return str(json.load(f).get("version", "unknown"))
+    except (OSError, ValueError):
+        return "unknown"
+
+
+def build_precache_manifest(static_folder: str) -> dict:
+    """
+    Build the precache list from the Vite manifest and ``version.json``.
+
+    Every Vite output (entry files, chunks, CSS and emitted assets) gets the
+    hash of its contents as revision, so the service worker only re-fetches
+    files whose bytes changed between deploys.
+    """
+    version = read_content_version(static_folder)
+    revisions = {}
+    filenames = list(PRECACHE_STATIC_FILES)
+
+    for chunk in load_vite_manifest(static_folder).values():
+        outputs = [chunk["file"], *chunk.get("css", []), *chunk.get("assets", [])]
+        filenames.extend(f"dist/{output}" for output in outputs)
+
+    for filename in filenames:
+        path = os.path.join(static_folder, filename)
+        if not os.path.isfile(path):
+            continue
+        revision = file_content_hash(path)
+        # Use the same URL that static_url() puts into rendered pages
+        if is_stable_static_file(filename):
+            revisions[f"/static/{filename}"] = revision
+        else:
+            revisions[f"/static/{filename}?v={revision}"] = revision
+
+    # Rendered pages change whenever the deployed content changes
+    for page in PRECACHE_PAGES:
+        revisions[page] = version
+
+    return {
+        "version": version,
+        "entries": [
+            {"url": url, "revision": revision}
+            for url, revision in sorted(revisions.items())
+        ],
+    }
+
+
+def write_precache_manifest(static_folder: str) -> str:
+    """Build the precache manifest and write it into the static folder."""
+    manifest = build_precache_manifest(static_folder)
+    path = os.path.join(static_folder, PRECACHE_MANIFEST_PATH)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return path
+
+
+def _mtime(path: str | None) -> float | None:
+    """Return the modification time of a file, or None if it is missing."""
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+def get_precache_manifest(static_folder: str) -> dict:
+    """
+    Return the precache manifest for the current build.
+
+    The build-time manifest is preferred; without one (e.g. in development)
+    it is computed from the Vite build. Either way the result is cached until
+    the ``assets`` namespace is invalidated, or, with CACHE_STAT_CHECKS, until
+    one of its inputs changes on disk.
+    """
+    cached = _manifest_cache.get(static_folder)
+    if cached and not stat_checks_enabled():
+        return cached[1]
+
+    built_path = os.path.join(static_folder, PRECACHE_MANIFEST_PATH)
+    stamp = (
+        _mtime(built_path),
+        _mtime(find_vite_manifest(static_folder)),
+        _mtime(os.path.join(static_folder, "version.json")),
+    )
+    if cached and cached[0] == stamp:
+        return cached[1]
+
+    if stamp[0] is not None:
+        with open(built_path) as f:
+            manifest = json.load(f)
+    else:
+        manifest = build_precache_manifest(static_folder)
+
+    _manifest_cache[static_folder] = (stamp, manifest)
+    return manifest
+
+
+def render_service_worker(static_folder: str) -> str:
+    """Return the service worker source with the precache manifest injected."""
+    with open(os.path.join(static_folder, "sw.js")) as f:
+        source = f.read()
+
+    manifest = json.dumps(get_precache_manifest(static_folder), separators=(",", ":"))
+    return f"self.__PRECACHE_MANIFEST = {manifest};\n{source}"
+
+
+def register_service_worker(app: Flask) -> None:
+    """Serve the service worker from the site root with its precache list."""
+
+    @app.route("/sw.js")
+    def service_worker():
+        """Serve the service worker with the precache manifest injected."""
+        response = Response(
+            render_service_worker(current_app.static_folder),
+            mimetype="application/javascript",
+        )
+        # Browsers revalidate the worker script on every navigation
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["Service-Worker-Allowed"] = "/"
+        response.add_etag()
+        return response.make_conditional(request)
+
+
+@assets_cli.command("precache")
+def precache_command():
+    """Write the service worker precache manifest for the current build."""
+    path = write_precache_manifest(current_app.static_folder)
+    with open(path) as f:
+        count = len(json.load(f)["entries"])
+    click.echo(f"Wrote {count} precache entries to {path}")
@@ -0,0 +1,133 @@
+"""Server-sent event relays for slow generated content.
+
+``relay_stream`` sends each chunk of an upstream stream (e.g. OpenAI tokens)
+to the browser as an SSE ``message`` event the moment it arrives, then a
+``done`` event with the assembled text. A stream that fails, or ends
+without any text (circuit open, deadline passed, API error), ends with an
+``error`` event instead. Completed results are cached, so
+asking again replays the cached text at once without another upstream
+call.
+
+When the browser disconnects, the WSGI server closes the response. Closing
+it closes the upstream iterator, which aborts the upstream request, and
+nothing partial is cached. ``flask cache invalidate generated`` clears the
+cache in every worker.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+
+from flask import Flask, Response, current_app, stream_with_context
+
+from app.core.invalidation import on_invalidate
+from app.core.metrics import metrics
+
+metrics.counter(
+    "sse_streams_total",
+    "Server-sent event relays by outcome (completed, cached, cancelled, failed)",
+)
+
+
+class ResultCache:
+    """Assembled results by key, least recently used first out."""
+
+    def __init__(self, size: int = 128, ttl: float = 3600):
+        """Keep up to ``size`` results for ``ttl`` seconds."""
+        self.size = size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> str | None:
+        """A cached result that has not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, value: str) -> None:
+        """Cache a completed result."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Forget every result."""
+        with self._lock:
+            self._entries.clear()
+
+
+def sse_event(data: str, event: str | None = None) -> str:
+    """One SSE event; multi-line data is sent as several ``data:`` lines."""
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in data.split("\n")]
+    return "\n".join(lines) + "\n\n"
+
+
+def _relay(cache: ResultCache, key: tuple, chunks: Iterator[str]) -> Iterator[str]:
+    """SSE events for ``chunks``, caching the result once it is complete."""
+    parts: list[str] = []
+    outcome = "cancelled"
+    try:
+        for chunk in chunks:
+            parts.append(chunk)
+            # JSON-encoded so whitespace-only tokens survive the SSE framing
+            yield sse_event(json.dumps(chunk))
+        result = "".join(parts)
+        if not result:
+            outcome = "failed"
+            yield sse_event(json.dumps("nothing was generated"), event="error")
+            return
+        cache.put(key, result)
+        outcome = "completed"
+        yield sse_event(json.dumps(result), event="done")
+    except Exception:
+        outcome = "failed"
+        current_app.logger.exception("Streamed generation failed")
+        yield sse_event(json.dumps("generation failed"), event="error")
+    finally:
+        # Also runs on GeneratorExit: closing ``chunks`` aborts the upstream call
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+        metrics.inc("sse_streams_total", outcome=outcome)
+
+
+def relay_stream(key: tuple, chunks: Iterator[str], refresh: bool = False) -> Response:
+    """An SSE response relaying ``chunks``, or the cached result for ``key``."""
+    cache = current_app.extensions["sse_results"]
+    cached = None if refresh else cache.get(key)
+    if cached is not None:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+        metrics.inc("sse_streams_total", outcome="cached")
+        body = sse_event(json.dumps(cached)) + sse_event(
+            json.dumps(cached), event="done"
+        )
+        response = Response(body, mimetype="text/event-stream")
+        response.headers["X-Cache"] = "hit"
+        return response
+
+    response = Response(
+        stream_with_context(_relay(cache, key, chunks)), mimetype="text/event-stream"
+    )
+    response.headers["X-Cache"] = "miss"
+    # nginx would otherwise collect the whole response before sending it on
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def register_sse(app: Flask) -> None:
+    """Create the result cache and clear it with the ``generated`` namespace."""
+    cache = app.extensions["sse_results"] = ResultCache(
+        app.config["SSE_CACHE_SIZE"], app.config["SSE_CACHE_TTL"]
+    )
+    on_invalidate(app, "generated", cache.clear)
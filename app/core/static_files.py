@@ -0,0 +1,181 @@
+"""Content-hashed static URLs and cache headers for static files."""
+
+import json
+import os
+
+import click
+from flask import Flask, current_app, request, url_for
+from werkzeug.security import safe_join
+
+from app.core.commands import assets_cli
+from app.core.invalidation import stat_checks_enabled
+from app.core.utils import file_content_hash
+
+# Build-time hash manifest, written by `flask assets hash`
+STATIC_MANIFEST_PATH = os.path.join("dist", "static-manifest.json")
+
+# The same hashes as an nginx map include, so nginx applies the exact-match
+# rule of set_static_cache_headers to the static files it serves itself
+NGINX_MAP_PATH = os.path.join("dist", "static-versions.map")
+
+# Files fetched by browsers under a fixed URL; they never get a version
+# parameter and are served with a short TTL plus ETag revalidation
+STABLE_STATIC_FILES = {"manifest.json", "sw.js", "version.json"}
+
+# Directories under the static folder that are never served to browsers
+SKIPPED_STATIC_DIRS = {".vite"}
+
+_static_hashes: dict[str, dict[str, str]] = {}
+
+# Hashes of individual files by path, with the (mtime, size) they were taken at
+_file_hashes: dict[str, tuple[tuple[int, int], str]] = {}
+
+
+def is_stable_static_file(filename: str) -> bool:
+    """Check whether a static file must keep an unversioned URL."""
+    return filename in STABLE_STATIC_FILES
+
+
+def build_static_hashes(static_folder: str) -> dict[str, str]:
+    """Hash every file under the static folder, keyed by its relative path."""
+    manifest_path = os.path.join(static_folder, STATIC_MANIFEST_PATH)
+    nginx_map_path = os.path.join(static_folder, NGINX_MAP_PATH)
+    hashes = {}
+
+    for dirpath, dirnames, filenames in os.walk(static_folder):
+        dirnames[:] = [d for d in dirnames if d not in SKIPPED_STATIC_DIRS]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if path in (manifest_path, nginx_map_path):
+                continue
+            relpath = os.path.relpath(path, static_folder).replace(os.sep, "/")
+            hashes[relpath] = file_content_hash(path)
+
+    return hashes
+
+
+def write_static_manifest(static_folder: str) -> str:
+    """Hash all static files and write the result into the static folder."""
+    hashes = build_static_hashes(static_folder)
+    path = os.path.join(static_folder, STATIC_MANIFEST_PATH)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "w") as f:
+        json.dump(hashes, f, indent=2, sort_keys=True)
+
+    # Keys are "$uri:$arg_v" as nginx sees them for the matching URL
+    with open(os.path.join(static_folder, NGINX_MAP_PATH), "w") as f:
+        for relpath, version in sorted(hashes.items()):
+            if not is_stable_static_file(relpath):
+                f.write(f'"/static/{relpath}:{version}" 1;\n')
+    return path
+
+
+def load_static_hashes(static_folder: str) -> dict[str, str]:
+    """
+    Load static file hashes, once per static folder.
+
+    The build-time manifest is used when present; otherwise every file is
+    hashed on first use, which is what happens in development.
+    """
+    if static_folder in _static_hashes:
+        return _static_hashes[static_folder]
+
+    manifest_path = os.path.join(static_folder, STATIC_MANIFEST_PATH)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            hashes = json.load(f)
+    else:
+        hashes = build_static_hashes(static_folder)
+
+    _static_hashes[static_folder] = hashes
+    return hashes
+
+
+def reset_static_hashes() -> None:
+    """Forget loaded hashes so the next lookup re-reads them."""
+    _static_hashes.clear()
+    _file_hashes.clear()
+
+
+def _current_file_hash(static_folder: str, filename: str) -> str | None:
+    """Hash of a static file as it is on disk, re-hashed when it changes."""
+    path = safe_join(static_folder, filename)
+    try:
+        stat = os.stat(path) if path else None
+    except OSError:
+        stat = None
+    if stat is None:
+        return None
+
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _file_hashes.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    version = file_content_hash(path)
+    _file_hashes[path] = (stamp, version)
+    return version
+
+
+def static_file_hash(static_folder: str, filename: str) -> str | None:
+    """
+    Content hash of one static file, or None when it is not known.
+
+    With CACHE_STAT_CHECKS (development) the file is stat-checked on every
+    call and hashed again after an edit, so its URL changes with it and an
+    old ``?v=`` never matches edited content.
+    """
+    if stat_checks_enabled():
+        return _current_file_hash(static_folder, filename)
+    return load_static_hashes(static_folder).get(filename)
+
+
+def static_url(filename: str) -> str:
+    """
+    Build a static URL with a content hash for long-term caching.
+
+    Wraps ``url_for('static', ...)``: hashed files get a ``v`` parameter and
+    are served as immutable, stable files keep their plain URL.
+    """
+    if not is_stable_static_file(filename):
+        version = static_file_hash(current_app.static_folder, filename)
+        if version:
+            return url_for("static", filename=filename, v=version)
+    return url_for("static", filename=filename)
+
+
+def set_static_cache_headers(response):
+    """Only cache static responses forever when the URL carries their hash."""
+    if request.endpoint != "static" or response.status_code not in (200, 304):
+        return response
+
+    filename = request.view_args.get("filename", "")
+    version = request.args.get("v")
+
+    response.cache_control.public = True
+    if version and version == static_file_hash(current_app.static_folder, filename):
+        response.cache_control.max_age = current_app.config["STATIC_IMMUTABLE_MAX_AGE"]
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.max_age = current_app.config["STATIC_DEFAULT_MAX_AGE"]
+    return response
+
+
+def register_static_urls(app: Flask) -> None:
+    """Register the static_url helper and static cache headers."""
+    load_static_hashes(app.static_folder)
+    app.after_request(set_static_cache_headers)
+
+    @app.context_processor
+    def inject_static_url():
+        """Make static_url function available in templates."""
+        return dict(static_url=static_url)
+
+
+@assets_cli.command("hash")
+def hash_command():
+    """Write content hashes for every static file."""
+    path = write_static_manifest(current_app.static_folder)
+    with open(path) as f:
+        count = len(json.load(f))
+    click.echo(f"Wrote {count} static file hashes to {path}")
@@ -0,0 +1,63 @@
+"""Opt-in streamed page rendering.
+
+With ``STREAM_TEMPLATES`` enabled, pages are sent as they render: everything
+up to ``</head>`` goes out in the first chunk so the browser can fetch CSS
+and scripts while the body is still being rendered, and the rest is sent in
+``STREAM_BUFFER_SIZE`` pieces to keep the number of writes small.
+"""
+
+from collections.abc import Iterable, Iterator
+
+from flask import Flask, Response, current_app, render_template, stream_template
+
+# Marker that ends the first flushed chunk
+HEAD_END = "</head>"
+
+
+def buffered_chunks(
+    chunks: Iterable[str], app: Flask, size: int = 16384
+) -> Iterator[str]:
+    """
+    Regroup Jinja's many small chunks: flush after ``</head>``, then by size.
+
+    An exception raised by the template is logged and re-raised, so the
+    server aborts the chunked response instead of finishing it; a truncated
+    transfer is never stored by browsers or proxies as a complete page.
+    """
+    buffer: list[str] = []
+    length = 0
+    head_sent = False
+    try:
+        for chunk in chunks:
+            buffer.append(chunk)
+            length += len(chunk)
+            if (not head_sent and HEAD_END in chunk) or length >= size:
+                head_sent = True
+                yield "".join(buffer)
+                buffer, length = [], 0
+    except Exception:
+        app.logger.exception("Template failed while streaming; aborting response")
+        raise
+    if buffer:
+        yield "".join(buffer)
+
+
+def stream_page(template_name: str, **context) -> Response:
+    """Stream a template with the head flushed first."""
+    app = current_app._get_current_object()
+    chunks = buffered_chunks(
+        stream_template(template_name, **context),
+        app,
+        size=app.config["STREAM_BUFFER_SIZE"],
+    )
+    response = Response(chunks, mimetype="text/html")
+    # nginx would otherwise collect the whole response before sending it on
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
+
+def render_page(template_name: str, **context):
+    """Render a page template, streamed when STREAM_TEMPLATES is enabled."""
+    if current_app.config.get("STREAM_TEMPLATES"):
+        return stream_page(template_name, **context)
+    return render_template(template_name, **context)
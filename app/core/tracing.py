@@ -0,0 +1,462 @@
+"""Lightweight request tracing with OTLP/JSON export.
+
+A request is sampled when its endpoint's rule (``TRACE_SAMPLE_RULES``,
+falling back to ``TRACE_SAMPLE_RATE``) says so. With
+``TRACE_RESPECT_PARENT``, a request is also sampled when its incoming
+``traceparent`` header has the sampled flag set.
+
+Inside a sampled request, ``span()`` and ``@traced`` record child spans of
+the request's root span. Templates, repository queries, outbound calls and
+analytics get spans automatically. Outside a sampled request, ``span()``
+returns a shared no-op object after a single context variable lookup.
+
+Finished traces are exported in batches by a background thread:
+
+- as OTLP/JSON lines appended to ``TRACE_EXPORT_FILE``, which the
+  OpenTelemetry Collector's ``otlpjsonfile`` receiver can read;
+- when ``TRACE_EXPORT_URL`` is set, also posted to an OTLP/HTTP endpoint
+  such as ``http://localhost:4318/v1/traces``.
+"""
+
+import atexit
+import functools
+import json
+import os
+import re
+import threading
+import time
+import weakref
+from contextvars import ContextVar
+
+import requests
+from flask import Flask, before_render_template, request, template_rendered
+
+# OTLP span kinds
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+# OTLP status codes
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# Exporters to flush at exit, held weakly so that discarded apps can go
+_exporters: "weakref.WeakSet[SpanExporter]" = weakref.WeakSet()
+
+
+class Span:
+    """One timed operation in a trace."""
+
+    __slots__ = (
+        "attributes",
+        "end_ns",
+        "kind",
+        "name",
+        "parent_id",
+        "span_id",
+        "start_ns",
+        "status",
+        "trace",
+    )
+
+    def __init__(self, trace, name: str, parent_id: str | None, kind: int, attrs):
+        """Start a span now."""
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.kind = kind
+        self.attributes = attrs
+        self.status = STATUS_OK
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    def set_attribute(self, key: str, value) -> None:
+        """Attach an attribute to the span."""
+        self.attributes[key] = value
+
+    def end(self, error: BaseException | None = None) -> None:
+        """Finish the span and hand it to its trace."""
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.status = STATUS_ERROR
+            self.attributes["exception.type"] = type(error).__name__
+        self.trace.spans.append(self)
+
+    def to_otlp(self) -> dict:
+        """The span in OTLP/JSON form."""
+        encoded = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": self.status},
+        }
+        if self.parent_id:
+            encoded["parentSpanId"] = self.parent_id
+        return encoded
+
+
+class Trace:
+    """The spans recorded for one sampled request."""
+
+    def __init__(self, trace_id: str):
+        """Start collecting spans for ``trace_id``."""
+        self.trace_id = trace_id
+        self.spans: list[Span] = []
+        self.open_renders: list[Span] = []
+
+
+class _SpanScope:
+    """Context manager making a span current while its block runs."""
+
+    __slots__ = ("span", "token")
+
+    def __init__(self, span: Span):
+        self.span = span
+        self.token = None
+
+    def __enter__(self) -> Span:
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_span.reset(self.token)
+        self.span.end(exc)
+
+
+class _NoopSpan:
+    """Stand-in returned when the current request is not sampled."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set_attribute(self, key: str, value) -> None:
+        """Ignore attributes."""
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_request_root: ContextVar[Span | None] = ContextVar("request_root", default=None)
+
+
+def span(name: str, kind: int = KIND_INTERNAL, **attributes):
+    """
+    Context manager timing a block as a child of the current span.
+
+    Returns the no-op span when the current request is not being traced.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return _SpanScope(Span(parent.trace, name, parent.span_id, kind, attributes))
+
+
+def traced(name: str | None = None):
+    """Decorator recording each call of a function as a span."""
+
+    def decorator(f):
+        span_name = name or f.__qualname__
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return f(*args, **kwargs)
+            with span(span_name):
+                return f(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def current_traceparent() -> str | None:
+    """``traceparent`` header value continuing the current trace, if any."""
+    current = _current_span.get()
+    if current is None:
+        return None
+    return f"00-{current.trace.trace_id}-{current.span_id}-01"
+
+
+def inject_trace_headers(headers: dict) -> dict:
+    """Headers plus ``traceparent`` when the current request is traced."""
+    traceparent = current_traceparent()
+    if traceparent is None:
+        return headers
+    return {**headers, "traceparent": traceparent}
+
+
+def parse_traceparent(value: str | None) -> tuple[str, str, bool] | None:
+    """``(trace_id, parent_span_id, sampled)`` from a W3C traceparent header."""
+    if not value:
+        return None
+    match = TRACEPARENT_RE.match(value.strip().lower())
+    if match is None or set(match[1]) == {"0"} or set(match[2]) == {"0"}:
+        return None
+    return match[1], match[2], bool(int(match[3], 16) & 1)
+
+
+def should_sample(trace_id: str, rate: float) -> bool:
+    """
+    Sampling decision derived from the trace id.
+
+    Every service that sees the same trace id makes the same decision.
+    """
+    if rate <= 0:
+        return False
+    if rate >= 1:
+        return True
+    return int(trace_id[16:], 16) < rate * 2**64
+
+
+def _otlp_value(value) -> dict:
+    """An attribute value in OTLP/JSON form."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class SpanExporter:
+    """Batches finished traces and writes them as OTLP/JSON."""
+
+    def __init__(
+        self,
+        path: str | None,
+        url: str | None,
+        service_name: str,
+        batch_size: int = 64,
+        interval: float = 5.0,
+        logger=None,
+    ):
+        """Export to the file at ``path`` and/or POST to ``url``."""
+        self.path = path
+        self.url = url
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.interval = interval
+        self.logger = logger
+        self._pending: list[Span] = []
+        self._lock = threading.Lock()
+        # Serialises appends to the file without blocking export()
+        self._file_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread_pid: int | None = None
+        _exporters.add(self)
+
+    def export(self, spans: list[Span]) -> None:
+        """Queue a trace's spans; the batch goes out when full or on a timer."""
+        self._ensure_thread()
+        with self._lock:
+            self._pending.extend(spans)
+            full = len(self._pending) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _ensure_thread(self) -> None:
+        """Start the export thread once per process (threads do not fork)."""
+        if self._thread_pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread_pid == os.getpid():
+                return
+            self._thread_pid = os.getpid()
+            # Spans queued before a fork belong to the parent
+            self._pending = []
+        threading.Thread(target=self._loop, name="trace-export", daemon=True).start()
+
+    def _loop(self) -> None:
+        """Flush whenever a batch fills up or the interval passes."""
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def payload(self, spans: list[Span]) -> dict:
+        """An OTLP ExportTraceServiceRequest for ``spans``."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": self.service_name},
+                            },
+                            {
+                                "key": "process.pid",
+                                "value": {"intValue": str(os.getpid())},
+                            },
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [item.to_otlp() for item in spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def flush(self) -> None:
+        """Write out every queued span now."""
+        with self._lock:
+            spans, self._pending = self._pending, []
+        if not spans:
+            return
+        payload = self.payload(spans)
+        try:
+            if self.path:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                line = json.dumps(payload, separators=(",", ":")) + "\n"
+                with self._file_lock, open(self.path, "a") as f:
+                    f.write(line)
+            if self.url:
+                requests.post(self.url, json=payload, timeout=2).raise_for_status()
+        except (OSError, requests.RequestException) as e:
+            if self.logger is not None:
+                self.logger.warning(f"Trace export failed: {e}")
+
+
+@atexit.register
+def _flush_exporters() -> None:
+    """Write out the spans still queued when the process exits."""
+    for exporter in list(_exporters):
+        exporter.flush()
+
+
+class Tracer:
+    """Starts, samples and exports request traces for an app."""
+
+    def __init__(self, app: Flask, exporter: SpanExporter):
+        """Read the sampling settings from ``app``."""
+        self.exporter = exporter
+        self.rate = app.config["TRACE_SAMPLE_RATE"]
+        self.rules = app.config["TRACE_SAMPLE_RULES"]
+        self.respect_parent = app.config["TRACE_RESPECT_PARENT"]
+
+    def sample(self, endpoint: str | None, trace_id: str, parent_sampled: bool):
+        """Whether to trace a request to ``endpoint``."""
+        rate = self.rules.get(endpoint, self.rate)
+        if rate <= 0 and endpoint in self.rules:
+            # Endpoints turned off explicitly stay off, whatever the caller says
+            return False
+        if parent_sampled and self.respect_parent:
+            return True
+        return should_sample(trace_id, rate)
+
+    def start_request(self) -> None:
+        """Open the root span if this request is sampled."""
+        parent = parse_traceparent(request.headers.get("traceparent"))
+        if parent is not None:
+            trace_id, parent_id, parent_sampled = parent
+        else:
+            trace_id, parent_id, parent_sampled = os.urandom(16).hex(), None, False
+        if not self.sample(request.endpoint, trace_id, parent_sampled):
+            return
+
+        root = Span(
+            Trace(trace_id),
+            f"{request.method} {request.url_rule or request.path}",
+            parent_id,
+            KIND_SERVER,
+            {
+                "http.request.method": request.method,
+                "url.path": request.path,
+                "http.route": str(request.url_rule or ""),
+                "flask.endpoint": request.endpoint or "",
+            },
+        )
+        _request_root.set(root)
+        _current_span.set(root)
+
+    def finish_request(self, response):
+        """Record the response status on the root span."""
+        root = _request_root.get()
+        if root is not None:
+            root.set_attribute("http.response.status_code", response.status_code)
+            if response.status_code >= 500:
+                root.status = STATUS_ERROR
+        return response
+
+    def end_request(self, exc=None) -> None:
+        """Close the root span and export the trace."""
+        root = _request_root.get()
+        if root is None:
+            return
+        # The request is the outermost scope, so nothing is left current
+        _request_root.set(None)
+        _current_span.set(None)
+        root.end(exc)
+        self.exporter.export(root.trace.spans)
+
+
+def _render_started(sender, template, context, **extra) -> None:
+    """Open a span for a template render (ended by _render_finished)."""
+    parent = _current_span.get()
+    if parent is None:
+        return
+    # Not made current: a streamed render finishes in another context
+    parent.trace.open_renders.append(
+        Span(
+            parent.trace,
+            f"render {template.name}",
+            parent.span_id,
+            KIND_INTERNAL,
+            {"template": template.name or ""},
+        )
+    )
+
+
+def _render_finished(sender, template, context, **extra) -> None:
+    """End the innermost open render span."""
+    parent = _current_span.get()
+    if parent is not None and parent.trace.open_renders:
+        parent.trace.open_renders.pop().end()
+
+
+def trace_export_path(app: Flask) -> str:
+    """Configured export file, defaulting to the instance folder."""
+    return app.config.get("TRACE_EXPORT_FILE") or os.path.join(
+        app.instance_path, "traces.otlp.jsonl"
+    )
+
+
+def register_tracing(app: Flask) -> None:
+    """Trace sampled requests and export their spans."""
+    if not app.config.get("TRACING", True):
+        return
+
+    exporter = SpanExporter(
+        trace_export_path(app),
+        app.config.get("TRACE_EXPORT_URL"),
+        app.config["TRACE_SERVICE_NAME"],
+        batch_size=app.config["TRACE_EXPORT_BATCH"],
+        interval=app.config["TRACE_EXPORT_INTERVAL"],
+        logger=app.logger,
+    )
+    tracer = app.extensions["tracer"] = Tracer(app, exporter)
+    app.before_request(tracer.start_request)
+    app.after_request(tracer.finish_request)
+    app.teardown_request(tracer.end_request)
+
+    before_render_template.connect(_render_started, app)
+    template_rendered.connect(_render_finished, app)
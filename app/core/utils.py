@@ -1,9 +1,13 @@
+import hashlib
 import json
 import os
+import time
 from datetime import datetime
 
 from flask import current_app
 
+from app.core.tracing import traced
+
 
 def get_current_year():
     """Get current year for copyright notices"""
@@ -22,6 +26,15 @@ def get_file_extension(filename):
     return os.path.splitext(filename)[1].lower()
 
 
+def file_content_hash(path, length=16):
+    """Return a short SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()[:length]
+
+
 def is_safe_url(target):
     """Check if URL is safe for redirects"""
     # Basic URL safety check - implement according to your needs
@@ -35,27 +48,47 @@ def truncate_text(text, length=100, suffix="..."):
     return text[:length].rsplit(" ", 1)[0] + suffix
 
 
+@traced("track_event")
 def track_event(
     name: str, metadata: dict | None = None, distinct_id: str = "anonymous"
 ):
     """
-    Track user events with PostHog (disabled in debug mode).
+    Track user events with PostHog and/or the local analytics store.
+
+    The sink is selected by ANALYTICS_SINK ("posthog", "local" or "both").
+    PostHog is disabled in debug mode; the local store records in any mode.
 
     Args:
         name (str): Event name
         metadata (dict): Additional event properties
         distinct_id (str): User identifier (defaults to "anonymous")
     """
+    sink = current_app.config.get("ANALYTICS_SINK", "posthog")
+    if sink in ("local", "both"):
+        from app.analytics import record_local_event
+
+        record_local_event(name, metadata)
+        if sink == "local":
+            return
+
     if not current_app.debug:
         try:
             import posthog
+        except ImportError:
+            return
 
+        from app.core.resilience import call_dependency
+
+        def capture(timeout: float) -> bool:
             posthog.capture(
                 distinct_id=distinct_id, event=name, properties=metadata or {}
             )
+            return True
+
+        # Skipped while PostHog's circuit is open or the request is out of time;
+        # upload results, not queueing, decide the breaker's state
+        if call_dependency("posthog", capture, fallback=False, record_success=False):
             current_app.logger.info(f"Event tracked: {name}")
-        except Exception as e:
-            current_app.logger.error(f"Event tracking failed: {e}")
     else:
         current_app.logger.debug(f"Event tracking (debug mode): {name} - {metadata}")
 
@@ -64,6 +97,10 @@ def track_route_event(event_name: str):
     """
     Decorator for tracking Flask route events.
 
+    The event is collected for the whole request and sent once from
+    ``emit_route_event`` with the response status and latency attached.
+    Views add their own properties with ``annotate_event``.
+
     Args:
         event_name (str): Name of the event to track
 
@@ -71,24 +108,28 @@ def track_route_event(event_name: str):
         @projects_bp.route("/")
         @track_route_event("Viewed Projects Page")
         def index():
+            annotate_event(project_count=len(projects))
             return render_template("pages/projects.html")
     """
     from functools import wraps
 
-    from flask import request
+    from flask import g, request
 
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            # Track the event with additional route metadata
-            metadata = {
-                "route": request.endpoint,
-                "method": request.method,
-                "user_agent": request.headers.get("User-Agent", ""),
-                "remote_addr": request.remote_addr,
-                "referrer": request.referrer,
-            }
-            track_event(event_name, metadata)
+            # Start the request event with route metadata; bots are not tracked
+            if g.get("bot") is None:
+                g.route_event = {
+                    "name": event_name,
+                    "properties": {
+                        "route": request.endpoint,
+                        "method": request.method,
+                        "user_agent": request.headers.get("User-Agent", ""),
+                        "remote_addr": request.remote_addr,
+                        "referrer": request.referrer,
+                    },
+                }
             return f(*args, **kwargs)
 
         return decorated_function
@@ -96,6 +137,127 @@ def track_route_event(event_name: str):
     return decorator
 
 
+def annotate_event(name: str | None = None, **properties):
+    """
+    Add properties to the current request's route event
+
+    Does nothing outside a route decorated with ``track_route_event``.
+
+    Args:
+        name (str): Replaces the event name when given
+        **properties: Event properties to add
+    """
+    from flask import g
+
+    event = g.get("route_event")
+    if event is None:
+        return
+    if name:
+        event["name"] = name
+    event["properties"].update(properties)
+
+
+def start_request_timer():
+    """Record the request start time for event latency"""
+    from flask import g
+
+    g.request_started = time.perf_counter()
+
+
+def emit_route_event(response):
+    """
+    Send the request's route event once, with status and latency
+
+    The event goes out when the response is closed, so the latency of a
+    streamed page includes rendering its body.
+
+    Args:
+        response: The outgoing response
+
+    Returns:
+        The response, unchanged
+    """
+    from flask import g, request
+
+    from app.core.admission import LEVEL_DEGRADED, load_level
+
+    event = g.pop("route_event", None)
+    # Analytics is the first work dropped when the worker is behind
+    if event is None or load_level() >= LEVEL_DEGRADED:
+        return response
+
+    properties = event["properties"]
+    properties["status"] = response.status_code
+    started = g.get("request_started")
+    app = current_app._get_current_object()
+    environ = request.environ
+
+    def send():
+        if started is not None:
+            properties["latency_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        # The request context is gone by the time the server closes the response
+        with app.request_context(environ):
+            track_event(event["name"], properties)
+
+    response.call_on_close(send)
+    return response
+
+
+def find_vite_manifest(static_folder):
+    """
+    Locate the Vite manifest file inside the static folder
+
+    Args:
+        static_folder (str): Absolute path of the Flask static folder
+
+    Returns:
+        str | None: Path to the manifest, or None when no build exists
+    """
+    candidates = [
+        os.path.join(static_folder, "dist", ".vite", "manifest.json"),
+        # Fallback manifest path (older Vite versions)
+        os.path.join(static_folder, "dist", "manifest.json"),
+    ]
+    return next((path for path in candidates if os.path.exists(path)), None)
+
+
+_vite_manifest_cache: dict[str, tuple[float, dict]] = {}
+
+
+def load_vite_manifest(static_folder):
+    """
+    Load the Vite manifest once, re-reading it when it is invalidated
+
+    In development (CACHE_STAT_CHECKS) the file's mtime is checked on every
+    call instead, so rebuilds show up without an explicit invalidation.
+
+    Args:
+        static_folder (str): Absolute path of the Flask static folder
+
+    Returns:
+        dict: Parsed manifest, or an empty dict when no build exists
+    """
+    from app.core.invalidation import stat_checks_enabled
+
+    cached = _vite_manifest_cache.get(static_folder)
+    if cached and not stat_checks_enabled():
+        return cached[1]
+
+    manifest_path = find_vite_manifest(static_folder)
+    if manifest_path is None:
+        return {}
+
+    mtime = os.path.getmtime(manifest_path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    _vite_manifest_cache[static_folder] = (mtime, manifest)
+    return manifest
+
+
+@traced("vite_asset")
 def get_vite_asset(filename):
     """
     Get the hashed filename from Vite manifest for asset loading
@@ -107,39 +269,28 @@ def get_vite_asset(filename):
         str: The hashed filename from manifest or original filename as fallback
     """
     try:
-        # Path to the Vite manifest file
-        manifest_path = os.path.join(
-            current_app.static_folder, "dist", ".vite", "manifest.json"
-        )
+        manifest = load_vite_manifest(current_app.static_folder)
 
-        # Fallback manifest path (older Vite versions)
-        if not os.path.exists(manifest_path):
-            manifest_path = os.path.join(
-                current_app.static_folder, "dist", "manifest.json"
-            )
-
-        if os.path.exists(manifest_path):
-            with open(manifest_path) as f:
-                manifest = json.load(f)
+        from app.core.static_files import static_url
 
-            # Look for the file in manifest
-            if filename in manifest:
-                return f"/static/dist/{manifest[filename]['file']}"
+        # Look for the file in manifest
+        if filename in manifest:
+            return static_url(f"dist/{manifest[filename]['file']}")
 
-            # Try with different variations
-            variations = [
-                f"src/scripts/app/{filename}",
-                f"src/styles/{filename}",
-                f"frontend/src/scripts/app/{filename}",
-                f"frontend/src/styles/{filename}",
-            ]
+        # Try with different variations
+        variations = [
+            f"src/scripts/app/{filename}",
+            f"src/styles/{filename}",
+            f"frontend/src/scripts/app/{filename}",
+            f"frontend/src/styles/{filename}",
+        ]
 
-            for variation in variations:
-                if variation in manifest:
-                    return f"/static/dist/{manifest[variation]['file']}"
+        for variation in variations:
+            if variation in manifest:
+                return static_url(f"dist/{manifest[variation]['file']}")
 
         # Fallback to static file path
-        return f"/static/dist/{filename}"
+        return static_url(f"dist/{filename}")
 
     except Exception as e:
         current_app.logger.warning(f"Error loading Vite manifest: {e}")
@@ -23,26 +23,26 @@ def init_sentry(app):
                 from sentry_sdk.integrations.flask import FlaskIntegration
                 from sentry_sdk.integrations.logging import LoggingIntegration
 
+                from app.core.sentry_sampling import register_sentry_sampling
+
                 # Configure logging integration
                 logging_integration = LoggingIntegration(
                     level=None,  # Capture records from INFO level and above
                     event_level=None,  # Send records as breadcrumbs
                 )
 
+                # Per-endpoint, budgeted sampling instead of a flat rate
+                sampling = register_sentry_sampling(app)
+
                 sentry_sdk.init(
                     dsn=sentry_dsn,
                     integrations=[
                         FlaskIntegration(transaction_style="endpoint"),
                         logging_integration,
                     ],
-                    # Set traces_sample_rate to 1.0 to capture 100% of transactions
-                    # We recommend adjusting this value in production
-                    traces_sample_rate=float(
-                        os.getenv("SENTRY_TRACES_SAMPLE_RATE", "0.1")
-                    ),
-                    profiles_sample_rate=float(
-                        os.getenv("SENTRY_PROFILES_SAMPLE_RATE", "0.1")
-                    ),
+                    # Rates and rules: SENTRY_* settings in config/base.py
+                    traces_sampler=sampling.traces_sampler,
+                    profiles_sampler=sampling.profiles_sampler,
                     # Set environment
                     environment=os.getenv("FLASK_ENV", "production"),
                     # Set release version
@@ -2,6 +2,9 @@
 
 from dataclasses import dataclass
 
+from app.core.tracing import traced
+from app.models.snapshot import ContentSnapshot, current_snapshot, tokenize
+
 
 @dataclass
 class Project:
@@ -245,26 +248,100 @@ class ProjectRepository:
         },
     ]
 
+    @staticmethod
+    def _from_snapshot(snapshot: ContentSnapshot, records: list[dict]) -> list[Project]:
+        """
+        Projects for snapshot records, built once per snapshot segment.
+
+        The objects are shared by every request, so callers must not modify
+        them.
+        """
+        by_id = snapshot.cached(
+            "projects",
+            lambda: {
+                data["id"]: Project.from_dict(data) for data in snapshot.projects()
+            },
+        )
+        return [by_id[data["id"]] for data in records]
+
     @classmethod
+    @traced()
     def get_all(cls) -> list[Project]:
         """Get all projects."""
+        snapshot = current_snapshot()
+        if snapshot:
+            return cls._from_snapshot(snapshot, snapshot.projects())
         return [Project.from_dict(data) for data in cls._projects_data]
 
     @classmethod
+    @traced()
     def get_featured(cls) -> list[Project]:
         """Get featured projects."""
+        snapshot = current_snapshot()
+        if snapshot:
+            return cls._from_snapshot(snapshot, snapshot.facet("featured", "true"))
         return [project for project in cls.get_all() if project.is_featured]
 
     @classmethod
+    @traced()
     def get_by_id(cls, project_id: int) -> Project | None:
         """Get project by ID."""
+        snapshot = current_snapshot()
+        if snapshot:
+            data = snapshot.project(project_id)
+            return cls._from_snapshot(snapshot, [data])[0] if data else None
         projects = cls.get_all()
         return next((p for p in projects if p.id == project_id), None)
 
     @classmethod
+    @traced()
     def get_by_category(cls, category: str) -> list[Project]:
-        """Get projects by category."""
-        return [project for project in cls.get_all() if project.category == category]
+        """Get projects by category (case-insensitive)."""
+        snapshot = current_snapshot()
+        if snapshot:
+            return cls._from_snapshot(snapshot, snapshot.facet("category", category))
+        wanted = category.lower()
+        return [
+            project for project in cls.get_all() if project.category.lower() == wanted
+        ]
+
+    @classmethod
+    @traced()
+    def get_by_technology(cls, technology: str) -> list[Project]:
+        """Get projects using a technology."""
+        snapshot = current_snapshot()
+        if snapshot:
+            records = snapshot.facet("technologies", technology)
+            return cls._from_snapshot(snapshot, records)
+        wanted = technology.lower()
+        return [
+            project
+            for project in cls.get_all()
+            if wanted in (tech.lower() for tech in project.technologies)
+        ]
+
+    @classmethod
+    @traced()
+    def search(cls, query: str) -> list[Project]:
+        """Get projects matching every word of a search query."""
+        snapshot = current_snapshot()
+        if snapshot:
+            return cls._from_snapshot(snapshot, snapshot.search(query))
+        words = tokenize(query)
+        matches = []
+        for project in cls.get_all():
+            text = " ".join(
+                [
+                    project.title,
+                    project.description,
+                    project.tech_stack,
+                    project.category,
+                    project.client,
+                ]
+            )
+            if words and words <= tokenize(text):
+                matches.append(project)
+        return matches
 
 
 class ServiceRepository:
@@ -307,6 +384,15 @@ class ServiceRepository:
     ]
 
     @classmethod
+    @traced()
     def get_all(cls) -> list[Service]:
         """Get all services."""
+        snapshot = current_snapshot()
+        if snapshot:
+            return list(
+                snapshot.cached(
+                    "service_objects",
+                    lambda: [Service.from_dict(data) for data in snapshot.services()],
+                )
+            )
         return [Service.from_dict(data) for data in cls._services_data]
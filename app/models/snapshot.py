@@ -0,0 +1,226 @@
+"""Content snapshot: the catalogue and its indexes in a shared segment.
+
+The master process (gunicorn ``--preload``) writes the project and service
+data once, together with precomputed facet and search bitsets. Workers read
+records straight out of the mapped segment, so the content and its indexes
+exist once in memory no matter how many workers run.
+
+Each record is decoded at most once per segment; repositories keep the
+objects built from them with ``ContentSnapshot.cached``, so both are
+rebuilt only when a new segment is swapped in. ``warm_caches`` builds
+them in the master, so that the workers share them as well.
+"""
+
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left
+from collections.abc import Callable
+
+import click
+from flask import Flask, current_app
+
+from app.core.commands import content_cli
+from app.core.invalidation import on_invalidate
+from app.core.segments import Segment, SegmentStore, SegmentWriter
+
+# Project fields with a bitset per distinct value
+FACET_FIELDS = ("category", "status", "technologies", "featured")
+
+# Project fields whose words go into the search index
+SEARCH_FIELDS = ("title", "description", "technologies", "category", "client")
+
+TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.-]*")
+
+_store: SegmentStore | None = None
+_snapshot: "ContentSnapshot | None" = None
+
+
+def tokenize(text: str) -> set[str]:
+    """Lower-cased search tokens of a text."""
+    return {token.rstrip(".") for token in TOKEN_RE.findall(text.lower())}
+
+
+def content_hash(projects: list[dict], services: list[dict]) -> str:
+    """Hash identifying a version of the content."""
+    encoded = json.dumps([projects, services], sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def _bitset(indexes: set[int], size: int) -> bytes:
+    """Little-endian bitset with the given bits set."""
+    value = 0
+    for index in indexes:
+        value |= 1 << index
+    return value.to_bytes((size + 7) // 8, "little")
+
+
+def build_content_segment(projects: list[dict], services: list[dict]) -> SegmentWriter:
+    """Serialize projects, services and their indexes into a segment."""
+    projects = sorted(projects, key=lambda project: project["id"])
+    writer = SegmentWriter(
+        {"content_hash": content_hash(projects, services), "projects": len(projects)}
+    )
+
+    records = [json.dumps(project).encode() for project in projects]
+    offsets = [0]
+    for record in records:
+        offsets.append(offsets[-1] + len(record))
+    writer.add_bytes("projects.records", b"".join(records))
+    writer.add_array("projects.offsets", "I", offsets)
+    writer.add_array("projects.ids", "I", [project["id"] for project in projects])
+
+    facets: dict[str, set[int]] = {}
+    tokens: dict[str, set[int]] = {}
+    for index, project in enumerate(projects):
+        for field in FACET_FIELDS:
+            values = project[field]
+            for value in values if isinstance(values, list) else [values]:
+                facets.setdefault(f"{field}:{str(value).lower()}", set()).add(index)
+        for field in SEARCH_FIELDS:
+            values = project[field]
+            text = " ".join(values) if isinstance(values, list) else str(values)
+            for token in tokenize(text):
+                tokens.setdefault(token, set()).add(index)
+
+    for key, indexes in facets.items():
+        writer.add_bytes(f"facet:{key}", _bitset(indexes, len(projects)))
+    for token, indexes in tokens.items():
+        writer.add_bytes(f"search:{token}", _bitset(indexes, len(projects)))
+
+    writer.add_json("services", services)
+    return writer
+
+
+class ContentSnapshot:
+    """Queries over a content segment."""
+
+    def __init__(self, segment: Segment):
+        """Wrap a mapped content segment."""
+        self.segment = segment
+        self.offsets = segment.array("projects.offsets")
+        self.ids = segment.array("projects.ids")
+        self.records = segment.view("projects.records")
+        self._decoded: list[dict | None] = [None] * len(self.ids)
+        self._cache: dict[str, object] = {}
+
+    def _record(self, index: int) -> dict:
+        """One project record, decoded on first use."""
+        record = self._decoded[index]
+        if record is None:
+            start, end = self.offsets[index], self.offsets[index + 1]
+            record = self._decoded[index] = json.loads(
+                self.records[start:end].tobytes()
+            )
+        return record
+
+    def _records(self, bits: int) -> list[dict]:
+        """Decode the records whose bits are set."""
+        return [self._record(i) for i in range(len(self.ids)) if bits >> i & 1]
+
+    def _bits(self, name: str) -> int:
+        """A bitset entry as an integer (0 when absent)."""
+        if name not in self.segment:
+            return 0
+        return int.from_bytes(self.segment.view(name), "little")
+
+    def projects(self) -> list[dict]:
+        """Every project record, ordered by id."""
+        return [self._record(index) for index in range(len(self.ids))]
+
+    def project(self, project_id: int) -> dict | None:
+        """One project record by id, found by binary search."""
+        index = bisect_left(self.ids, project_id)
+        if index < len(self.ids) and self.ids[index] == project_id:
+            return self._record(index)
+        return None
+
+    def facet(self, field: str, value) -> list[dict]:
+        """Projects whose ``field`` has ``value``."""
+        return self._records(self._bits(f"facet:{field}:{str(value).lower()}"))
+
+    def search(self, query: str) -> list[dict]:
+        """Projects matching every word of ``query``."""
+        words = tokenize(query)
+        if not words:
+            return []
+        bits = (1 << len(self.ids)) - 1
+        for word in words:
+            bits &= self._bits(f"search:{word}")
+        return self._records(bits)
+
+    def services(self) -> list[dict]:
+        """Every service record."""
+        return self.cached("services", lambda: self.segment.json("services"))
+
+    def cached(self, name: str, build: Callable[[], object]):
+        """``build()``, computed once for this snapshot's segment."""
+        if name not in self._cache:
+            # A concurrent first call may build twice; either result is fine
+            self._cache[name] = build()
+        return self._cache[name]
+
+
+def current_snapshot() -> ContentSnapshot | None:
+    """The installed content snapshot, following swaps to newer segments."""
+    global _snapshot
+    if _store is None:
+        return None
+    segment = _store.current
+    if _snapshot is None or _snapshot.segment is not segment:
+        _snapshot = ContentSnapshot(segment)
+    return _snapshot
+
+
+def write_content_snapshot(path: str, force: bool = False) -> bool:
+    """Write the repository content to ``path`` unless it is already current."""
+    from app.models.project import ProjectRepository, ServiceRepository
+
+    projects = ProjectRepository._projects_data
+    services = ServiceRepository._services_data
+    if not force and os.path.exists(path):
+        try:
+            meta = Segment(path).meta
+            if meta.get("content_hash") == content_hash(
+                sorted(projects, key=lambda project: project["id"]), services
+            ):
+                return False
+        except (OSError, ValueError):
+            pass
+    build_content_segment(projects, services).write(path)
+    return True
+
+
+def snapshot_path(app: Flask) -> str:
+    """Configured snapshot path, defaulting to the instance folder."""
+    return app.config.get("CONTENT_SNAPSHOT_PATH") or os.path.join(
+        app.instance_path, "content.segment"
+    )
+
+
+def register_content_snapshot(app: Flask) -> None:
+    """Write the snapshot once (in the master) and serve content from it."""
+    global _store
+    if not app.config.get("CONTENT_SNAPSHOT", True):
+        return
+
+    path = snapshot_path(app)
+    write_content_snapshot(path)
+    if _store is None or _store.path != path:
+        _store = SegmentStore(path)
+    else:
+        _store.reload()
+    on_invalidate(app, "content", _store.reload)
+
+
+@content_cli.command("snapshot")
+@click.option("--force", is_flag=True, help="Rewrite even if unchanged.")
+def snapshot_command(force):
+    """Rewrite the content snapshot and swap every worker to it."""
+    path = snapshot_path(current_app)
+    if write_content_snapshot(path, force=force):
+        current_app.extensions["cache_bus"].invalidate("content")
+        click.echo(f"Wrote {path}; workers swap to it on their next request")
+    else:
+        click.echo(f"{path} is up to date")
@@ -2,32 +2,52 @@
 // ✅ Service Worker - Offline Caching Implementation
 // =========================================
 
-// Cache Setup - Define cache name and static assets
-const CACHE_NAME = "kusse-tech-studio-v1";
-const ASSETS_TO_CACHE = [
-  "/",
-  "/static/dist/css/main.css",
-  "/static/dist/js/main.js",
-  "/static/dist/js/main-legacy.js",
-  "/static/dist/js/polyfills-legacy.js",
-  "/static/images/ksb-logo.png",
-  "/offline.html",
-  "/projects",
-  "/contact",
-  "/about",
-  "/static/manifest.json",
-];
-
-// Install Event - Cache core assets on install
+// Cache Setup - The precache manifest is injected by the /sw.js Flask route
+// (see app/core/service_worker.py) and lists every asset with its revision.
+const PRECACHE_MANIFEST = self.__PRECACHE_MANIFEST || {
+  version: "dev",
+  entries: [],
+};
+const PRECACHE_NAME = "kusse-tech-studio-precache";
+const CACHE_NAME = "kusse-tech-studio-runtime";
+
+// Map each precached URL to a cache key that embeds its revision, so an
+// asset is only downloaded again when its revision changes.
+const PRECACHE_KEYS = new Map(
+  PRECACHE_MANIFEST.entries.map((entry) => {
+    const url = new URL(entry.url, self.location.origin);
+    const key = new URL(url);
+    key.searchParams.set("__rev", entry.revision);
+    return [url.href, key.href];
+  }),
+);
+
+function matchPrecache(url) {
+  const key = PRECACHE_KEYS.get(new URL(url, self.location.origin).href);
+  if (!key) return Promise.resolve(undefined);
+  return caches.open(PRECACHE_NAME).then((cache) => cache.match(key));
+}
+
+// Install Event - Fetch only precache entries whose revision is not cached yet
 self.addEventListener("install", (event) => {
-  console.log("Service Worker: Installing...");
+  console.log("Service Worker: Installing", PRECACHE_MANIFEST.version);
   event.waitUntil(
     caches
-      .open(CACHE_NAME)
-      .then((cache) => {
-        console.log("Service Worker: Caching assets");
-        return cache.addAll(ASSETS_TO_CACHE);
-      })
+      .open(PRECACHE_NAME)
+      .then((cache) =>
+        Promise.all(
+          Array.from(PRECACHE_KEYS, ([url, key]) =>
+            cache.match(key).then((cached) => {
+              if (cached) return;
+              return fetch(url, { cache: "no-cache" }).then((response) => {
+                if (response.ok) {
+                  return cache.put(key, response);
+                }
+              });
+            }),
+          ),
+        ),
+      )
       .then(() => {
         console.log("Service Worker: Installation complete");
         return self.skipWaiting();
@@ -38,22 +58,33 @@ self.addEventListener("install", (event) => {
   );
 });
 
-// Activate Event - Clean up old caches
+// Activate Event - Drop old caches and precache entries no longer listed
 self.addEventListener("activate", (event) => {
   console.log("Service Worker: Activating...");
+  const currentKeys = new Set(PRECACHE_KEYS.values());
   event.waitUntil(
     caches
       .keys()
       .then((cacheNames) =>
         Promise.all(
           cacheNames.map((name) => {
-            if (name !== CACHE_NAME) {
+            if (name !== PRECACHE_NAME && name !== CACHE_NAME) {
               console.log("Service Worker: Deleting old cache", name);
               return caches.delete(name);
             }
           }),
         ),
       )
+      .then(() => caches.open(PRECACHE_NAME))
+      .then((cache) =>
+        cache.keys().then((requests) =>
+          Promise.all(
+            requests
+              .filter((request) => !currentKeys.has(request.url))
+              .map((request) => cache.delete(request)),
+          ),
+        ),
+      )
       .then(() => {
         console.log("Service Worker: Activation complete");
         return self.clients.claim();
@@ -70,6 +101,28 @@ self.addEventListener("fetch", (event) => {
   if (!event.request.url.startsWith(self.location.origin)) return;
   if (event.request.url.includes("chrome-extension://")) return;
 
+  // Precached pages: network first, precached copy when offline
+  if (PRECACHE_KEYS.has(event.request.url) && event.request.mode === "navigate") {
+    event.respondWith(
+      fetch(event.request).catch(() =>
+        matchPrecache(event.request.url).then(
+          (cached) => cached || matchPrecache("/offline.html"),
+        ),
+      ),
+    );
+    return;
+  }
+
+  // Precached assets: revisioned copy first
+  if (PRECACHE_KEYS.has(event.request.url)) {
+    event.respondWith(
+      matchPrecache(event.request.url).then(
+        (cached) => cached || fetch(event.request),
+      ),
+    );
+    return;
+  }
+
   event.respondWith(
     caches.match(event.request).then((cachedResponse) => {
       // Return cached response if found
@@ -108,7 +161,7 @@ self.addEventListener("fetch", (event) => {
         .catch(() => {
           // Network failed and no cache - serve offline page for navigation
           if (event.request.mode === "navigate") {
-            return caches.match("/offline.html").then((offlinePage) => {
+            return matchPrecache("/offline.html").then((offlinePage) => {
               return (
                 offlinePage ||
                 new Response("Offline - Please check your connection", {
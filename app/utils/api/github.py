@@ -1,9 +1,63 @@
-"""GitHub API client for repository information."""
+"""GitHub API clients for repository information."""
 
+from urllib.parse import urlsplit
 
 import requests
 from flask import current_app
 
+from app.core.async_http import get_async_client
+from app.core.resilience import (
+    DependencyError,
+    call_dependency,
+    call_dependency_async,
+)
+from app.core.tracing import inject_trace_headers
+
+BASE_URL = "https://api.github.com"
+
+
+def parse_repository_url(url: str) -> tuple[str, str] | None:
+    """``(owner, repo)`` of a GitHub repository URL, or None if it has none."""
+    segments = [segment for segment in urlsplit(url).path.split("/") if segment]
+    if len(segments) < 2:
+        return None
+    # Extra segments (``/tree/main``, ``/issues``) point inside the repository
+    owner, repo = segments[0], segments[1].removesuffix(".git")
+    return (owner, repo) if repo else None
+
+
+def _cache_key(url: str, params: dict | None) -> tuple:
+    """Fallback cache key of a GET."""
+    return (url, tuple(sorted((params or {}).items())))
+
+
+def _json_or_none(response):
+    """Body of a 200, None for other answers; outages raise (requests or httpx)."""
+    # Outages and rate limiting count against the breaker
+    if response.status_code >= 500 or response.status_code == 429:
+        raise DependencyError(f"GitHub API error: {response.status_code}")
+    if response.status_code == 200:
+        return response.json()
+    current_app.logger.warning(f"GitHub API error: {response.status_code}")
+    return None
+
+
+def repository_stats(repo_data: dict | None) -> dict | None:
+    """The summary fields of a repository payload."""
+    if not repo_data:
+        return None
+    return {
+        "stars": repo_data.get("stargazers_count", 0),
+        "forks": repo_data.get("forks_count", 0),
+        "watchers": repo_data.get("watchers_count", 0),
+        "issues": repo_data.get("open_issues_count", 0),
+        "language": repo_data.get("language"),
+        "created_at": repo_data.get("created_at"),
+        "updated_at": repo_data.get("updated_at"),
+        "description": repo_data.get("description"),
+        "homepage": repo_data.get("homepage"),
+    }
+
 
 class GitHubClient:
     """GitHub API client for fetching repository information."""
@@ -11,7 +65,7 @@ class GitHubClient:
     def __init__(self, token: str | None = None):
         """Initialize GitHub client."""
         self.token = token
-        self.base_url = "https://api.github.com"
+        self.base_url = BASE_URL
         self.headers = {
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "KusseTechStudio-Portfolio",
@@ -20,70 +74,80 @@ class GitHubClient:
         if self.token:
             self.headers["Authorization"] = f"Bearer {self.token}"
 
-    def get_repository(self, owner: str, repo: str) -> dict | None:
-        """Get repository information."""
-        try:
-            url = f"{self.base_url}/repos/{owner}/{repo}"
-            response = requests.get(url, headers=self.headers, timeout=10)
-
-            if response.status_code == 200:
-                return response.json()
-            current_app.logger.warning(f"GitHub API error: {response.status_code}")
-            return None
+    def _get(self, path: str, params: dict | None = None, fallback=None):
+        """GET an API path through the GitHub circuit breaker."""
+        url = f"{self.base_url}{path}"
 
-        except requests.RequestException as e:
-            current_app.logger.error(f"GitHub API request failed: {e}")
-            return None
-
-    def get_user_repositories(self, username: str) -> list[dict]:
-        """Get user's public repositories."""
-        try:
-            url = f"{self.base_url}/users/{username}/repos"
+        def fetch(timeout: float):
             response = requests.get(
                 url,
-                headers=self.headers,
-                params={"type": "public", "sort": "updated"},
-                timeout=10,
+                headers=inject_trace_headers(self.headers),
+                params=params,
+                timeout=timeout,
             )
+            return _json_or_none(response)
 
-            if response.status_code == 200:
-                return response.json()
-            current_app.logger.warning(f"GitHub API error: {response.status_code}")
-            return []
+        result = call_dependency("github", fetch, cache_key=_cache_key(url, params))
+        return fallback if result is None else result
+
+    def get_repository(self, owner: str, repo: str) -> dict | None:
+        """Get repository information."""
+        return self._get(f"/repos/{owner}/{repo}")
 
-        except requests.RequestException as e:
-            current_app.logger.error(f"GitHub API request failed: {e}")
-            return []
+    def get_user_repositories(self, username: str) -> list[dict]:
+        """Get user's public repositories."""
+        return self._get(
+            f"/users/{username}/repos",
+            params={"type": "public", "sort": "updated"},
+            fallback=[],
+        )
 
     def get_repository_languages(self, owner: str, repo: str) -> dict[str, int]:
         """Get repository language statistics."""
-        try:
-            url = f"{self.base_url}/repos/{owner}/{repo}/languages"
-            response = requests.get(url, headers=self.headers, timeout=10)
-
-            if response.status_code == 200:
-                return response.json()
-            return {}
-
-        except requests.RequestException as e:
-            current_app.logger.error(f"GitHub languages API request failed: {e}")
-            return {}
+        return self._get(f"/repos/{owner}/{repo}/languages", fallback={})
 
     def get_repository_stats(self, owner: str, repo: str) -> dict | None:
         """Get repository statistics (stars, forks, etc.)."""
-        repo_data = self.get_repository(owner, repo)
-
-        if repo_data:
-            return {
-                "stars": repo_data.get("stargazers_count", 0),
-                "forks": repo_data.get("forks_count", 0),
-                "watchers": repo_data.get("watchers_count", 0),
-                "issues": repo_data.get("open_issues_count", 0),
-                "language": repo_data.get("language"),
-                "created_at": repo_data.get("created_at"),
-                "updated_at": repo_data.get("updated_at"),
-                "description": repo_data.get("description"),
-                "homepage": repo_data.get("homepage"),
-            }
+        return repository_stats(self.get_repository(owner, repo))
 
-        return None
+
+class AsyncGitHubClient(GitHubClient):
+    """GitHub client for async views, on the pooled async HTTP client."""
+
+    async def _get(self, path: str, params: dict | None = None, fallback=None):
+        """GET an API path through the GitHub circuit breaker."""
+        url = f"{self.base_url}{path}"
+
+        async def fetch(timeout: float):
+            response = await get_async_client().get(
+                url,
+                headers=inject_trace_headers(self.headers),
+                params=params,
+                timeout=timeout,
+            )
+            return _json_or_none(response)
+
+        result = await call_dependency_async(
+            "github", fetch, cache_key=_cache_key(url, params)
+        )
+        return fallback if result is None else result
+
+    async def get_repository(self, owner: str, repo: str) -> dict | None:
+        """Get repository information."""
+        return await self._get(f"/repos/{owner}/{repo}")
+
+    async def get_user_repositories(self, username: str) -> list[dict]:
+        """Get user's public repositories."""
+        return await self._get(
+            f"/users/{username}/repos",
+            params={"type": "public", "sort": "updated"},
+            fallback=[],
+        )
+
+    async def get_repository_languages(self, owner: str, repo: str) -> dict[str, int]:
+        """Get repository language statistics."""
+        return await self._get(f"/repos/{owner}/{repo}/languages", fallback={})
+
+    async def get_repository_stats(self, owner: str, repo: str) -> dict | None:
+        """Get repository statistics (stars, forks, etc.)."""
+        return repository_stats(await self.get_repository(owner, repo))
@@ -1,28 +1,31 @@
-"""OpenAI API client for content generation and enhancement."""
+"""OpenAI API clients for content generation and enhancement."""
 
+import json
+from collections.abc import Iterator
 
-import openai
+import requests
 from flask import current_app
 
+from app.core.async_http import get_async_client
+from app.core.resilience import (
+    DependencyError,
+    call_dependency,
+    call_dependency_async,
+    get_breaker,
+)
+from app.core.tracing import inject_trace_headers
 
-class OpenAIClient:
-    """OpenAI API client for content generation."""
+try:
+    import openai
+except ImportError:  # Only the synchronous client uses the SDK
+    openai = None
 
-    def __init__(self, api_key: str | None = None):
-        """Initialize OpenAI client."""
-        self.api_key = api_key or current_app.config.get("OPENAI_API_KEY")
-        if self.api_key:
-            openai.api_key = self.api_key
+BASE_URL = "https://api.openai.com/v1"
 
-    def generate_project_description(
-        self, project_title: str, technologies: list[str]
-    ) -> str | None:
-        """Generate an enhanced project description."""
-        if not self.api_key:
-            return None
 
-        try:
-            prompt = f"""
+def project_description_request(project_title: str, technologies: list[str]) -> dict:
+    """Chat completion arguments for a project description."""
+    prompt = f"""
             Create a professional project description for a portfolio website.
 
             Project: {project_title}
@@ -35,19 +38,185 @@ class OpenAIClient:
 
             Keep it professional and engaging for potential clients.
             """
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a professional technical writer specializing in portfolio content.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": 150,
+        "temperature": 0.7,
+    }
+
+
+def service_description_request(service_title: str, current_description: str) -> dict:
+    """Chat completion arguments for an enhanced service description."""
+    prompt = f"""
+            Enhance this service description for a professional portfolio:
+
+            Service: {service_title}
+            Current description: {current_description}
+
+            Rewrite to be more compelling and professional while keeping the same length.
+            Focus on client benefits and technical expertise.
+            """
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a professional copywriter specializing in technical services.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": 100,
+        "temperature": 0.6,
+    }
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional technical writer specializing in portfolio content.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=150,
-                temperature=0.7,
+
+def blog_outline_request(topic: str) -> dict:
+    """Chat completion arguments for a blog post outline."""
+    prompt = f"""
+            Create a blog post outline for a technical blog about: {topic}
+
+            Return a JSON structure with:
+            - title: Engaging blog post title
+            - introduction: Brief intro paragraph
+            - sections: Array of section objects with title and key_points
+            - conclusion: Brief conclusion
+
+            Focus on practical, actionable content for developers.
+            """
+    return {
+        "model": "gpt-3.5-turbo",
+        "messages": [
+            {
+                "role": "system",
+                "content": "You are a technical content strategist. Return valid JSON only.",
+            },
+            {"role": "user", "content": prompt},
+        ],
+        "max_tokens": 300,
+        "temperature": 0.7,
+    }
+
+
+def _stream_tokens(response: requests.Response) -> Iterator[str]:
+    """Content tokens of a streamed chat completion response."""
+    # chunk_size=None: hand over each event as soon as it is received
+    for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line.removeprefix("data:").strip()
+        if data == "[DONE]":
+            return
+        choices = json.loads(data).get("choices") or [{}]
+        token = choices[0].get("delta", {}).get("content")
+        if token:
+            yield token
+
+
+class OpenAIClient:
+    """OpenAI API client for content generation."""
+
+    def __init__(self, api_key: str | None = None):
+        """Initialize OpenAI client."""
+        self.api_key = api_key or current_app.config.get("OPENAI_API_KEY")
+        self.base_url = BASE_URL
+        if self.api_key and openai is not None:
+            openai.api_key = self.api_key
+
+    def _chat_completion(self, **kwargs):
+        """Chat completion through the OpenAI circuit breaker (None if skipped)."""
+        if openai is None:
+            raise DependencyError("the openai package is not installed")
+        return call_dependency(
+            "openai",
+            lambda timeout: openai.ChatCompletion.create(
+                request_timeout=timeout, **kwargs
+            ),
+        )
+
+    def _stream_chat_completion(self, **kwargs) -> Iterator[str]:
+        """
+        Content tokens of a streamed chat completion, as they arrive.
+
+        Opening the stream goes through the OpenAI circuit breaker; nothing
+        is yielded when it is skipped or fails. The breaker is told about
+        the stream's outcome once it ends: a complete stream is a success, a
+        dropped connection or read timeout part-way is a failure (and is
+        re-raised). Closing the iterator early closes the connection, which
+        aborts the generation upstream.
+        """
+
+        def open_stream(timeout: float):
+            response = requests.post(
+                f"{self.base_url}/chat/completions",
+                headers=inject_trace_headers(
+                    {"Authorization": f"Bearer {self.api_key}"}
+                ),
+                json={**kwargs, "stream": True},
+                stream=True,
+                timeout=timeout,
             )
+            if response.status_code == 200:
+                return response
+            response.close()
+            # Outages and rate limiting count against the breaker
+            if response.status_code >= 500 or response.status_code == 429:
+                raise DependencyError(f"OpenAI API error: {response.status_code}")
+            current_app.logger.error(f"OpenAI API error: {response.status_code}")
+            return None
+
+        # Opening the stream proves little; its end decides the outcome
+        response = call_dependency("openai", open_stream, record_success=False)
+        if response is None:
+            return
+        breaker = get_breaker("openai")
+        try:
+            yield from _stream_tokens(response)
+        except (requests.RequestException, ValueError) as e:
+            breaker.record_failure()
+            current_app.logger.error(f"OpenAI stream failed: {e}")
+            raise
+        else:
+            breaker.record_success()
+        finally:
+            response.close()
+
+    def stream_project_description(
+        self, project_title: str, technologies: list[str]
+    ) -> Iterator[str]:
+        """Stream a project description token by token."""
+        if not self.api_key:
+            return iter(())
+        return self._stream_chat_completion(
+            **project_description_request(project_title, technologies)
+        )
+
+    def stream_blog_post_outline(self, topic: str) -> Iterator[str]:
+        """Stream a blog post outline (JSON text) token by token."""
+        if not self.api_key:
+            return iter(())
+        return self._stream_chat_completion(**blog_outline_request(topic))
+
+    def generate_project_description(
+        self, project_title: str, technologies: list[str]
+    ) -> str | None:
+        """Generate an enhanced project description."""
+        if not self.api_key:
+            return None
+
+        try:
+            response = self._chat_completion(
+                **project_description_request(project_title, technologies)
+            )
+
+            if response is None:
+                return None
 
             return response.choices[0].message.content.strip()
 
@@ -63,29 +232,13 @@ class OpenAIClient:
             return None
 
         try:
-            prompt = f"""
-            Enhance this service description for a professional portfolio:
-
-            Service: {service_title}
-            Current description: {current_description}
-
-            Rewrite to be more compelling and professional while keeping the same length.
-            Focus on client benefits and technical expertise.
-            """
-
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a professional copywriter specializing in technical services.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=100,
-                temperature=0.6,
+            response = self._chat_completion(
+                **service_description_request(service_title, current_description)
             )
 
+            if response is None:
+                return None
+
             return response.choices[0].message.content.strip()
 
         except Exception as e:
@@ -98,35 +251,81 @@ class OpenAIClient:
             return None
 
         try:
-            prompt = f"""
-            Create a blog post outline for a technical blog about: {topic}
+            response = self._chat_completion(**blog_outline_request(topic))
 
-            Return a JSON structure with:
-            - title: Engaging blog post title
-            - introduction: Brief intro paragraph
-            - sections: Array of section objects with title and key_points
-            - conclusion: Brief conclusion
+            if response is None:
+                return None
+
+            return json.loads(response.choices[0].message.content)
+
+        except Exception as e:
+            current_app.logger.error(f"OpenAI blog outline error: {e}")
+            return None
 
-            Focus on practical, actionable content for developers.
-            """
 
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a technical content strategist. Return valid JSON only.",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                max_tokens=300,
-                temperature=0.7,
+class AsyncOpenAIClient:
+    """OpenAI client for async views, on the pooled async HTTP client."""
+
+    def __init__(self, api_key: str | None = None):
+        """Initialize OpenAI client."""
+        self.api_key = api_key or current_app.config.get("OPENAI_API_KEY")
+        self.base_url = BASE_URL
+
+    def _headers(self) -> dict[str, str]:
+        """Authorization and trace headers for an API call."""
+        return inject_trace_headers({"Authorization": f"Bearer {self.api_key}"})
+
+    async def _chat_completion(self, **kwargs) -> str | None:
+        """Message content of a chat completion (None if skipped or failed)."""
+
+        async def create(timeout: float):
+            response = await get_async_client().post(
+                f"{self.base_url}/chat/completions",
+                headers=self._headers(),
+                json=kwargs,
+                timeout=timeout,
             )
+            # Outages and rate limiting count against the breaker
+            if response.status_code >= 500 or response.status_code == 429:
+                raise DependencyError(f"OpenAI API error: {response.status_code}")
+            if response.status_code != 200:
+                current_app.logger.error(f"OpenAI API error: {response.status_code}")
+                return None
+            return response.json()["choices"][0]["message"]["content"]
 
-            import json
+        return await call_dependency_async("openai", create)
 
-            return json.loads(response.choices[0].message.content)
+    async def generate_project_description(
+        self, project_title: str, technologies: list[str]
+    ) -> str | None:
+        """Generate an enhanced project description."""
+        if not self.api_key:
+            return None
+        content = await self._chat_completion(
+            **project_description_request(project_title, technologies)
+        )
+        return content.strip() if content else None
 
-        except Exception as e:
+    async def enhance_service_description(
+        self, service_title: str, current_description: str
+    ) -> str | None:
+        """Enhance a service description."""
+        if not self.api_key:
+            return None
+        content = await self._chat_completion(
+            **service_description_request(service_title, current_description)
+        )
+        return content.strip() if content else None
+
+    async def generate_blog_post_outline(self, topic: str) -> dict | None:
+        """Generate a blog post outline."""
+        if not self.api_key:
+            return None
+        content = await self._chat_completion(**blog_outline_request(topic))
+        if not content:
+            return None
+        try:
+            return json.loads(content)
+        except ValueError as e:
             current_app.logger.error(f"OpenAI blog outline error: {e}")
             return None
@@ -2,6 +2,8 @@
 
 from flask import Flask
 
+from .admin import admin_bp
+from .analytics import analytics_bp
 from .auth import auth_bp
 from .blog import blog_bp
 from .home import home_bp
@@ -14,3 +16,5 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(projects_bp)
     app.register_blueprint(blog_bp)
     app.register_blueprint(auth_bp)
+    app.register_blueprint(analytics_bp)
+    app.register_blueprint(admin_bp)
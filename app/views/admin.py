@@ -0,0 +1,153 @@
+"""Operational admin routes (token-guarded)."""
+
+import os
+
+from flask import Blueprint, abort, current_app, request, send_from_directory
+
+from app.core.allocations import allocation_stats
+from app.core.profiler import active_profile, profile_dir, start_profile
+from app.core.security import require_admin_token
+from app.core.sse import relay_stream
+from app.utils.api.openai import OpenAIClient
+
+# Create blueprint
+admin_bp = Blueprint("admin", __name__, url_prefix="/admin")
+
+PROFILE_SUFFIXES = (".collapsed.txt", ".speedscope.json")
+
+# Groupings accepted by tracemalloc's Snapshot.compare_to
+MEMORY_DIFF_KEYS = ("lineno", "filename", "traceback")
+
+
+@admin_bp.route("/profile", methods=["POST"])
+@require_admin_token(allow_query=False)
+def start_profiling():
+    """Start sampling this worker; the result is saved when it finishes."""
+    seconds = min(
+        request.args.get("seconds", 10, type=float),
+        current_app.config["PROFILER_MAX_SECONDS"],
+    )
+    interval = max(
+        request.args.get(
+            "interval", current_app.config["PROFILER_INTERVAL"], type=float
+        ),
+        current_app.config["PROFILER_MIN_INTERVAL"],
+    )
+    profiler = start_profile(seconds, interval, profile_dir(current_app))
+    if profiler is None:
+        return {"error": "a profile is already running in this worker"}, 409
+
+    return {
+        "pid": os.getpid(),
+        "seconds": seconds,
+        "interval": interval,
+        "files": [f"{profiler.name_prefix}{suffix}" for suffix in PROFILE_SUFFIXES],
+    }, 202
+
+
+@admin_bp.route("/profile")
+@require_admin_token(allow_query=False)
+def list_profiles():
+    """Saved profiles, newest first, and whether this worker is sampling."""
+    directory = profile_dir(current_app)
+    names = os.listdir(directory) if os.path.isdir(directory) else []
+    running = active_profile()
+    return {
+        "running": running.name_prefix if running is not None else None,
+        "profiles": sorted(
+            (name for name in names if name.endswith(PROFILE_SUFFIXES)), reverse=True
+        ),
+    }
+
+
+@admin_bp.route("/profile/<name>")
+@require_admin_token(allow_query=False)
+def download_profile(name):
+    """One saved profile file."""
+    if not name.endswith(PROFILE_SUFFIXES):
+        abort(404)
+    return send_from_directory(profile_dir(current_app), name)
+
+
+@admin_bp.route("/memory")
+@require_admin_token(allow_query=False)
+def memory_growth():
+    """Allocation sites that grew, and per-endpoint allocation averages."""
+    history = current_app.extensions.get("memory_snapshots")
+    if history is None:
+        return {"error": "memory tracing is disabled (MEMORY_TRACING)"}, 404
+
+    key = request.args.get("key", "lineno")
+    if key not in MEMORY_DIFF_KEYS:
+        return {"error": f"key must be one of {', '.join(MEMORY_DIFF_KEYS)}"}, 400
+
+    if history.latest is None:
+        history.take()
+    return {
+        "pid": os.getpid(),
+        "snapshot_taken_at": history.taken_at,
+        "endpoints": allocation_stats.summary(),
+        "growth": history.diff(
+            against=request.args.get("against", "baseline"),
+            key=key,
+            limit=request.args.get("limit", 25, type=int),
+        ),
+    }
+
+
+@admin_bp.route("/memory/snapshot", methods=["POST"])
+@require_admin_token(allow_query=False)
+def memory_snapshot():
+    """Take a snapshot now and return the growth since the previous one."""
+    history = current_app.extensions.get("memory_snapshots")
+    if history is None:
+        return {"error": "memory tracing is disabled (MEMORY_TRACING)"}, 404
+
+    history.take()
+    return {
+        "pid": os.getpid(),
+        "growth": history.diff(
+            against="previous", limit=request.args.get("limit", 25, type=int)
+        ),
+    }
+
+
+@admin_bp.route("/generate/project-description")
+@require_admin_token(allow_query=False)
+def stream_project_description():
+    """Stream a generated project description as server-sent events."""
+    title = request.args.get("title", "").strip()
+    technologies = [
+        name.strip()
+        for name in request.args.get("technologies", "").split(",")
+        if name.strip()
+    ]
+    if not title:
+        return {"error": "title is required"}, 400
+    client = OpenAIClient()
+    if not client.api_key:
+        return {"error": "OPENAI_API_KEY is not configured"}, 503
+
+    return relay_stream(
+        ("project-description", title, tuple(technologies)),
+        client.stream_project_description(title, technologies),
+        refresh="refresh" in request.args,
+    )
+
+
+@admin_bp.route("/generate/blog-outline")
+@require_admin_token(allow_query=False)
+def stream_blog_outline():
+    """Stream a generated blog post outline as server-sent events."""
+    topic = request.args.get("topic", "").strip()
+    if not topic:
+        return {"error": "topic is required"}, 400
+    client = OpenAIClient()
+    if not client.api_key:
+        return {"error": "OPENAI_API_KEY is not configured"}, 503
+
+    return relay_stream(
+        ("blog-outline", topic),
+        client.stream_blog_post_outline(topic),
+        refresh="refresh" in request.args,
+    )
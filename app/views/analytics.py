@@ -0,0 +1,26 @@
+"""Analytics dashboard routes."""
+
+from datetime import UTC, datetime
+
+from flask import Blueprint, current_app, render_template
+
+from app.core.security import require_admin_token
+
+# Create blueprint
+analytics_bp = Blueprint("analytics", __name__, url_prefix="/analytics")
+
+
+@analytics_bp.route("/")
+@require_admin_token
+def dashboard():
+    """Analytics dashboard rendered from the incremental rollups."""
+    rollups = current_app.extensions.get("analytics_rollups")
+    summary = rollups.snapshot().summary() if rollups is not None else None
+
+    return render_template(
+        "pages/analytics/dashboard.html",
+        summary=summary,
+        sink=current_app.config.get("ANALYTICS_SINK"),
+        to_datetime=lambda ts: datetime.fromtimestamp(ts, UTC),
+        title="Analytics - KusseTechStudio",
+    )
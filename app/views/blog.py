@@ -1,6 +1,8 @@
 """Blog-related routes."""
 
-from flask import Blueprint, render_template
+from flask import Blueprint
+
+from app.core.streaming import render_page
 
 # Create blueprint
 blog_bp = Blueprint("blog", __name__, url_prefix="/blog")
@@ -10,4 +12,4 @@ blog_bp = Blueprint("blog", __name__, url_prefix="/blog")
 def index():
     """Blog page route."""
     # Placeholder for future blog functionality
-    return render_template("pages/blog.html", title="Blog - KusseTechStudio")
+    return render_page("pages/blog.html", title="Blog - KusseTechStudio")
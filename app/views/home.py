@@ -1,8 +1,9 @@
 """Home and main page routes."""
 
-from flask import Blueprint, render_template
+from flask import Blueprint
 
-from app.core.utils import track_event, track_route_event
+from app.core.streaming import render_page
+from app.core.utils import annotate_event, track_route_event
 from app.models.project import ProjectRepository
 
 # Create blueprint
@@ -18,13 +19,10 @@ def index():
     """Homepage route."""
     featured_projects = project_repo.get_featured()
 
-    # Track homepage visit with featured project count
-    track_event(
-        "Homepage Loaded",
-        {"featured_projects_count": len(featured_projects), "page_type": "homepage"},
-    )
+    # Add the featured project count to the page view event
+    annotate_event(featured_projects_count=len(featured_projects), page_type="homepage")
 
-    return render_template(
+    return render_page(
         "pages/home.html",
         title="KusseTechStudio - Python Development & Data Solutions",
         featured_projects=featured_projects,
@@ -35,7 +33,7 @@ def index():
 @track_route_event("Viewed About Page")
 def about():
     """About page route."""
-    return render_template("pages/about.html", title="About - KusseTechStudio")
+    return render_page("pages/about.html", title="About - KusseTechStudio")
 
 
 @home_bp.route("/services")
@@ -47,13 +45,10 @@ def services():
     service_repo = ServiceRepository()
     services_list = service_repo.get_all()
 
-    # Track services page view
-    track_event(
-        "Services Page Loaded",
-        {"services_count": len(services_list), "page_type": "services"},
-    )
+    # Add the services count to the page view event
+    annotate_event(services_count=len(services_list), page_type="services")
 
-    return render_template(
+    return render_page(
         "pages/services.html",
         services=services_list,
         title="Services - KusseTechStudio",
@@ -71,31 +66,27 @@ def contact():
         email = request.form.get("email")
         message = request.form.get("message")
 
-        # Track contact form submission attempt
-        track_event(
+        # The page view event becomes the form submission event
+        annotate_event(
             "Contact Form Submitted",
-            {
-                "has_name": bool(name),
-                "has_email": bool(email),
-                "has_message": bool(message),
-                "message_length": len(message or ""),
-            },
+            has_name=bool(name),
+            has_email=bool(email),
+            has_message=bool(message),
+            message_length=len(message or ""),
         )
 
         if not all([name, email, message]):
-            track_event(
-                "Contact Form Validation Failed",
-                {
-                    "missing_fields": [
-                        field
-                        for field, value in [
-                            ("name", name),
-                            ("email", email),
-                            ("message", message),
-                        ]
-                        if not value
+            annotate_event(
+                outcome="validation_failed",
+                missing_fields=[
+                    field
+                    for field, value in [
+                        ("name", name),
+                        ("email", email),
+                        ("message", message),
                     ]
-                },
+                    if not value
+                ],
             )
             flash("All fields are required.", "error")
             return redirect(url_for("home.contact"))
@@ -103,9 +94,9 @@ def contact():
         try:
             # In a production app, you would send email here
             # For now, just show success message
-            track_event(
-                "Contact Form Success",
-                {"sender_domain": email.split("@")[1] if "@" in email else "unknown"},
+            annotate_event(
+                outcome="success",
+                sender_domain=email.split("@")[1] if "@" in email else "unknown",
             )
             flash(
                 f"Thank you {name}! Your message has been received. "
@@ -115,9 +106,8 @@ def contact():
 
         except Exception as e:
             current_app.logger.error(f"Contact form error: {e!s}")
-            track_event(
-                "Contact Form Error",
-                {"error_type": type(e).__name__, "error_message": str(e)},
+            annotate_event(
+                outcome="error", error_type=type(e).__name__, error_message=str(e)
             )
             flash(
                 "Thank you for your message! There was a minor issue "
@@ -127,7 +117,7 @@ def contact():
 
         return redirect(url_for("home.contact"))
 
-    return render_template("pages/contact.html", title="Contact - Kusse Tech Studio")
+    return render_page("pages/contact.html", title="Contact - Kusse Tech Studio")
 
 
 @home_bp.route("/health")
@@ -135,8 +125,32 @@ def health():
     """Health check endpoint for Docker health checks."""
     from flask import current_app
 
+    from app.core.service_worker import read_content_version
+
     return {
         "status": "healthy",
         "timestamp": current_app.config.get("STARTUP_TIME", "unknown"),
-        "version": "2.0.0",
+        "version": read_content_version(current_app.static_folder),
     }, 200
+
+
+@home_bp.route("/livez")
+def livez():
+    """Liveness probe: the worker answers requests."""
+    return {"status": "alive"}, 200
+
+
+@home_bp.route("/readyz")
+def readyz():
+    """Readiness probe: warmed up and no critical dependency failing."""
+    from flask import current_app
+
+    state = current_app.extensions["health"]
+    state.ensure_checker()
+    ready = state.is_ready()
+    return {
+        "status": "ready" if ready else "starting",
+        "warm_up_seconds": state.warm_up_seconds,
+        "checked_at": state.checked_at,
+        "checks": state.results,
+    }, (200 if ready else 503)
@@ -1,9 +1,12 @@
 """Project-related routes."""
 
-from flask import Blueprint, abort, render_template
+from flask import Blueprint, abort, current_app, jsonify
 
-from app.core.utils import track_event, track_route_event
+from app.core.async_http import gather_calls
+from app.core.streaming import render_page
+from app.core.utils import annotate_event, track_route_event
 from app.models.project import ProjectRepository
+from app.utils.api.github import AsyncGitHubClient, parse_repository_url
 
 # Create blueprint
 projects_bp = Blueprint("projects", __name__, url_prefix="/projects")
@@ -18,13 +21,10 @@ def index():
     """Projects listing page."""
     projects_list = project_repo.get_all()
 
-    # Track additional project listing metrics
-    track_event(
-        "Projects Listed",
-        {"project_count": len(projects_list), "page_type": "projects_index"},
-    )
+    # Add project listing metrics to the page view event
+    annotate_event(project_count=len(projects_list), page_type="projects_index")
 
-    return render_template(
+    return render_page(
         "pages/projects.html",
         projects=projects_list,
         title="Projects - KusseTechStudio",
@@ -36,26 +36,44 @@ def index():
 def detail(project_id):
     """Individual project detail page."""
     project = project_repo.get_by_id(project_id)
+    annotate_event(project_id=project_id)
 
     if not project:
-        # Track 404 events for projects
-        track_event(
-            "Project Not Found", {"project_id": project_id, "error_type": "404"}
-        )
+        # The event is still sent, with status 404
         abort(404)
 
-    # Track successful project views
-    track_event(
-        "Project Detail Viewed",
-        {
-            "project_id": project_id,
-            "project_title": project.title,
-            "project_type": getattr(project, "type", "unknown"),
-        },
+    # Add project details to the page view event
+    annotate_event(
+        project_title=project.title,
+        project_type=getattr(project, "type", "unknown"),
     )
 
-    return render_template(
+    return render_page(
         "project_detail.html",
         project=project,
         title=f"{project.title} - KusseTechStudio",
     )
+
+
+@projects_bp.route("/<int:project_id>/repository")
+async def repository(project_id):
+    """GitHub stats and languages of a project, fetched concurrently."""
+    project = project_repo.get_by_id(project_id)
+    repository = parse_repository_url(project.github_url or "") if project else None
+    if repository is None:
+        abort(404)
+
+    owner, repo = repository
+    github = AsyncGitHubClient(current_app.config.get("GITHUB_TOKEN"))
+    results = await gather_calls(
+        stats=github.get_repository_stats(owner, repo),
+        languages=github.get_repository_languages(owner, repo),
+    )
+
+    response = jsonify(project_id=project_id, repository=f"{owner}/{repo}", **results)
+    if None in results.values():
+        # A failed or skipped call must not be cached in place of real data
+        response.headers["Cache-Control"] = "no-store"
+    else:
+        response.headers["Cache-Control"] = "public, max-age=300"
+    return response
@@ -0,0 +1,24 @@
+"""ASGI entry point: ``uvicorn asgi:app``.
+
+Serves the same Flask app as ``run.py`` and gunicorn, through the adapter
+in ``app/core/asgi.py``; async views then run on the server's event loop
+and share its upstream connections. Each request still holds a pool thread.
+"""
+
+import threading
+
+from dotenv import load_dotenv
+
+from app import create_app
+from app.core.asgi import create_asgi_app
+from app.core.health import warm_up
+
+# Load environment variables
+load_dotenv()
+
+flask_app = create_app()
+app = create_asgi_app(flask_app)
+
+if not flask_app.debug:
+    # Readiness stays false until every page has been rendered once
+    threading.Thread(target=warm_up, args=(flask_app,), daemon=True).start()
@@ -60,14 +60,129 @@ class Config:
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None
 
+    # Proxies in front of the app whose X-Forwarded-For is trusted (0: none)
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", "0"))
+
     # Analytics
     GOOGLE_ANALYTICS_ID = os.environ.get("GOOGLE_ANALYTICS_ID")
+    ANALYTICS_SINK = os.environ.get("ANALYTICS_SINK", "posthog")  # or local, both
+    ANALYTICS_STORE_DIR = os.environ.get("ANALYTICS_STORE_DIR")  # instance/analytics
+    ANALYTICS_SEGMENT_ROWS = 1_000_000  # Events per local store segment file
+    ANALYTICS_ROLLUP_SAVE_INTERVAL = 10  # Seconds between rollup merges per worker
+
+    # Crawlers: not tracked, served from an in-process page cache
+    BOT_CACHE_MAX_AGE = 3600  # Cache-Control max-age for pages served to bots
+    BOT_PAGE_CACHE_SIZE = 128  # Pages kept per worker (0 disables the cache)
+    BOT_PAGE_CACHE_TTL = 300  # Seconds a cached page is served to bots
+
+    # Scanner probes (/wp-admin, /.env, ...) answered before Flask routing
+    SCANNER_FILTER = True
+    SCANNER_EXTRA_PREFIXES = []  # Additional path prefixes to reject
+
+    # Admin endpoints (analytics dashboard); 404 without a matching token
+    ADMIN_TOKEN = os.environ.get("ADMIN_TOKEN")
 
     # Contact form
     CONTACT_EMAIL = os.environ.get("CONTACT_EMAIL", "contact@kussetech.com")
 
     # Performance
-    SEND_FILE_MAX_AGE_DEFAULT = 31536000  # 1 year cache for static files
+    SEND_FILE_MAX_AGE_DEFAULT = 300  # Unversioned files revalidate via ETag
+    STATIC_DEFAULT_MAX_AGE = 300  # Static URLs without a matching content hash
+    STATIC_IMMUTABLE_MAX_AGE = 31536000  # 1 year cache for hashed static URLs
+    PRELOAD_LINKS = True  # Link: rel=preload headers for critical assets
+    EARLY_HINTS = os.environ.get("EARLY_HINTS", "false").lower() == "true"
+    STREAM_TEMPLATES = os.environ.get("STREAM_TEMPLATES", "false").lower() == "true"
+    STREAM_BUFFER_SIZE = 16384  # Characters per streamed chunk after the head
+    HTML_MINIFY = True  # Strip template whitespace/comments at compile time
+    CACHE_STAT_CHECKS = False  # Caches refresh via `flask cache invalidate`
+    CACHE_BUS_PATH = os.environ.get("CACHE_BUS_PATH")  # instance/cache-generations
+    CONTENT_SNAPSHOT = True  # Serve projects/services from a shared mmap segment
+    # Defaults to instance/content.segment
+    CONTENT_SNAPSHOT_PATH = os.environ.get("CONTENT_SNAPSHOT_PATH")
+    HEALTH_CHECK_INTERVAL = 15  # Seconds between background dependency checks
+    HEALTH_MIN_FREE_BYTES = 100 * 1024 * 1024  # Unready below this much free disk
+
+    # Outbound calls: per-request budget, per-dependency timeouts, breakers
+    REQUEST_DEADLINE = 8.0  # Seconds a request may spend on outbound calls
+    DEPENDENCY_TIMEOUTS = {"posthog": 2.0, "github": 5.0, "openai": 20.0}
+    CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failures before a circuit opens
+    CIRCUIT_RESET_TIMEOUT = 30.0  # Seconds before a half-open probe is allowed
+
+    # Async views: pooled async HTTP client (one per event loop)
+    ASYNC_HTTP_MAX_CONNECTIONS = 100
+    ASYNC_HTTP_MAX_KEEPALIVE = 20  # Idle connections kept open for reuse
+    ASYNC_HTTP_KEEPALIVE_EXPIRY = 30.0  # Seconds an idle connection is kept
+    GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN")  # Optional; raises rate limits
+    SSE_CACHE_SIZE = 128  # Completed streamed generations kept per worker
+    SSE_CACHE_TTL = 3600  # Seconds a completed generation is replayed from cache
+
+    # Admission control from queue time (nginx X-Request-Start) and in-flight load
+    ADMISSION_CONTROL = True
+    ADMISSION_DEGRADE_QUEUE_MS = 250  # Skip analytics, shed low-priority work
+    ADMISSION_REJECT_QUEUE_MS = 2000  # Too late to serve: fast 503 for everyone
+    # Per worker; above this it is degraded. None: one below its thread count
+    ADMISSION_MAX_IN_FLIGHT = None
+    ADMISSION_RETRY_AFTER = 5  # Seconds, sent with every 503
+    ADMISSION_CRITICAL_PREFIXES = ["/health", "/livez", "/readyz", "/metrics"]
+    ADMISSION_LOW_PRIORITY_PREFIXES = ["/analytics"]
+
+    # On-demand sampling profiler (POST /admin/profile?seconds=N)
+    PROFILER_DIR = os.environ.get("PROFILER_DIR")  # instance/profiles
+    PROFILER_INTERVAL = 0.01  # Seconds between stack samples (100 Hz)
+    PROFILER_MIN_INTERVAL = 0.001
+    PROFILER_MAX_SECONDS = 120
+
+    # Opt-in allocation tracing (tracemalloc) with snapshot diffs at /admin/memory
+    MEMORY_TRACING = os.environ.get("MEMORY_TRACING", "false").lower() == "true"
+    MEMORY_TRACING_FRAMES = 10  # Stack depth kept per allocation
+    MEMORY_SNAPSHOT_INTERVAL = 300  # Seconds between automatic snapshots
+
+    # Request tracing: sampled spans exported as OTLP/JSON
+    TRACING = True
+    TRACE_SAMPLE_RATE = float(os.environ.get("TRACE_SAMPLE_RATE", "0"))
+    TRACE_SAMPLE_RULES = {  # Endpoint -> rate; overrides TRACE_SAMPLE_RATE
+        "home.health": 0.0,
+        "home.livez": 0.0,
+        "home.readyz": 0.0,
+        "metrics": 0.0,
+        "static": 0.0,
+    }
+    TRACE_RESPECT_PARENT = (  # Trace whenever an incoming traceparent is sampled
+        os.environ.get("TRACE_RESPECT_PARENT", "false").lower() == "true"
+    )
+    # Defaults to instance/traces.otlp.jsonl
+    TRACE_EXPORT_FILE = os.environ.get("TRACE_EXPORT_FILE")
+    # OTLP/HTTP collector, e.g. http://otel:4318/v1/traces
+    TRACE_EXPORT_URL = os.environ.get("TRACE_EXPORT_URL")
+    TRACE_EXPORT_BATCH = 64  # Spans per export batch
+    TRACE_EXPORT_INTERVAL = 5.0  # Seconds between exports of partial batches
+    TRACE_SERVICE_NAME = "kusse-tech-studio"
+
+    # Sentry sampling policy (app/core/sentry_sampling.py)
+    SENTRY_TRACES_SAMPLE_RATE = float(
+        os.environ.get("SENTRY_TRACES_SAMPLE_RATE", "0.1")
+    )
+    SENTRY_PROFILES_SAMPLE_RATE = float(
+        os.environ.get("SENTRY_PROFILES_SAMPLE_RATE", "0.1")
+    )
+    SENTRY_SAMPLING_RULES = [  # (path regex, rate); first match wins
+        (r"^/(health|livez|readyz|metrics)$", 0.0),
+        (r"^/static/", 0.0),
+        (r"^/(robots\.txt|sitemap\.xml|sw\.js|favicon\.ico)$", 0.0),
+        (r"^/admin/", 0.0),
+    ]
+    SENTRY_BOT_SAMPLE_RATE = 0.0  # Crawlers and uptime checkers
+    SENTRY_TRACES_PER_MINUTE = 60  # Per worker; rates scale down beyond this
+    SENTRY_SLOW_REQUEST_MS = 1000  # Slower requests boost their path
+    SENTRY_BOOST_SAMPLE_RATE = 1.0  # Rate for recently slow or failing paths
+    SENTRY_BOOST_WINDOW = 300  # Seconds a path stays boosted
+
+    # Responsive images (variants cached under instance/image-cache by default)
+    IMAGE_WIDTHS = [320, 640, 960, 1280]
+    IMAGE_FORMATS = ["avif", "webp"]
+    IMAGE_QUALITY = {"avif": 50, "webp": 75, "jpeg": 80}
+    IMAGE_ENCODE_WORKERS = int(os.environ.get("IMAGE_ENCODE_WORKERS", 2))
+    IMAGE_CACHE_DIR = os.environ.get("IMAGE_CACHE_DIR")
 
     @staticmethod
     def init_app(app):
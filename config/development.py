@@ -9,6 +9,12 @@ class DevelopmentConfig(Config):
     DEBUG = True
     DEVELOPMENT = True
 
+    # Readable page source while developing
+    HTML_MINIFY = False
+
+    # Pick up rebuilt assets without invalidating caches by hand
+    CACHE_STAT_CHECKS = True
+
     # Database (if needed)
     SQLALCHEMY_DATABASE_URI = "sqlite:///dev.db"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
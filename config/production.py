@@ -27,6 +27,9 @@ class ProductionConfig(Config):
     # SSL redirect
     PREFERRED_URL_SCHEME = "https"
 
+    # Requests arrive through nginx, which sets X-Forwarded-For
+    PROXY_FIX_X_FOR = int(os.environ.get("PROXY_FIX_X_FOR", "1"))
+
     @staticmethod
     def init_app(app):
         """Initialize production-specific settings."""
@@ -0,0 +1,60 @@
+"""Gunicorn settings for production (loaded automatically from this folder).
+
+The app is preloaded in the master, its caches are warmed and the heap is
+frozen before forking, so workers share the master's memory pages instead
+of copying them. See ``app/core/preload.py``.
+
+Workers are ``gthread`` workers: each serves up to ``threads`` requests at
+once, which is also where admission control puts its in-flight limit.
+"""
+
+import gc
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("GUNICORN_WORKERS", "4"))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "120"))
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", "100"))
+preload_app = os.environ.get("GUNICORN_PRELOAD", "true").lower() == "true"
+
+if preload_app:
+    # No collections in the master from here until the workers are forked:
+    # a collection would free slots in pages the workers are meant to share
+    gc.disable()
+
+
+def when_ready(server):
+    """Warm every cache in the master, then freeze its heap once."""
+    if not preload_app:
+        return
+    from app.core.preload import freeze_heap, warm_caches
+
+    flask_app = server.app.wsgi()
+    warm_caches(flask_app)
+    freeze_heap()
+    server.log.info(
+        f"Caches warmed and {gc.get_freeze_count()} objects frozen before forking"
+    )
+
+
+def post_fork(server, worker):
+    """Turn the GC back on in the worker (it stays off in the master)."""
+    from app.core.preload import configure_worker_gc
+
+    configure_worker_gc()
+    server.log.info(
+        f"Worker {worker.pid} started with {gc.get_freeze_count()} frozen objects"
+    )
+
+
+def post_worker_init(worker):
+    """Size admission control, then render every page once before serving."""
+    from app.core.admission import set_worker_concurrency
+    from app.core.health import warm_up
+
+    set_worker_concurrency(worker.wsgi, worker.cfg.threads)
+    seconds = warm_up(worker.wsgi)
+    worker.log.info(f"Worker {worker.pid} warmed up in {seconds:.2f}s")
@@ -18,4 +18,12 @@ if __name__ == "__main__":
     host = os.environ.get("FLASK_HOST", "127.0.0.1")
     port = int(os.environ.get("FLASK_PORT", 5000))
 
+    if not debug:
+        # Readiness stays false until every page has been rendered once
+        import threading
+
+        from app.core.health import warm_up
+
+        threading.Thread(target=warm_up, args=(app,), daemon=True).start()
+
     app.run(debug=debug, host=host, port=port)
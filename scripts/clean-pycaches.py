@@ -7,12 +7,21 @@ Safely removes Python cache files and directories:
 - .pyc files
 - .pyo files (Python optimized bytecode)
 
-Excludes virtual environments and sensitive directories.
+Excludes virtual environments and sensitive directories. The tree is walked
+once with os.scandir: excluded directories are pruned before descending,
+__pycache__ directories are not descended into, and directories are scanned
+and items deleted on a thread pool.
+
+Usage:
+    python scripts/clean-pycaches.py [ROOT] [--dry-run] [--quiet] [--workers N]
 """
 
+import argparse
+import os
 import shutil
 import sys
-from pathlib import Path
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
 # Directories to exclude from cleanup
 EXCLUDE_DIRS = {
@@ -27,83 +36,165 @@ EXCLUDE_DIRS = {
     "dist-packages",
 }
 
+CACHE_DIR_NAME = "__pycache__"
+CACHE_FILE_SUFFIXES = (".pyc", ".pyo")
 
-def should_skip_path(path):
-    """Check if a path should be skipped based on excluded directories."""
-    return any(excluded in path.parts for excluded in EXCLUDE_DIRS)
-
+DEFAULT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-def clean_pycache_directories(root_path):
-    """Clean __pycache__ directories and return count."""
-    count = 0
-    print("Removing __pycache__ directories:")
-
-    for pycache in root_path.rglob("__pycache__"):
-        if should_skip_path(pycache):
-            print(f"  ⏭️  Skipped (excluded): {pycache}")
-            continue
 
-        try:
-            shutil.rmtree(pycache, ignore_errors=True)
-            print(f"  ✅ Removed: {pycache}")
-            count += 1
-        except Exception as e:
-            print(f"  ❌ Failed to remove {pycache}: {e}")
+def scan_directory(path):
+    """
+    Scan one directory without descending.
 
-    return count
+    Returns (subdirectories to walk, cache items found, excluded directories).
+    """
+    subdirs, found, skipped = [], [], []
 
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in EXCLUDE_DIRS:
+                            skipped.append(entry.path)
+                        elif entry.name == CACHE_DIR_NAME:
+                            found.append(entry.path)
+                        else:
+                            subdirs.append(entry.path)
+                    elif entry.name.endswith(CACHE_FILE_SUFFIXES):
+                        found.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+
+    return subdirs, found, skipped
+
+
+def find_cache_items(root, executor):
+    """Walk the tree once, scanning directories in parallel."""
+    found, skipped = [], []
+    pending = {executor.submit(scan_directory, root)}
+
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            subdirs, dir_found, dir_skipped = future.result()
+            found.extend(dir_found)
+            skipped.extend(dir_skipped)
+            pending.update(executor.submit(scan_directory, d) for d in subdirs)
+
+    return sorted(found), sorted(skipped)
+
+
+def remove_item(path):
+    """Remove a cache directory or file; returns an error message or None."""
+    try:
+        if os.path.basename(path) == CACHE_DIR_NAME:
+            shutil.rmtree(path)
+        else:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        return str(e)
+    return None
 
-def clean_python_files(root_path, pattern, file_type):
-    """Clean Python files matching a pattern and return count."""
-    count = 0
-    print(f"\nRemoving {file_type} files:")
-
-    for file_path in root_path.rglob(pattern):
-        if should_skip_path(file_path):
-            print(f"  ⏭️  Skipped (excluded): {file_path}")
-            continue
-
-        try:
-            file_path.unlink(missing_ok=True)
-            print(f"  ✅ Removed: {file_path}")
-            count += 1
-        except Exception as e:
-            print(f"  ❌ Failed to remove {file_path}: {e}")
 
-    return count
+def item_kind(path):
+    """Classify a found item as __pycache__, .pyc or .pyo."""
+    if os.path.basename(path) == CACHE_DIR_NAME:
+        return CACHE_DIR_NAME
+    return os.path.splitext(path)[1]
 
 
-def print_summary(pycache_count, pyc_count, pyo_count):
+def print_summary(counts, skipped_count, failed_count, timings, dry_run):
     """Print cleanup summary."""
-    total = pycache_count + pyc_count + pyo_count
+    verb = "found" if dry_run else "removed"
+    total = sum(counts.values())
 
-    print("\n�� Python cache cleanup completed!")
+    print("\n🎉 Python cache cleanup completed!" + (" (dry run)" if dry_run else ""))
     print("Summary:")
-    print(f"  📁 __pycache__ directories removed: {pycache_count}")
-    print(f"  🐍 .pyc files removed: {pyc_count}")
-    print(f"  ⚡ .pyo files removed: {pyo_count}")
-    print(f"  📦 Total items cleaned: {total}")
-
-
-def clean_python_caches():
+    print(f"  📁 __pycache__ directories {verb}: {counts[CACHE_DIR_NAME]}")
+    print(f"  🐍 .pyc files {verb}: {counts['.pyc']}")
+    print(f"  ⚡ .pyo files {verb}: {counts['.pyo']}")
+    print(f"  📦 Total items {verb}: {total}")
+    print(f"  ⏭️  Excluded directories skipped: {skipped_count}")
+    if failed_count:
+        print(f"  ❌ Failed removals: {failed_count}")
+    print(
+        f"  ⏱️  Elapsed: {timings['total']:.3f}s "
+        f"(scan {timings['scan']:.3f}s, delete {timings['delete']:.3f}s)"
+    )
+
+
+def clean_python_caches(root=".", dry_run=False, quiet=False, workers=None):
     """Clean Python cache files and directories safely."""
-    root_path = Path(".")
+    root_path = os.path.abspath(root)
+    workers = workers or DEFAULT_WORKERS
+    started = time.perf_counter()
 
     print("🧹 Starting Python cache cleanup...")
-    print(f"Scanning from: {root_path.resolve()}")
-    print()
-
-    # Clean different types of cache files
-    pycache_count = clean_pycache_directories(root_path)
-    pyc_count = clean_python_files(root_path, "*.pyc", ".pyc")
-    pyo_count = clean_python_files(root_path, "*.pyo", ".pyo")
-
-    print_summary(pycache_count, pyc_count, pyo_count)
+    print(f"Scanning from: {root_path}")
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        found, skipped = find_cache_items(root_path, executor)
+        scanned = time.perf_counter()
+
+        if not quiet:
+            for path in skipped:
+                print(f"  ⏭️  Skipped (excluded): {path}")
+
+        if dry_run:
+            errors = [None] * len(found)
+        else:
+            errors = list(executor.map(remove_item, found))
+        deleted = time.perf_counter()
+
+    counts = {CACHE_DIR_NAME: 0, ".pyc": 0, ".pyo": 0}
+    failed_count = 0
+    for path, error in zip(found, errors, strict=True):
+        if error:
+            failed_count += 1
+            print(f"  ❌ Failed to remove {path}: {error}")
+            continue
+        counts[item_kind(path)] += 1
+        if not quiet:
+            action = "Would remove" if dry_run else "Removed"
+            print(f"  ✅ {action}: {path}")
+
+    timings = {
+        "scan": scanned - started,
+        "delete": deleted - scanned,
+        "total": time.perf_counter() - started,
+    }
+    print_summary(counts, len(skipped), failed_count, timings, dry_run)
+    return counts
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Remove Python cache files.")
+    parser.add_argument("root", nargs="?", default=".", help="directory to clean")
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only report what would be removed"
+    )
+    parser.add_argument(
+        "--quiet", action="store_true", help="print the summary report only"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"threads for scanning and deleting (default: {DEFAULT_WORKERS})",
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
+    args = parse_args()
     try:
-        clean_python_caches()
+        clean_python_caches(args.root, args.dry_run, args.quiet, args.workers)
     except KeyboardInterrupt:
         print("\n❌ Cleanup interrupted by user")
         sys.exit(1)
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+"""
+Traffic Replay Load Tester
+
+Replays recorded nginx access logs against a running instance, keeping the
+real route mix: project pages, contact POSTs, scanner 404s and static files.
+Logs are read in the nginx "combined" format that infra/nginx/default.conf
+writes (extra trailing fields are ignored); plain, gzipped or stdin.
+
+Requests are sent at their recorded offsets divided by --speed (0 sends as
+fast as possible) by --concurrency asyncio workers, each holding one
+keep-alive HTTP/1.1 connection. The report gives throughput, latency
+percentiles and error rates per route; --save writes it as JSON and
+--compare prints the change against a saved run.
+
+POST bodies are not in access logs, so POSTs are replayed with an empty
+form body and exercise validation rather than successful submissions.
+
+Usage:
+    python scripts/replay-traffic.py access.log [more.log.gz ...] \\
+        [--target http://127.0.0.1:5000] [--speed 10] [--concurrency 16] \\
+        [--save run.json] [--compare baseline.json]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import gzip
+import json
+import re
+import ssl
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from urllib.parse import urlsplit
+
+# $remote_addr - $remote_user [$time_local] "$request" $status
+# $body_bytes_sent "$http_referer" "$http_user_agent"
+LOG_LINE = re.compile(
+    r'(?P<addr>\S+) \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<request>[^"]*)" '
+    r'(?P<status>\d{3}) \S+ "(?P<referer>[^"]*)" "(?P<agent>[^"]*)"'
+)
+
+# Path segments that are ids, collapsed so routes aggregate
+ID_SEGMENT = re.compile(r"^(\d+|[0-9a-f]{8,}|[0-9a-f-]{36})$", re.IGNORECASE)
+
+# A status of 0 marks a request that got no response (connection error, timeout)
+NO_RESPONSE = 0
+
+# Routes with fewer requests are left out of the regression check
+MIN_COMPARE_COUNT = 20
+
+
+@dataclass
+class LogEntry:
+    """One replayable request from an access log."""
+
+    offset: float
+    method: str
+    target: str
+    user_agent: str
+    referer: str
+    recorded_status: int
+
+
+@dataclass
+class Result:
+    """Outcome of one replayed request."""
+
+    route: str
+    status: int
+    latency: float
+    lag: float
+
+
+def read_lines(paths):
+    """Lines of the given log files; ``-`` reads stdin."""
+    for path in paths:
+        if path == "-":
+            yield from sys.stdin
+        elif path.endswith(".gz"):
+            with gzip.open(path, "rt", errors="replace") as f:
+                yield from f
+        else:
+            with open(path, errors="replace") as f:
+                yield from f
+
+
+def parse_log(lines, methods, skip_static=False, limit=None):
+    """Parse access log lines into entries with offsets from the earliest."""
+    entries, skipped = [], 0
+    for line in lines:
+        match = LOG_LINE.match(line)
+        parts = match.group("request").split() if match else []
+        # Scanners send garbage request lines (TLS handshakes, bare paths)
+        if len(parts) != 3 or not parts[1].startswith("/"):
+            skipped += 1
+            continue
+        method, target, _ = parts
+        if method not in methods or (skip_static and target.startswith("/static/")):
+            skipped += 1
+            continue
+        try:
+            timestamp = datetime.strptime(match.group("time"), "%d/%b/%Y:%H:%M:%S %z")
+        except ValueError:
+            skipped += 1
+            continue
+        entries.append(
+            LogEntry(
+                offset=timestamp.timestamp(),
+                method=method,
+                target=target,
+                user_agent=match.group("agent"),
+                referer=match.group("referer"),
+                recorded_status=int(match.group("status")),
+            )
+        )
+        if limit and len(entries) >= limit:
+            break
+    # Log lines are written when requests finish, so they can be out of order
+    entries.sort(key=lambda entry: entry.offset)
+    start = entries[0].offset if entries else 0.0
+    for entry in entries:
+        entry.offset -= start
+    return entries, skipped
+
+
+def route_key(method, target, status):
+    """Aggregate key for a request: method and normalized path."""
+    path = target.split("?", 1)[0]
+    if status == 404:
+        return f"{method} (not found)"
+    if path.startswith("/static/"):
+        return f"{method} /static/*"
+    segments = [":id" if ID_SEGMENT.match(s) else s for s in path.split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+class HTTPConnection:
+    """A keep-alive HTTP/1.1 connection on asyncio streams."""
+
+    def __init__(self, host, port, use_ssl, host_header):
+        """Connect lazily to ``host:port``."""
+        self.host = host
+        self.port = port
+        self.ssl = ssl.create_default_context() if use_ssl else None
+        self.host_header = host_header
+        self.reader = None
+        self.writer = None
+
+    async def request(self, entry):
+        """Send one request and read the full response; returns the status."""
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port, ssl=self.ssl
+            )
+        headers = [
+            f"{entry.method} {entry.target} HTTP/1.1",
+            f"Host: {self.host_header}",
+            f"User-Agent: {entry.user_agent}",
+            "Accept: */*",
+        ]
+        if entry.referer and entry.referer != "-":
+            headers.append(f"Referer: {entry.referer}")
+        if entry.method == "POST":
+            headers.append("Content-Type: application/x-www-form-urlencoded")
+            headers.append("Content-Length: 0")
+        self.writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1"))
+        await self.writer.drain()
+        return await self._read_response(entry.method)
+
+    async def _read_response(self, method):
+        """Read status, headers and body; close if the server won't keep alive."""
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionError("connection closed by server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while (line := await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            await self._read_chunked()
+        elif "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            await self.reader.read()
+            await self.close()
+            return status
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+    async def _read_chunked(self):
+        """Consume a chunked body including trailers."""
+        while True:
+            size = int((await self.reader.readline()).split(b";")[0], 16)
+            if size == 0:
+                while (await self.reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return
+            await self.reader.readexactly(size + 2)
+
+    async def close(self):
+        """Drop the connection; the next request reconnects."""
+        if self.writer is not None:
+            self.writer.close()
+            with contextlib.suppress(OSError):
+                await self.writer.wait_closed()
+        self.reader = self.writer = None
+
+
+async def replay(entries, target, speed, concurrency, timeout):
+    """Replay entries on schedule; returns results and wall-clock duration."""
+    url = urlsplit(target)
+    use_ssl = url.scheme == "https"
+    port = url.port or (443 if use_ssl else 80)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    results = []
+
+    async def worker():
+        connection = HTTPConnection(url.hostname, port, use_ssl, url.netloc)
+        while (item := await queue.get()) is not None:
+            entry, due = item
+            started = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(connection.request(entry), timeout)
+            except (TimeoutError, OSError, ValueError, IndexError):
+                # Includes IncompleteReadError; the connection state is unknown
+                status = NO_RESPONSE
+                await connection.close()
+            finished = time.perf_counter()
+            results.append(
+                Result(
+                    route=route_key(entry.method, entry.target, status),
+                    status=status,
+                    latency=finished - started,
+                    lag=max(started - due, 0.0),
+                )
+            )
+        await connection.close()
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    begin = time.perf_counter()
+    for entry in entries:
+        due = begin + (entry.offset / speed if speed > 0 else 0)
+        if (delay := due - time.perf_counter()) > 0:
+            await asyncio.sleep(delay)
+        await queue.put((entry, due))
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+    return results, time.perf_counter() - begin
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def summarize(results, duration, args):
+    """Aggregate results into the report dictionary."""
+    by_route = defaultdict(list)
+    for result in results:
+        by_route[result.route].append(result)
+
+    def stats(group):
+        latencies = sorted(result.latency for result in group)
+        errors = sum(1 for r in group if r.status == NO_RESPONSE or r.status >= 500)
+        statuses = defaultdict(int)
+        for result in group:
+            statuses[str(result.status)] += 1
+        return {
+            "count": len(group),
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "max": latencies[-1] if latencies else 0.0,
+            "errors": errors,
+            "error_rate": errors / len(group) if group else 0.0,
+            "statuses": dict(sorted(statuses.items())),
+        }
+
+    lags = sorted(result.lag for result in results)
+    return {
+        "target": args.target,
+        "speed": args.speed,
+        "concurrency": args.concurrency,
+        "duration": duration,
+        "throughput": len(results) / duration if duration else 0.0,
+        "schedule_lag_p99": percentile(lags, 0.99),
+        "total": stats(results),
+        "routes": {
+            route: stats(group)
+            for route, group in sorted(
+                by_route.items(), key=lambda item: len(item[1]), reverse=True
+            )
+        },
+    }
+
+
+def ms(seconds):
+    """Seconds formatted as milliseconds."""
+    return f"{seconds * 1000:8.1f}"
+
+
+def print_report(report, top):
+    """Print throughput and the per-route table."""
+    total = report["total"]
+    print(f"\n📊 Replayed {total['count']} requests in {report['duration']:.1f}s")
+    print(f"  🚀 Throughput: {report['throughput']:.1f} req/s")
+    print(f"  ❌ Errors (5xx or no response): {total['error_rate']:.2%}")
+    print(f"  ⏱️  Schedule lag p99: {report['schedule_lag_p99'] * 1000:.1f} ms")
+    if report["speed"] > 0 and report["schedule_lag_p99"] > 1:
+        print("  ⚠️  Requests started late: lower --speed or raise --concurrency")
+    print(
+        f"\n{'route':<40} {'count':>7} {'p50 ms':>8} {'p90 ms':>8} "
+        f"{'p99 ms':>8} {'errors':>7}"
+    )
+    for route, stats in list(report["routes"].items())[:top]:
+        print(
+            f"{route[:40]:<40} {stats['count']:>7} {ms(stats['p50'])} "
+            f"{ms(stats['p90'])} {ms(stats['p99'])} {stats['error_rate']:>7.1%}"
+        )
+
+
+def change(new, old):
+    """Relative change as a signed percentage string."""
+    if not old:
+        return "     n/a"
+    return f"{(new - old) / old:+8.1%}"
+
+
+def compare(report, baseline, top, max_regression=None):
+    """Print the change against a saved run; returns regressed routes."""
+    print(f"\n🔁 Compared with {baseline['target']} ({baseline['total']['count']} req)")
+    print(
+        f"  🚀 Throughput: {baseline['throughput']:.1f} → "
+        f"{report['throughput']:.1f} req/s "
+        f"({change(report['throughput'], baseline['throughput']).strip()})"
+    )
+    print(f"\n{'route':<40} {'Δ p50':>8} {'Δ p99':>8} {'errors':>15}")
+    regressed = []
+    for route, stats in list(report["routes"].items())[:top]:
+        old = baseline["routes"].get(route)
+        if old is None:
+            print(f"{route[:40]:<40} {'new':>8}")
+            continue
+        print(
+            f"{route[:40]:<40} {change(stats['p50'], old['p50'])} "
+            f"{change(stats['p99'], old['p99'])} "
+            f"{old['error_rate']:>6.1%} → {stats['error_rate']:>6.1%}"
+        )
+        if (
+            max_regression is not None
+            and min(stats["count"], old["count"]) >= MIN_COMPARE_COUNT
+            and old["p99"]
+            and (stats["p99"] - old["p99"]) / old["p99"] > max_regression / 100
+        ):
+            regressed.append(route)
+    return regressed
+
+
+def parse_args(argv=None):
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Replay nginx access logs.")
+    parser.add_argument("logs", nargs="+", help="access log files (.gz or - too)")
+    parser.add_argument(
+        "--target",
+        default="http://127.0.0.1:5000",
+        help="base URL of the instance (default: http://127.0.0.1:5000)",
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="speed-up over recorded timing; 0 sends as fast as possible",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=16, help="connections (default: 16)"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=10.0, help="per-request timeout in seconds"
+    )
+    parser.add_argument(
+        "--methods",
+        default="GET,HEAD,POST",
+        help="comma-separated methods to replay (default: GET,HEAD,POST)",
+    )
+    parser.add_argument(
+        "--skip-static",
+        action="store_true",
+        help="skip /static/ (served by nginx in production)",
+    )
+    parser.add_argument("--limit", type=int, help="replay at most this many requests")
+    parser.add_argument("--top", type=int, default=25, help="routes to print")
+    parser.add_argument("--save", help="write the report as JSON to this file")
+    parser.add_argument("--compare", help="saved report to compare against")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        help="exit 1 if a route's p99 grows by more than this percentage",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Parse, replay, report; returns the exit code."""
+    args = parse_args(argv)
+    methods = {method.strip().upper() for method in args.methods.split(",")}
+    entries, skipped = parse_log(
+        read_lines(args.logs), methods, args.skip_static, args.limit
+    )
+    if not entries:
+        print("❌ No replayable requests found")
+        return 1
+    span = entries[-1].offset
+    print(f"📜 {len(entries)} requests over {span:.0f}s recorded ({skipped} skipped)")
+    pace = f"{args.speed:g}x speed" if args.speed > 0 else "full speed"
+    print(f"🎯 Replaying against {args.target} at {pace}")
+
+    results, duration = asyncio.run(
+        replay(entries, args.target, args.speed, args.concurrency, args.timeout)
+    )
+    report = summarize(results, duration, args)
+    print_report(report, args.top)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n💾 Saved report to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressed = compare(report, baseline, args.top, args.max_regression)
+        if regressed:
+            print(f"\n❌ p99 regressed beyond {args.max_regression:g}%:")
+            for route in regressed:
+                print(f"  - {route}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except KeyboardInterrupt:
+        print("\n❌ Replay interrupted by user")
+        sys.exit(1)
@@ -7,6 +7,18 @@ import pytest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
+@pytest.fixture(autouse=True, scope="session")
+def instance_files(tmp_path_factory):
+    """Keep the files apps write to their instance folder out of the source tree."""
+    from config.base import Config
+
+    directory = tmp_path_factory.mktemp("instance")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(Config, "CACHE_BUS_PATH", str(directory / "cache-generations"))
+        mp.setattr(Config, "CONTENT_SNAPSHOT_PATH", str(directory / "content.segment"))
+        yield directory
+
+
 @pytest.fixture
 def app():
     """Create and configure a new app instance for each test."""
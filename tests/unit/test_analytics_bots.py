@@ -0,0 +1,66 @@
+"""Unit tests for crawler classification and the bot page cache."""
+
+from app import create_app
+from app.analytics.bots import classify_user_agent
+from app.core import utils
+from app.core.metrics import metrics
+
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+FIREFOX = "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0"
+
+
+class TestBots:
+    """Test user agent classification and bot request handling."""
+
+    def test_classifies_user_agents(self):
+        """Known crawlers get a category, browsers get None."""
+        assert classify_user_agent(GOOGLEBOT) == "search"
+        assert classify_user_agent("UptimeRobot/2.0") == "monitor"
+        assert classify_user_agent("curl/8.5.0") == "tool"
+        assert classify_user_agent("SomeNewBot/1.0") == "crawler"
+        assert classify_user_agent("") is None
+        assert classify_user_agent(FIREFOX) is None
+
+    def test_bots_skip_analytics_and_get_cached_pages(self, monkeypatch):
+        """Bot page views are not tracked and repeat views hit the cache."""
+        events = []
+        monkeypatch.setattr(
+            utils, "track_event", lambda name, metadata=None: events.append(name)
+        )
+        client = create_app("testing").test_client()
+        hits = metrics.value("bot_page_cache_total", result="hit")
+
+        first = client.get("/about", headers={"User-Agent": GOOGLEBOT})
+        second = client.get("/about", headers={"User-Agent": GOOGLEBOT})
+        client.get("/about", headers={"User-Agent": FIREFOX}, buffered=True)
+
+        assert events == ["Viewed About Page"]
+        assert second.data == first.data
+        assert "private" in second.headers["Cache-Control"]
+        assert "User-Agent" not in second.headers.get("Vary", "")
+        assert metrics.value("bot_page_cache_total", result="hit") == hits + 1
+
+    def test_empty_user_agent_is_a_visitor(self, monkeypatch):
+        """Requests without a user agent are tracked and rendered normally."""
+        events = []
+        monkeypatch.setattr(
+            utils, "track_event", lambda name, metadata=None: events.append(name)
+        )
+        client = create_app("testing").test_client()
+
+        response = client.get("/about", headers={"User-Agent": ""}, buffered=True)
+        assert response.status_code == 200
+        assert events == ["Viewed About Page"]
+        assert "private" not in response.headers.get("Cache-Control", "")
+
+    def test_metrics_endpoint(self):
+        """Counters are exposed in the Prometheus text format."""
+        app = create_app("testing")
+        app.config["ADMIN_TOKEN"] = "secret"  # noqa: S105
+        client = app.test_client()
+        client.get("/about", headers={"User-Agent": "UptimeRobot/2.0"})
+
+        assert client.get("/metrics").status_code == 404
+        response = client.get("/metrics", headers={"Authorization": "Bearer secret"})
+        assert 'bot_requests_total{category="monitor"}' in response.text
+        assert response.headers["Cache-Control"] == "private, no-store"
@@ -0,0 +1,78 @@
+"""Unit tests for merged per-request analytics events."""
+
+import time
+
+from app import create_app
+from app.core import utils
+from config.testing import TestingConfig
+
+
+class TestRouteEvents:
+    """Test that each tracked request sends one enriched event."""
+
+    def _capture(self, monkeypatch):
+        """Record track_event calls instead of sending them."""
+        events = []
+        monkeypatch.setattr(
+            utils,
+            "track_event",
+            lambda name, metadata=None: events.append((name, metadata)),
+        )
+        return events
+
+    def test_view_properties_merge_into_one_event(self, monkeypatch):
+        """View annotations, status and latency travel in one event."""
+        events = self._capture(monkeypatch)
+        create_app("testing").test_client().get("/projects/", buffered=True)
+
+        assert len(events) == 1
+        name, properties = events[0]
+        assert name == "Viewed Projects Page"
+        assert properties["route"] == "projects.index"
+        assert properties["status"] == 200
+        assert properties["project_count"] >= 0
+        assert properties["latency_ms"] >= 0
+
+    def test_not_found_project_keeps_status(self, monkeypatch):
+        """Aborted views still send their event with the error status."""
+        events = self._capture(monkeypatch)
+        create_app("testing").test_client().get("/projects/999999", buffered=True)
+
+        assert [(name, props["status"]) for name, props in events] == [
+            ("Viewed Project Detail", 404)
+        ]
+        assert events[0][1]["project_id"] == 999999
+
+    def test_streamed_pages_are_timed_to_the_last_chunk(self, monkeypatch):
+        """The event waits for the response to close, after the body renders."""
+        events = self._capture(monkeypatch)
+        app = create_app("testing")
+        app.config["STREAM_TEMPLATES"] = True
+        response = app.test_client().get("/about", buffered=False)
+        assert events == []
+
+        started = time.perf_counter()
+        b"".join(response.response)
+        time.sleep(0.05)
+        response.close()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        assert [name for name, _props in events] == ["Viewed About Page"]
+        assert events[0][1]["latency_ms"] >= elapsed_ms
+
+    def test_client_address_comes_from_the_proxy(self, monkeypatch):
+        """Behind nginx, the forwarded address identifies the visitor."""
+        monkeypatch.setattr(TestingConfig, "PROXY_FIX_X_FOR", 1)
+        events = self._capture(monkeypatch)
+        create_app("testing").test_client().get(
+            "/about", headers={"X-Forwarded-For": "203.0.113.7"}, buffered=True
+        )
+
+        assert events[0][1]["remote_addr"] == "203.0.113.7"
+
+    def test_untracked_routes_send_nothing(self, monkeypatch):
+        """Routes without the decorator do not emit events."""
+        events = self._capture(monkeypatch)
+        create_app("testing").test_client().get("/health", buffered=True)
+
+        assert events == []
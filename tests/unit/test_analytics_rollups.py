@@ -0,0 +1,112 @@
+"""Unit tests for analytics sketches, rollups and the dashboard."""
+
+import time
+
+from app import create_app
+from app.analytics.rollups import Rollups, RollupStore
+from app.analytics.sketches import HyperLogLog, TopK
+
+
+class TestSketches:
+    """Test the mergeable sketches behind the rollups."""
+
+    def test_hyperloglog_estimates_and_merges(self):
+        """Unions of sketches estimate the distinct count of the union."""
+        first, second = HyperLogLog(), HyperLogLog()
+        for i in range(6000):
+            first.add(f"visitor-{i}")
+        for i in range(4000, 10000):
+            second.add(f"visitor-{i}")
+
+        first.merge(HyperLogLog.from_dict(second.to_dict()))
+        assert abs(first.count() - 10000) < 500
+
+    def test_topk_keeps_heavy_hitters(self):
+        """The most frequent items survive merging."""
+        first, second = TopK(k=3), TopK(k=3)
+        for i in range(50):
+            first.add("github.com")
+            second.add(f"rare-{i}.example")
+        for _ in range(20):
+            second.add("news.ycombinator.com")
+
+        first.merge(second)
+        names = [name for name, _count in first.top()]
+        assert names[:2] == ["github.com", "news.ycombinator.com"]
+
+
+class TestRollups:
+    """Test bucketed counters, persistence and the dashboard route."""
+
+    def test_summary_counts_recent_events(self):
+        """Events land in the hour/day windows and ranked tables."""
+        now = 1_700_000_000.0
+        rollups = Rollups()
+        for _ in range(3):
+            rollups.record("page", "home.index", visitor="a", timestamp=now - 60)
+        rollups.record("page", "home.about", visitor="b", timestamp=now - 7200)
+
+        summary = rollups.summary(now)
+        assert summary["events_last_hour"] == 3
+        assert summary["events_last_day"] == 4
+        assert summary["top_routes"][0] == ("home.index", 3)
+        assert summary["unique_visitors_today"] == 2
+
+    def test_top_lists_cover_today_only(self):
+        """Referrers and projects are ranked per day, and old days are pruned."""
+        now = 1_700_000_000.0
+        rollups = Rollups()
+        for _ in range(5):
+            rollups.record("page", referrer="old.example", timestamp=now - 3 * 86400)
+        rollups.record("page", referrer="github.com", project="BI", timestamp=now)
+
+        summary = rollups.summary(now)
+        assert summary["top_referrers"] == [("github.com", 1)]
+        assert summary["top_projects"] == [("BI", 1)]
+
+        rollups.prune(now)
+        assert len(Rollups.from_dict(rollups.to_dict()).referrers) == 1
+
+    def test_store_saves_in_the_background(self, tmp_path):
+        """Recording never writes the file; the save thread does."""
+        path = tmp_path / "rollups.json"
+        store = RollupStore(str(path), save_interval=0.05)
+        store.record("page", route="home.index")
+        assert not path.exists()
+
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert RollupStore(str(path)).snapshot().summary()["events_last_hour"] == 1
+
+    def test_store_merges_worker_deltas(self, tmp_path):
+        """Saved deltas add up in the shared file."""
+        path = str(tmp_path / "rollups.json")
+        first = RollupStore(path, save_interval=3600)
+        second = RollupStore(path, save_interval=3600)
+        first.record("page", route="home.index")
+        second.record("page", route="home.index")
+        first.save()
+
+        assert second.snapshot().summary()["events_last_hour"] == 2
+        second.save()
+        assert RollupStore(path).snapshot().summary()["events_last_hour"] == 2
+
+    def test_dashboard_requires_admin_token(self, tmp_path):
+        """The dashboard is hidden without the admin token."""
+        app = create_app("testing")
+        app.config.update(
+            ADMIN_TOKEN="secret",  # noqa: S106
+            ANALYTICS_SINK="local",
+            ANALYTICS_STORE_DIR=str(tmp_path),
+        )
+        from app.analytics import register_analytics
+
+        register_analytics(app)
+        client = app.test_client()
+        client.get("/about", buffered=True)
+
+        assert client.get("/analytics/").status_code == 404
+        response = client.get("/analytics/", headers={"Authorization": "Bearer secret"})
+        assert response.status_code == 200
+        assert b"Top routes" in response.data
@@ -0,0 +1,70 @@
+"""Unit tests for the local columnar event store."""
+
+import gc
+import os
+import weakref
+
+from app import create_app
+from app.analytics.store import EventStore
+
+
+class TestEventStore:
+    """Test appends, segment rotation and memory-mapped scans."""
+
+    def test_counts_by_event_and_route(self, tmp_path):
+        """Events are dictionary-encoded and counted per column."""
+        store = EventStore(str(tmp_path), flush_rows=2)
+        for _ in range(3):
+            store.append("Viewed Homepage", "home.index")
+        store.append("Viewed Projects Page", "projects.index")
+
+        assert store.count_by("ev") == {"Viewed Homepage": 3, "Viewed Projects Page": 1}
+        assert store.count_by("rt")["home.index"] == 3
+
+    def test_segments_rotate_and_time_range_scans(self, tmp_path):
+        """Full segments rotate; time ranges are found by binary search."""
+        store = EventStore(str(tmp_path), segment_rows=4, flush_rows=1)
+        for second in range(10):
+            store.append("page", "home.index", timestamp=1000.0 + second)
+
+        assert len(store.segments()) == 3
+        assert store.total() == 10
+        assert store.total(since=1002.0, until=1007.0) == 5
+
+    def test_stores_sharing_a_pid_keep_separate_segments(self, tmp_path):
+        """A reused PID never writes into an earlier writer's segment."""
+        first = EventStore(str(tmp_path), flush_rows=1)
+        first.append("Viewed Homepage", "home.index")
+        second = EventStore(str(tmp_path), flush_rows=1)
+        second.append("Viewed Projects Page", "projects.index")
+        second.append("Viewed Homepage", "home.index")
+
+        assert len(first.segments()) == 2
+        assert first.count_by("ev") == {"Viewed Homepage": 2, "Viewed Projects Page": 1}
+
+    def test_zero_timestamp_is_kept(self, tmp_path):
+        """An explicit timestamp of 0.0 is not replaced by the current time."""
+        store = EventStore(str(tmp_path), flush_rows=1)
+        store.append("page", "home.index", timestamp=0.0)
+
+        assert store.total(until=1.0) == 1
+
+    def test_discarded_stores_are_released(self, tmp_path):
+        """The exit hook does not keep stores of discarded apps alive."""
+        store = weakref.ref(EventStore(str(tmp_path)))
+        gc.collect()
+
+        assert store() is None
+
+    def test_local_sink_records_requests(self, tmp_path):
+        """With ANALYTICS_SINK=local, page views land in the store."""
+        app = create_app("testing")
+        app.config.update(ANALYTICS_SINK="local", ANALYTICS_STORE_DIR=str(tmp_path))
+        from app.analytics import register_analytics
+
+        register_analytics(app)
+        app.test_client().get("/about", buffered=True)
+
+        counts = app.extensions["event_store"].count_by("rt")
+        assert counts["home.about"] >= 1
+        assert os.listdir(tmp_path)
@@ -0,0 +1,108 @@
+"""Unit tests for queue-time admission control and load shedding."""
+
+import time
+
+from app import create_app
+from app.core.admission import (
+    LEVEL_DEGRADED,
+    LEVEL_OK,
+    LEVEL_OVERLOADED,
+    AdmissionControl,
+    parse_request_start,
+)
+
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+
+
+def queued_for(seconds: float) -> dict:
+    """An X-Request-Start header for a request queued ``seconds`` ago."""
+    return {"X-Request-Start": f"t={time.time() - seconds:.3f}"}
+
+
+class TestAdmissionControl:
+    """Test queue-time parsing, load levels and what gets shed."""
+
+    def test_parse_request_start_units(self):
+        """Seconds, milliseconds and microseconds stamps all parse."""
+        now = 1_700_000_010.0
+        assert parse_request_start("t=1700000000.000", now) == 10.0
+        assert parse_request_start("1700000000000", now) == 10.0
+        assert parse_request_start("t=1700000000000000", now) == 10.0
+        assert parse_request_start("t=1700000020", now) == 0.0
+        assert parse_request_start("garbage", now) is None
+        assert parse_request_start("t=100", now) is None
+
+    def test_fresh_requests_are_served(self):
+        """Requests that did not queue are served normally."""
+        client = create_app("testing").test_client()
+
+        assert client.get("/about", headers=queued_for(0.01)).status_code == 200
+
+    def test_late_requests_get_fast_503(self):
+        """A request that queued past the reject threshold is not rendered."""
+        client = create_app("testing").test_client()
+        response = client.get("/about", headers=queued_for(5))
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        assert response.headers["Cache-Control"] == "no-store"
+
+    def test_probes_and_static_are_never_shed(self):
+        """Health probes and static files ignore the load level."""
+        client = create_app("testing").test_client()
+
+        assert client.get("/health", headers=queued_for(5)).status_code == 200
+        assert client.get("/livez", headers=queued_for(5)).status_code == 200
+        static = client.get("/static/version.json", headers=queued_for(5))
+        assert static.status_code != 503
+
+    def test_degraded_sheds_low_priority_and_skips_analytics(self, monkeypatch):
+        """Degraded: admin pages and uncached bot renders go, analytics stops."""
+        events = []
+        monkeypatch.setattr(
+            "app.core.utils.track_event", lambda *args, **kwargs: events.append(args)
+        )
+        client = create_app("testing").test_client()
+
+        assert client.get("/analytics", headers=queued_for(0.5)).status_code == 503
+        bot = client.get("/about", headers={**queued_for(0.5), "User-Agent": GOOGLEBOT})
+        assert bot.status_code == 503
+
+        assert client.get("/about", headers=queued_for(0.5)).status_code == 200
+        assert events == []
+
+    def test_in_flight_limit_degrades(self):
+        """Too many requests in flight in the worker degrades the next ones."""
+        app = create_app("testing")
+        app.config["ADMISSION_MAX_IN_FLIGHT"] = 2
+        middleware = AdmissionControl(app.wsgi_app, app)
+
+        assert middleware.load_level(None, 2) == LEVEL_OK
+        assert middleware.load_level(None, 3) == LEVEL_DEGRADED
+        assert middleware.load_level(0.3, 1) == LEVEL_DEGRADED
+        assert middleware.load_level(2.5, 1) == LEVEL_OVERLOADED
+
+    def test_in_flight_limit_follows_worker_threads(self):
+        """Without a configured limit, a worker degrades once its threads are busy."""
+        app = create_app("testing")
+        middleware = AdmissionControl(app.wsgi_app, app)
+
+        middleware.set_concurrency(4)
+        assert middleware.load_level(None, 3) == LEVEL_OK
+        assert middleware.load_level(None, 4) == LEVEL_DEGRADED
+
+        # A sync worker only ever has its own request in flight
+        middleware.set_concurrency(1)
+        assert middleware.load_level(None, 1) == LEVEL_OK
+
+    def test_in_flight_released_after_response(self):
+        """A request stays in flight until the server closes its response."""
+        app = create_app("testing")
+        middleware = app.wsgi_app
+        while not isinstance(middleware, AdmissionControl):
+            middleware = middleware.wsgi_app
+
+        response = app.test_client().get("/about")
+        assert middleware.in_flight == 1
+        response.close()
+        assert middleware.in_flight == 0
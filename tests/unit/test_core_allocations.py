@@ -0,0 +1,99 @@
+"""Unit tests for allocation accounting and per-route allocation budgets."""
+
+import tracemalloc
+
+import pytest
+
+from app import create_app
+from app.core.allocations import AllocationStats, SnapshotHistory, measure_allocations
+from config.testing import TestingConfig
+
+TOKEN = "test-admin-token"  # noqa: S105
+
+# Per-request allocation budgets in bytes: (peak, retained). Peaks are a few
+# times today's measurements; retained memory beyond a few KB per request
+# is a leak.
+ROUTE_BUDGETS = {
+    "/": (600_000, 64_000),
+    "/about": (500_000, 64_000),
+    "/services": (250_000, 64_000),
+    "/contact": (250_000, 64_000),
+    "/projects/": (400_000, 64_000),
+    "/blog/": (250_000, 64_000),
+    "/health": (50_000, 16_000),
+}
+
+
+class TestAllocations:
+    """Test the per-endpoint statistics, snapshot diffs and route budgets."""
+
+    @pytest.mark.parametrize("path", sorted(ROUTE_BUDGETS))
+    def test_route_allocation_budget(self, path):
+        """Each page stays within its peak and retained allocation budget."""
+        client = create_app("testing").test_client()
+        measured = measure_allocations(client, path)
+        peak_budget, retained_budget = ROUTE_BUDGETS[path]
+
+        assert measured["peak"] <= peak_budget, measured
+        assert measured["retained"] <= retained_budget, measured
+
+    def test_stats_summary(self):
+        """Averages are computed per endpoint, heaviest first."""
+        stats = AllocationStats()
+        stats.record("home.index", peak=1000, retained=10, blocks=2)
+        stats.record("home.index", peak=3000, retained=30, blocks=4)
+        stats.record("home.health", peak=100, retained=0, blocks=0)
+
+        rows = stats.summary()
+        assert rows[0]["endpoint"] == "home.index"
+        assert rows[0]["avg_peak_bytes"] == 2000
+        assert rows[0]["max_peak_bytes"] == 3000
+        assert rows[0]["avg_blocks"] == 3
+
+    def test_snapshot_diff_finds_growth(self):
+        """Memory allocated between snapshots shows up as growth."""
+        tracemalloc.start()
+        try:
+            history = SnapshotHistory(interval=60)
+            history.take()
+            leaked = [bytearray(1024) for _ in range(200)]
+            history.take()
+            growth = history.diff(against="previous")
+        finally:
+            tracemalloc.stop()
+
+        assert leaked
+        assert growth[0]["size_diff"] >= 200 * 1024
+        assert "test_core_allocations.py" in growth[0]["site"][0]
+
+    def test_admin_memory_endpoint(self, monkeypatch):
+        """The admin endpoint reports endpoints and growth when tracing is on."""
+        monkeypatch.setattr(TestingConfig, "MEMORY_TRACING", True, raising=False)
+        monkeypatch.setattr(TestingConfig, "ADMIN_TOKEN", TOKEN, raising=False)
+        app = create_app("testing")
+        client = app.test_client()
+        auth = {"Authorization": f"Bearer {TOKEN}"}
+        try:
+            client.get("/about")
+            report = client.get("/admin/memory", headers=auth).get_json()
+            assert report["endpoints"][0]["endpoint"] == "home.about"
+            by_file = client.get("/admin/memory?key=filename", headers=auth)
+            assert by_file.status_code == 200
+            invalid = client.get("/admin/memory?key=bogus", headers=auth)
+            assert invalid.status_code == 400
+
+            snapshot = client.post("/admin/memory/snapshot", headers=auth)
+            assert snapshot.status_code == 200
+            assert isinstance(snapshot.get_json()["growth"], list)
+        finally:
+            tracemalloc.stop()
+
+    def test_admin_memory_disabled(self, monkeypatch):
+        """Without MEMORY_TRACING the endpoint says so."""
+        monkeypatch.setattr(TestingConfig, "ADMIN_TOKEN", TOKEN, raising=False)
+        client = create_app("testing").test_client()
+        response = client.get(
+            "/admin/memory", headers={"Authorization": f"Bearer {TOKEN}"}
+        )
+
+        assert response.status_code == 404
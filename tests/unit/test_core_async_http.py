@@ -0,0 +1,211 @@
+"""Unit tests for async views, the pooled async client and the ASGI adapter."""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import create_app
+from app.core import async_http
+from app.core.asgi import ASGIAdapter
+from app.core.async_http import gather_calls
+from app.core.resilience import reset_breakers
+from app.utils.api.github import parse_repository_url
+from app.utils.api.openai import AsyncOpenAIClient
+
+UPSTREAM_DELAY = 0.4
+
+
+class SlowUpstream(BaseHTTPRequestHandler):
+    """GitHub and OpenAI stand-in answering every call after a delay."""
+
+    protocol_version = "HTTP/1.1"
+    connections: set = set()
+
+    def do_GET(self):
+        """Repository payloads."""
+        if self.path.endswith("/languages"):
+            self.reply({"Python": 1200})
+        else:
+            self.reply({"stargazers_count": 42, "language": "Python"})
+
+    def do_POST(self):
+        """Chat completions."""
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.reply({"choices": [{"message": {"content": " Generated. "}}]})
+
+    def reply(self, payload):
+        """Send ``payload`` as JSON after the delay."""
+        type(self).connections.add(self.client_address)
+        time.sleep(UPSTREAM_DELAY)
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep test output quiet."""
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    """Base URL of the slow upstream, with the API clients pointed at it."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowUpstream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    SlowUpstream.connections = set()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    monkeypatch.setattr("app.utils.api.github.BASE_URL", base_url)
+    monkeypatch.setattr("app.utils.api.openai.BASE_URL", base_url)
+    reset_breakers()
+    yield base_url
+    server.shutdown()
+    reset_breakers()
+
+
+async def asgi_get(asgi_app, path: str) -> tuple[int, bytes]:
+    """Run one GET through an ASGI app."""
+    messages = [{"type": "http.request", "body": b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "path": path,
+        "query_string": b"",
+        "headers": [(b"host", b"localhost")],
+    }
+    await asgi_app(scope, receive, send)
+    body = b"".join(m.get("body", b"") for m in sent[1:])
+    return sent[0]["status"], body
+
+
+class TestAsyncHTTP:
+    """Test concurrent upstream calls in async views and ASGI serving."""
+
+    def test_async_view_calls_upstream_concurrently(self, upstream):
+        """Stats and languages are fetched at once, not one after the other."""
+        app = create_app("testing")
+        client = app.test_client()
+
+        started = time.perf_counter()
+        response = client.get("/projects/1/repository")
+        elapsed = time.perf_counter() - started
+
+        assert response.status_code == 200
+        assert response.json["stats"]["stars"] == 42
+        assert response.json["languages"] == {"Python": 1200}
+        assert elapsed < UPSTREAM_DELAY * 1.8
+        assert response.headers["Cache-Control"] == "public, max-age=300"
+        # Under WSGI the view's loop is gone, and so is its client
+        assert len(async_http._clients) == 0
+
+    def test_projects_without_repository_404(self, upstream):
+        """Projects without a GitHub URL have no repository data."""
+        client = create_app("testing").test_client()
+        assert client.get("/projects/3/repository").status_code == 404
+
+    @pytest.mark.parametrize(
+        "url",
+        [
+            "https://github.com/kussetechstudio/bi-dashboard",
+            "https://github.com/kussetechstudio/bi-dashboard/",
+            "https://github.com/kussetechstudio/bi-dashboard.git",
+            "https://github.com/kussetechstudio/bi-dashboard/tree/main/src",
+        ],
+    )
+    def test_repository_url_forms(self, url):
+        """Trailing slashes, ``.git`` and deeper paths name the same repository."""
+        assert parse_repository_url(url) == ("kussetechstudio", "bi-dashboard")
+
+    def test_urls_without_a_repository(self):
+        """An owner alone, or no path at all, is not a repository."""
+        assert parse_repository_url("https://github.com/kussetechstudio/") is None
+        assert parse_repository_url("https://github.com") is None
+
+    def test_gather_isolates_failures(self):
+        """One raising call yields None without failing the others."""
+
+        async def ok():
+            return "ok"
+
+        async def broken():
+            raise RuntimeError("boom")
+
+        results = asyncio.run(gather_calls(a=ok(), b=broken()))
+        assert results == {"a": "ok", "b": None}
+
+    def test_gather_reraises_cancellation(self):
+        """A cancelled call cancels the gather instead of becoming a result."""
+
+        async def cancelled():
+            raise asyncio.CancelledError
+
+        async def ok():
+            return "ok"
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(gather_calls(a=ok(), b=cancelled()))
+
+    def test_partial_results_are_not_cached(self, upstream, monkeypatch):
+        """A response missing upstream data is sent with no-store."""
+
+        async def unavailable(*args):
+            return None
+
+        monkeypatch.setattr(
+            "app.utils.api.github.AsyncGitHubClient.get_repository_languages",
+            unavailable,
+        )
+        client = create_app("testing").test_client()
+        response = client.get("/projects/1/repository")
+
+        assert response.json["languages"] is None
+        assert response.headers["Cache-Control"] == "no-store"
+
+    def test_async_openai_client(self, upstream):
+        """The async OpenAI client posts chat completions via the pool."""
+        app = create_app("testing")
+
+        async def generate():
+            client = AsyncOpenAIClient("sk-test")
+            try:
+                return await client.generate_project_description("Site", ["Flask"])
+            finally:
+                await async_http.close_async_client()
+
+        with app.test_request_context():
+            assert asyncio.run(generate()) == "Generated."
+
+    def test_asgi_adapter_pools_connections(self, upstream):
+        """Under ASGI, views share the server loop's client and connections."""
+        app = create_app("testing")
+        asgi_app = ASGIAdapter(app, threads=4)
+
+        async def serve():
+            results = [await asgi_get(asgi_app, "/projects/1/repository")]
+            results += await asyncio.gather(
+                asgi_get(asgi_app, "/projects/2/repository"),
+                asgi_get(asgi_app, "/health"),
+            )
+            assert list(async_http._clients) == [asyncio.get_running_loop()]
+            await async_http.close_async_client()
+            return results
+
+        results = asyncio.run(serve())
+
+        assert [status for status, _ in results] == [200, 200, 200]
+        assert json.loads(results[1][1])["repository"] == "kussetechstudio/bi-dashboard"
+        # Keep-alive: the second view reuses the first view's two connections
+        assert len(SlowUpstream.connections) == 2
@@ -0,0 +1,55 @@
+"""Unit tests for preload Link headers."""
+
+from app import create_app
+from app.core.early_hints import build_preload_graph
+
+
+class TestPreloadLinks:
+    """Test the Vite import graph walk and Link headers."""
+
+    def test_graph_follows_imports_and_css(self):
+        """Entries, imported chunks and their CSS are all preloaded once."""
+        manifest = {
+            "main.js": {
+                "file": "js/main.js",
+                "css": ["css/main.css"],
+                "imports": ["_vendor.js"],
+                "isEntry": True,
+            },
+            "_vendor.js": {
+                "file": "js/vendor-abc.js",
+                "css": ["css/vendor.css"],
+                "imports": ["_shared.js"],
+            },
+            "_shared.js": {"file": "js/shared-def.js", "imports": ["_vendor.js"]},
+        }
+
+        assert build_preload_graph(manifest) == [
+            ("css/main.css", "style"),
+            ("js/main.js", "script"),
+            ("css/vendor.css", "style"),
+            ("js/vendor-abc.js", "modulepreload"),
+            ("js/shared-def.js", "modulepreload"),
+        ]
+
+    def test_css_entries_are_styles(self):
+        """A stylesheet entry is preloaded as a style, not a script."""
+        manifest = {
+            "main.js": {"file": "js/main.js", "isEntry": True},
+            "src/styles/main.scss": {"file": "css/main.css", "isEntry": True},
+        }
+
+        assert build_preload_graph(manifest) == [
+            ("js/main.js", "script"),
+            ("css/main.css", "style"),
+        ]
+
+    def test_html_responses_get_link_header(self):
+        """Pages carry preload links, JSON endpoints do not."""
+        client = create_app("testing").test_client()
+
+        page = client.get("/about")
+        health = client.get("/health")
+
+        assert "rel=preload; as=style" in page.headers["Link"]
+        assert "Link" not in health.headers
@@ -0,0 +1,61 @@
+"""Unit tests for pre-rendered error pages and the scanner filter."""
+
+from app import create_app
+from app.core.metrics import metrics
+from app.core.scanners import trie_pattern
+
+
+class TestErrorPages:
+    """Test that error pages are rendered once and served from memory."""
+
+    def test_404_page_is_rendered_once(self, monkeypatch):
+        """Repeated misses reuse the same rendered bytes."""
+        app = create_app("testing")
+        pages = app.extensions["error_pages"]
+        renders = []
+        render = pages.render
+        monkeypatch.setattr(
+            pages, "render", lambda name: renders.append(name) or render(name)
+        )
+        client = app.test_client()
+
+        first = client.get("/no-such-page")
+        second = client.get("/another-missing-page")
+
+        assert first.status_code == second.status_code == 404
+        assert first.data == second.data
+        assert renders == ["404"]
+
+    def test_500_page_shows_request_id(self):
+        """The request ID is filled into the cached 500 page."""
+        app = create_app("testing")
+
+        @app.route("/boom")
+        def boom():
+            raise RuntimeError("boom")
+
+        app.config["PROPAGATE_EXCEPTIONS"] = False
+        response = app.test_client().get("/boom", headers={"X-Request-ID": "req-<1>"})
+
+        assert response.status_code == 500
+        assert b"req-&lt;1&gt;" in response.data
+
+
+class TestScannerFilter:
+    """Test the WSGI short-circuit for scanner probes."""
+
+    def test_trie_pattern_shares_prefixes(self):
+        """Common prefixes are factored out of the alternation."""
+        assert trie_pattern(["/wp-admin", "/wp-login"]) == "/wp\\-(?:admin|login)"
+
+    def test_probes_are_answered_before_routing(self):
+        """Scanner paths get a bare 404; site routes are untouched."""
+        client = create_app("testing").test_client()
+        before = metrics.value("scanner_requests_total", kind="prefix")
+
+        probe = client.get("/wp-admin/setup-config.php")
+        assert probe.status_code == 404
+        assert probe.data == b"Not Found"
+        assert client.get("/.env").status_code == 404
+        assert client.get("/about").status_code == 200
+        assert metrics.value("scanner_requests_total", kind="prefix") == before + 2
@@ -0,0 +1,79 @@
+"""Unit tests for liveness, readiness and worker warm-up."""
+
+from app import create_app
+from app.core.admission import AdmissionControl
+from app.core.health import page_routes, warm_up
+
+
+class TestHealth:
+    """Test the probes, the warm-up gate and the cached dependency checks."""
+
+    def test_livez(self):
+        """Liveness answers without running any check."""
+        response = create_app("testing").test_client().get("/livez")
+
+        assert response.status_code == 200
+        assert response.get_json() == {"status": "alive"}
+
+    def test_health_reports_content_version(self, monkeypatch):
+        """The version comes from version.json rather than a constant."""
+        monkeypatch.setattr(
+            "app.core.service_worker.read_content_version", lambda folder: "abc123"
+        )
+        response = create_app("testing").test_client().get("/health")
+
+        assert response.get_json()["version"] == "abc123"
+
+    def test_readyz_waits_for_warm_up(self):
+        """Readiness is false until every page route has been rendered."""
+        app = create_app("testing")
+        state = app.extensions["health"]
+        state.ready.clear()
+        client = app.test_client()
+
+        assert client.get("/readyz").status_code == 503
+
+        warm_up(app)
+        response = client.get("/readyz")
+        assert response.status_code == 200
+        assert response.get_json()["checks"]["disk"]["ok"] is True
+        assert state.warm_up_seconds is not None
+
+    def test_warm_up_skips_analytics(self, monkeypatch):
+        """Warm-up renders pages without tracking them as visits."""
+        events = []
+        monkeypatch.setattr(
+            "app.core.utils.track_event", lambda *args, **kwargs: events.append(args)
+        )
+        app = create_app("testing")
+        warm_up(app)
+
+        assert events == []
+        # Warm-up responses are closed, so they do not count as in flight
+        admission = app.wsgi_app
+        while not isinstance(admission, AdmissionControl):
+            admission = admission.wsgi_app
+        assert admission.in_flight == 0
+
+    def test_page_routes(self):
+        """Parameterless GET pages are warmed; probes and admin pages are not."""
+        routes = page_routes(create_app("testing"))
+
+        assert "/" in routes
+        assert "/about" in routes
+        assert "/readyz" not in routes
+        assert "/metrics" not in routes
+        assert not any("<" in route for route in routes)
+
+    def test_critical_check_failure_makes_unready(self):
+        """A failing critical check turns readiness off; others only report."""
+        app = create_app("testing")
+        state = app.extensions["health"]
+        state.add_check("optional", lambda: "degraded")
+        state.run_checks()
+        assert state.is_ready()
+
+        state.add_check("broken", lambda: 1 / 0, critical=True)
+        state.run_checks()
+        assert not state.is_ready()
+        assert state.results["broken"]["detail"].startswith("ZeroDivisionError")
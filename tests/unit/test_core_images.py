@@ -0,0 +1,74 @@
+"""Unit tests for the responsive image pipeline."""
+
+import os
+
+import pytest
+
+from app import create_app
+from app.core.images import ImagePipeline, responsive_image
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def pipeline(tmp_path):
+    """Image pipeline over a static folder with one 1600x900 photo."""
+    static = tmp_path / "static"
+    (static / "images").mkdir(parents=True)
+    Image.new("RGB", (1600, 900), "steelblue").save(static / "images" / "photo.jpg")
+    return ImagePipeline(
+        static_folder=str(static),
+        cache_dir=str(tmp_path / "cache"),
+        widths=[320, 640, 1280],
+        formats=["webp"],
+        quality={"webp": 75, "jpeg": 80},
+    )
+
+
+class TestImagePipeline:
+    """Test variant generation and the srcset helper."""
+
+    def test_variants_are_resized_and_cached(self, pipeline):
+        """A variant is encoded once and then served from the disk cache."""
+        path = pipeline.get_variant("images/photo.jpg", 640, "webp")
+        mtime = os.path.getmtime(path)
+
+        with Image.open(path) as image:
+            assert image.format == "WEBP"
+            assert image.size == (640, 360)
+        assert pipeline.get_variant("images/photo.jpg", 640, "webp") == path
+        assert os.path.getmtime(path) == mtime
+
+    def test_widths_never_upscale(self, pipeline):
+        """Only widths up to the largest configured one are offered."""
+        assert pipeline.variant_widths("images/photo.jpg") == [320, 640, 1280]
+
+    def test_edited_images_get_new_variants(self, pipeline):
+        """With CACHE_STAT_CHECKS an edited source gets a fresh variant."""
+        app = create_app("testing")
+        app.config["CACHE_STAT_CHECKS"] = True
+        source = os.path.join(pipeline.static_folder, "images", "photo.jpg")
+
+        with app.app_context():
+            before = pipeline.variant_path("images/photo.jpg", 640, "webp")
+            Image.new("RGB", (1600, 900), "darkorange").save(source)
+            os.utime(source, ns=(0, 0))
+            after = pipeline.variant_path("images/photo.jpg", 640, "webp")
+
+        assert after != before
+
+    def test_helper_emits_srcset_and_dimensions(self, pipeline):
+        """The <picture> markup carries srcset, sizes, width and height."""
+        app = create_app("testing")
+        app.extensions["image_pipeline"] = pipeline
+
+        with app.test_request_context():
+            html = str(responsive_image("images/photo.jpg", alt="Photo", sizes="50vw"))
+            missing = responsive_image("images/missing.jpg", alt="Missing")
+
+        assert '<source type="image/webp"' in html
+        assert "640w" in html
+        assert "1280w" in html
+        assert 'width="1600" height="900"' in html
+        assert 'sizes="50vw"' in html
+        assert missing == ""
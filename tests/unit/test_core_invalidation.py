@@ -0,0 +1,41 @@
+"""Unit tests for the cross-worker cache invalidation bus."""
+
+from app import create_app
+from app.core.invalidation import InvalidationBus
+
+
+class TestInvalidationBus:
+    """Test generation counters shared through one mapped file."""
+
+    def test_other_workers_drop_only_affected_namespaces(self, tmp_path):
+        """A bump in one process runs the matching callbacks in another."""
+        path = str(tmp_path / "generations")
+        writer, worker = InvalidationBus(path), InvalidationBus(path)
+        dropped = []
+        worker.subscribe("assets", lambda: dropped.append("assets"))
+        worker.subscribe("pages", lambda: dropped.append("pages"))
+        worker.subscribe("projects", lambda: dropped.append("projects"))
+
+        worker.poll()
+        assert dropped == []
+
+        writer.invalidate("assets")
+        worker.poll()
+        assert dropped == ["assets", "pages"]
+
+        worker.poll()
+        assert dropped == ["assets", "pages"]
+        assert writer.generations() == {"assets": 1, "pages": 1}
+
+    def test_error_pages_rerender_after_invalidation(self):
+        """Invalidating pages from another process clears the rendered 404."""
+        app = create_app("testing")
+        client = app.test_client()
+        client.get("/missing")
+        assert app.extensions["error_pages"]._pages
+
+        InvalidationBus(app.extensions["cache_bus"].path).invalidate("pages")
+        app.extensions["error_pages"]._pages["404"] = b"stale"
+        response = client.get("/missing")
+
+        assert response.data != b"stale"
@@ -0,0 +1,30 @@
+"""Unit tests for compile-time HTML minification."""
+
+from app import create_app
+from app.core.minify import minify_html
+
+
+class TestMinify:
+    """Test what the minifier strips and what it leaves alone."""
+
+    def test_collapses_whitespace_and_comments(self):
+        """Indentation and plain comments go; line breaks stay."""
+        source = "<div>\n    <!-- note -->\n    <p>Hello   world</p>\n</div>"
+        assert minify_html(source) == "<div>\n\n<p>Hello world</p>\n</div>"
+
+    def test_protected_regions_are_untouched(self):
+        """Preformatted elements, scripts and Jinja syntax are kept verbatim."""
+        source = (
+            "<pre>  a\n    b</pre>  <textarea> x  y </textarea>\n"
+            "<script>\n  if (a  <  b) {}\n</script>\n"
+            '{{ "two  spaces" }} {% raw %}  {{ x }}  {% endraw %}\n'
+            "<!-- {% block keep %}{% endblock %} -->"
+        )
+        assert minify_html(source) == source.replace(">  <textarea", "> <textarea")
+
+    def test_pages_render_minified(self):
+        """Rendered pages no longer carry template indentation."""
+        response = create_app("testing").test_client().get("/about")
+        html = response.data.decode()
+        assert response.status_code == 200
+        assert "\n    <" not in html.split("<script")[0]
@@ -0,0 +1,78 @@
+"""Unit tests for copy-on-write preloading and GC statistics."""
+
+import gc
+
+from app import create_app
+from app.core.memory import GCStats
+from app.core.metrics import metrics
+from app.core.preload import configure_worker_gc, freeze_heap, warm_caches
+from app.models.project import ProjectRepository
+from app.models.snapshot import current_snapshot
+
+
+class TestPreload:
+    """Test cache warming, GC tuning and GC pause statistics."""
+
+    def test_warm_caches_compiles_templates(self):
+        """Every HTML template is compiled and error pages are rendered."""
+        app = create_app("testing")
+        warm_caches(app)
+
+        assert len(app.jinja_env.cache) >= len(
+            app.jinja_env.list_templates(extensions=["html"])
+        )
+        assert app.extensions["error_pages"]._pages.keys() == {"404", "500", "offline"}
+
+    def test_content_is_decoded_before_the_fork(self):
+        """The master builds the content objects that workers then share."""
+        app = create_app("testing")
+        warm_caches(app)
+        content = current_snapshot()
+
+        assert None not in content._decoded
+        assert content._cache.keys() >= {"projects", "service_objects"}
+        project = ProjectRepository.get_all()[0]
+        assert content._cache["projects"][project.id] is project
+
+    def test_worker_gc_thresholds(self):
+        """Workers raise the young-generation threshold."""
+        original = gc.get_threshold()
+        try:
+            configure_worker_gc((10_000, 10, 10))
+            assert gc.get_threshold() == (10_000, 10, 10)
+            assert gc.isenabled()
+        finally:
+            gc.set_threshold(*original)
+
+    def test_freeze_heap_does_not_collect(self):
+        """Freezing moves objects to the permanent generation without a collection."""
+        stats = GCStats()
+        gc.callbacks.append(stats)
+        try:
+            freeze_heap()
+            assert gc.get_freeze_count() > 0
+        finally:
+            gc.callbacks.remove(stats)
+            gc.unfreeze()
+
+        assert stats.collections == [0, 0, 0]
+
+    def test_gc_pauses_are_recorded(self):
+        """Collections are counted and timed per generation."""
+        stats = GCStats()
+        gc.callbacks.append(stats)
+        try:
+            gc.collect()
+        finally:
+            gc.callbacks.remove(stats)
+
+        assert stats.collections[2] == 1
+        assert stats.pause_seconds[2] > 0
+        assert stats.max_pause_seconds >= stats.pause_seconds[2]
+
+    def test_gc_metrics_are_exposed(self):
+        """GC and memory gauges appear in the Prometheus output."""
+        create_app("testing")
+        text = metrics.render()
+        assert 'gc_collections_total{generation="0"}' in text
+        assert "gc_frozen_objects" in text
@@ -0,0 +1,84 @@
+"""Unit tests for the on-demand sampling profiler."""
+
+import json
+import threading
+import time
+
+from app import create_app
+from app.core import profiler
+from app.core.profiler import SamplingProfiler, active_profile
+
+TOKEN = "test-admin-token"  # noqa: S105
+
+
+def busy_route(stop: threading.Event):
+    """Spin in a thread labelled as serving ``home.index``."""
+    profiler._thread_routes[threading.get_ident()] = "home.index"
+    while not stop.is_set():
+        sum(range(1000))
+    profiler._thread_routes.pop(threading.get_ident())
+
+
+class TestProfiler:
+    """Test sampling, output formats and the admin endpoints."""
+
+    def test_samples_labelled_threads_only(self, tmp_path):
+        """Only threads serving a request are sampled, under their route."""
+        stop = threading.Event()
+        worker = threading.Thread(target=busy_route, args=(stop,))
+        worker.start()
+        try:
+            sampler = SamplingProfiler(0.2, 0.005, str(tmp_path))
+            sampler.run()
+        finally:
+            stop.set()
+            worker.join()
+
+        assert sampler.samples > 5
+        assert all(stack[0] == "home.index" for stack in sampler.stacks)
+        assert any("busy_route" in frame for stack in sampler.stacks for frame in stack)
+
+        collapsed = (tmp_path / f"{sampler.name_prefix}.collapsed.txt").read_text()
+        assert collapsed.startswith("home.index;")
+        speedscope = json.loads(
+            (tmp_path / f"{sampler.name_prefix}.speedscope.json").read_text()
+        )
+        profile = speedscope["profiles"][0]
+        assert profile["type"] == "sampled"
+        assert len(profile["samples"]) == len(profile["weights"])
+        assert speedscope["shared"]["frames"][0]["name"] == "home.index"
+
+    def test_requests_are_labelled_before_a_profile_starts(self):
+        """A request already running when profiling begins is still sampled."""
+        app = create_app("testing")
+        assert active_profile() is None
+        with app.test_request_context("/about"):
+            app.preprocess_request()
+            assert profiler._thread_routes[threading.get_ident()] == "home.about"
+            app.do_teardown_request()
+        assert threading.get_ident() not in profiler._thread_routes
+
+    def test_admin_endpoints(self, tmp_path):
+        """Profiles start via POST, are listed and can be downloaded."""
+        app = create_app("testing")
+        app.config.update(ADMIN_TOKEN=TOKEN, PROFILER_DIR=str(tmp_path))
+        client = app.test_client()
+        auth = {"Authorization": f"Bearer {TOKEN}"}
+
+        assert client.post("/admin/profile").status_code == 404
+
+        started = client.post("/admin/profile?seconds=0.1", headers=auth)
+        assert started.status_code == 202
+        assert client.post("/admin/profile", headers=auth).status_code == 409
+
+        deadline = time.monotonic() + 5
+        while active_profile() is not None and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        listing = client.get("/admin/profile", headers=auth).get_json()
+        assert sorted(listing["profiles"]) == sorted(started.get_json()["files"])
+
+        name = listing["profiles"][0]
+        download = client.get(f"/admin/profile/{name}", headers=auth)
+        assert download.status_code == 200
+        assert client.get("/admin/profile/secret.env", headers=auth).status_code == 404
@@ -0,0 +1,199 @@
+"""Unit tests for circuit breakers, deadlines and fallbacks."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import create_app
+from app.core.metrics import metrics
+from app.core.resilience import check_circuits, get_breaker, reset_breakers
+from app.utils.api.github import GitHubClient
+
+
+class FaultyGitHub(BaseHTTPRequestHandler):
+    """GitHub stand-in whose behaviour the test switches at runtime."""
+
+    mode = "ok"
+    hits = 0
+
+    def do_GET(self):
+        """Answer according to the current mode."""
+        type(self).hits += 1
+        if self.mode == "slow":
+            time.sleep(2)
+        status = 500 if self.mode == "error" else 200
+        body = json.dumps({"stargazers_count": 42}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        """Keep test output quiet."""
+
+
+class FaultyPostHog(BaseHTTPRequestHandler):
+    """PostHog batch endpoint that fails or accepts uploads."""
+
+    mode = "error"
+    uploads = 0
+
+    def do_POST(self):
+        """Accept or reject one batch upload."""
+        self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).uploads += 1
+        self.send_response(503 if self.mode == "error" else 200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"{}")
+
+    def log_message(self, *args):
+        """Keep test output quiet."""
+
+
+@pytest.fixture
+def github():
+    """A GitHub client pointed at the fault-injecting server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FaultyGitHub)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    FaultyGitHub.mode = "ok"
+    FaultyGitHub.hits = 0
+    reset_breakers()
+
+    app = create_app("testing")
+    app.config.update(CIRCUIT_FAILURE_THRESHOLD=3, CIRCUIT_RESET_TIMEOUT=0.2)
+    client = GitHubClient()
+    client.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    with app.test_request_context():
+        reset_breakers()
+        yield client
+    server.shutdown()
+    reset_breakers()
+
+
+class TestResilience:
+    """Test the breaker state machine, deadlines and fallbacks."""
+
+    def test_breaker_opens_and_recovers(self, github):
+        """Failures open the circuit; a half-open probe closes it again."""
+        FaultyGitHub.mode = "error"
+        for _ in range(3):
+            assert github.get_repository("ksbk", "site") is None
+        breaker = get_breaker("github")
+        assert breaker.state == "open"
+        assert FaultyGitHub.hits == 3
+
+        # Open: calls are skipped without reaching the server
+        assert github.get_repository("ksbk", "site") is None
+        assert FaultyGitHub.hits == 3
+        assert metrics.value("circuit_trips_total", dependency="github") >= 1
+
+        FaultyGitHub.mode = "ok"
+        time.sleep(0.25)
+        assert github.get_repository("ksbk", "site") == {"stargazers_count": 42}
+        assert breaker.state == "closed"
+
+    def test_failed_probe_reopens(self, github):
+        """A failing half-open probe opens the circuit again."""
+        FaultyGitHub.mode = "error"
+        for _ in range(3):
+            github.get_repository("ksbk", "site")
+        time.sleep(0.25)
+        github.get_repository("ksbk", "site")
+
+        breaker = get_breaker("github")
+        assert breaker.state == "open"
+        assert breaker.trips == 2
+
+    def test_last_good_value_is_served(self, github):
+        """Failed calls fall back to the last good result."""
+        assert github.get_repository("ksbk", "site") == {"stargazers_count": 42}
+
+        FaultyGitHub.mode = "error"
+        assert github.get_repository("ksbk", "site") == {"stargazers_count": 42}
+        assert github.get_user_repositories("ksbk") == []
+
+    def test_deadline_limits_call_timeout(self, github):
+        """A slow dependency cannot hold the request past its deadline."""
+        from flask import g
+
+        FaultyGitHub.mode = "slow"
+        g.deadline = time.monotonic() + 0.3
+        started = time.monotonic()
+        assert github.get_repository("ksbk", "site") is None
+        assert time.monotonic() - started < 1.5
+
+        # Out of budget: no call is made at all
+        hits = FaultyGitHub.hits
+        g.deadline = time.monotonic()
+        assert github.get_repository("ksbk", "site") is None
+        assert FaultyGitHub.hits == hits
+
+    def test_circuit_state_is_exported(self, github):
+        """Breaker state appears on /metrics and in the health checks."""
+        FaultyGitHub.mode = "error"
+        for _ in range(3):
+            github.get_repository("ksbk", "site")
+
+        assert 'circuit_state{dependency="github"} 2' in metrics.render()
+        assert check_circuits() == "circuit open: github"
+
+    def test_posthog_breaker_follows_upload_results(self, monkeypatch):
+        """Queueing events never closes the breaker; failed uploads open it."""
+        posthog = pytest.importorskip("posthog")
+        from app.core.utils import track_event
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), FaultyPostHog)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        FaultyPostHog.mode = "error"
+        FaultyPostHog.uploads = 0
+        client = posthog.Client(
+            "phc_test",
+            host=f"http://127.0.0.1:{server.server_address[1]}",
+            flush_at=1,
+            flush_interval=0.01,
+            max_retries=0,
+        )
+        monkeypatch.setattr(posthog, "default_client", client)
+        reset_breakers()
+        app = create_app("testing")
+        app.config.update(
+            ANALYTICS_SINK="posthog",
+            CIRCUIT_FAILURE_THRESHOLD=3,
+            CIRCUIT_RESET_TIMEOUT=60,
+        )
+        breaker = get_breaker("posthog")
+
+        try:
+            with app.test_request_context():
+                # Traffic keeps flowing while every upload fails
+                deadline = time.monotonic() + 5
+                while breaker.state != "open" and time.monotonic() < deadline:
+                    track_event("Viewed Page")
+                    time.sleep(0.02)
+                assert breaker.state == "open"
+
+                # Open: events are no longer queued for the dead endpoint
+                uploads = FaultyPostHog.uploads
+                client.flush()
+                track_event("Viewed Page")
+                client.flush()
+                assert FaultyPostHog.uploads == uploads
+
+                # Recovery is decided by an upload, not by queueing
+                FaultyPostHog.mode = "ok"
+                breaker.opened_at -= 60
+                track_event("Viewed Page")
+                assert breaker.state == "half_open"
+                client.flush()
+                assert breaker.state == "closed"
+        finally:
+            client.shutdown()
+            server.shutdown()
+            reset_breakers()
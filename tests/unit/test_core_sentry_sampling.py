@@ -0,0 +1,105 @@
+"""Unit tests for the endpoint-aware Sentry sampling policy."""
+
+from app import create_app
+from app.core.metrics import metrics
+from app.core.sentry_sampling import SamplingPolicy
+
+GOOGLEBOT = "Mozilla/5.0 (compatible; Googlebot/2.1; +http://www.google.com/bot.html)"
+BROWSER = "Mozilla/5.0 (X11; Linux x86_64) Firefox/130.0"
+
+
+def policy(**overrides) -> SamplingPolicy:
+    """A policy built from the default configuration."""
+    config = dict(create_app("testing").config)
+    config.update(overrides)
+    return SamplingPolicy.from_config(config)
+
+
+def context(path: str, user_agent: str = BROWSER, parent_sampled=None) -> dict:
+    """A sampling context as the WSGI integration passes it."""
+    return {
+        "wsgi_environ": {"PATH_INFO": path, "HTTP_USER_AGENT": user_agent},
+        "parent_sampled": parent_sampled,
+    }
+
+
+class TestSentrySampling:
+    """Test rules, bots, boosting, the budget and overhead reporting."""
+
+    def test_health_and_static_are_never_sampled(self):
+        """Rule matches win over everything, including a sampled parent."""
+        sampling = policy(SENTRY_TRACES_SAMPLE_RATE=1.0)
+
+        for path in ["/health", "/readyz", "/static/css/app.css", "/robots.txt"]:
+            assert sampling.traces_sampler(context(path)) == 0.0
+        assert sampling.traces_sampler(context("/health", parent_sampled=True)) == 0
+
+    def test_bots_use_their_own_rate(self):
+        """Crawler traffic is sampled at the bot rate."""
+        sampling = policy(SENTRY_TRACES_SAMPLE_RATE=1.0)
+
+        assert sampling.decide("/about", GOOGLEBOT, None) == (0.0, "bot")
+        assert sampling.decide("/about", BROWSER, None) == (1.0, "default")
+
+    def test_parent_decision_is_followed(self):
+        """Distributed traces keep the caller's decision."""
+        sampling = policy(SENTRY_TRACES_SAMPLE_RATE=0.0)
+
+        sampled = sampling.decide("/about", BROWSER, parent_sampled=True)
+        dropped = sampling.decide("/about", BROWSER, parent_sampled=False)
+        assert sampled == (1.0, "parent")
+        assert dropped == (0.0, "parent")
+
+    def test_parent_cannot_bypass_bot_rate_or_budget(self, monkeypatch):
+        """A sampled header is budgeted and cannot lift the crawler rate."""
+        clock = [1000.0]
+        monkeypatch.setattr("app.core.sentry_sampling.time.monotonic", lambda: clock[0])
+        sampling = policy(SENTRY_TRACES_SAMPLE_RATE=0.0, SENTRY_TRACES_PER_MINUTE=10)
+
+        assert sampling.decide("/about", GOOGLEBOT, parent_sampled=True) == (0.0, "bot")
+
+        for _ in range(100):
+            sampling.decide("/about", BROWSER, parent_sampled=True)
+        clock[0] += 60
+
+        assert sampling.decide("/about", BROWSER, parent_sampled=True) == (
+            0.1,
+            "budget",
+        )
+
+    def test_slow_and_failing_paths_are_boosted(self):
+        """A slow or 5xx request boosts its path for traces and profiles."""
+        sampling = policy(SENTRY_TRACES_SAMPLE_RATE=0.01, SENTRY_SLOW_REQUEST_MS=500)
+
+        sampling.observe("/projects/3", 0.1, 200)
+        assert sampling.decide("/projects/3", BROWSER, None)[1] == "default"
+
+        sampling.observe("/projects/3", 0.8, 200)
+        sampling.observe("/contact", 0.01, 500)
+        assert sampling.decide("/projects/3", BROWSER, None) == (1.0, "boost")
+        assert sampling.decide("/contact", BROWSER, None) == (1.0, "boost")
+        assert sampling.profiles_sampler(context("/contact")) == 1.0
+        assert sampling.profiles_sampler(context("/about")) == 0.1
+
+    def test_budget_scales_rates_down(self, monkeypatch):
+        """Traffic above the per-minute budget scales the next minute's rates."""
+        clock = [1000.0]
+        monkeypatch.setattr("app.core.sentry_sampling.time.monotonic", lambda: clock[0])
+        sampling = policy(SENTRY_TRACES_SAMPLE_RATE=0.5, SENTRY_TRACES_PER_MINUTE=10)
+
+        for _ in range(200):  # 100 expected transactions in the first minute
+            sampling.decide("/about", BROWSER, None)
+        clock[0] += 60
+
+        rate, reason = sampling.decide("/about", BROWSER, None)
+        assert sampling.factor == 0.1
+        assert rate == 0.05
+        assert reason == "budget"
+
+    def test_overhead_is_reported(self):
+        """Each decision is timed and counted on /metrics."""
+        calls = metrics.value("sentry_sampler_calls_total")
+        policy().traces_sampler(context("/about"))
+
+        assert metrics.value("sentry_sampler_calls_total") == calls + 1
+        assert metrics.value("sentry_sampler_seconds_total") > 0
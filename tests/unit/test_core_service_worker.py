@@ -0,0 +1,68 @@
+"""Unit tests for the service worker precache manifest."""
+
+import json
+
+from app import create_app
+from app.core.service_worker import build_precache_manifest, write_precache_manifest
+
+
+def make_static_folder(tmp_path, css=b"body{}"):
+    """Create a minimal static folder with a Vite build."""
+    dist = tmp_path / "dist"
+    (dist / ".vite").mkdir(parents=True)
+    (dist / "js").mkdir()
+    (dist / "css").mkdir()
+    (dist / "js" / "main.js").write_bytes(b"console.log(1)")
+    (dist / "css" / "main.css").write_bytes(css)
+    (dist / ".vite" / "manifest.json").write_text(
+        json.dumps(
+            {
+                "frontend/src/scripts/app/main.js": {
+                    "file": "js/main.js",
+                    "css": ["css/main.css"],
+                    "isEntry": True,
+                }
+            }
+        )
+    )
+    (tmp_path / "version.json").write_text('{"version": "abc123"}')
+    (tmp_path / "sw.js").write_text("// worker")
+    return tmp_path
+
+
+class TestPrecacheManifest:
+    """Test precache manifest generation."""
+
+    def test_entries_are_revisioned_by_content(self, tmp_path):
+        """Only changed files get a new revision."""
+        static = make_static_folder(tmp_path)
+        before = {
+            e["url"].split("?")[0]: e["revision"]
+            for e in build_precache_manifest(str(static))["entries"]
+        }
+
+        (static / "dist" / "css" / "main.css").write_bytes(b"body{color:red}")
+        after = {
+            e["url"].split("?")[0]: e["revision"]
+            for e in build_precache_manifest(str(static))["entries"]
+        }
+
+        assert before["/static/dist/js/main.js"] == after["/static/dist/js/main.js"]
+        assert before["/static/dist/css/main.css"] != after["/static/dist/css/main.css"]
+        assert after["/"] == "abc123"
+
+    def test_sw_route_injects_manifest(self, tmp_path):
+        """The /sw.js route serves the worker with the built manifest."""
+        static = make_static_folder(tmp_path)
+        write_precache_manifest(str(static))
+
+        app = create_app("testing")
+        app.static_folder = str(static)
+        response = app.test_client().get("/sw.js")
+
+        body = response.get_data(as_text=True)
+        assert response.status_code == 200
+        assert response.headers["Cache-Control"] == "no-cache"
+        assert body.startswith("self.__PRECACHE_MANIFEST = ")
+        assert "/static/dist/js/main.js" in body
+        assert body.endswith("// worker")
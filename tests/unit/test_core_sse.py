@@ -0,0 +1,182 @@
+"""Unit tests for streamed OpenAI generation relayed as server-sent events."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import create_app
+from app.core.metrics import metrics
+from app.core.resilience import OPEN, get_breaker, reset_breakers
+from app.core.sse import sse_event
+
+TOKEN = "test-admin-token"  # noqa: S105
+TOKENS = ["Fast", " APIs", " for", " busy", " teams", "."]
+
+
+class FakeStreamingOpenAI(BaseHTTPRequestHandler):
+    """Chat completions streamed as chunked SSE, one token per chunk."""
+
+    protocol_version = "HTTP/1.1"
+    delay = 0.01
+    drop_after = None
+    hits = 0
+    aborted = threading.Event()
+
+    def do_POST(self):
+        """Stream ``TOKENS``, noticing when the caller hangs up."""
+        type(self).hits += 1
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert body["stream"] is True
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        try:
+            for index, token in enumerate(TOKENS):
+                if index == self.drop_after:
+                    # Hang up mid-stream, as a dropped connection would
+                    self.close_connection = True
+                    return
+                delta = {"choices": [{"delta": {"content": token}}]}
+                self.write_chunk(f"data: {json.dumps(delta)}\n\n")
+                time.sleep(self.delay)
+            self.write_chunk("data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except OSError:
+            type(self).aborted.set()
+
+    def write_chunk(self, text: str):
+        """Write one HTTP chunk."""
+        data = text.encode()
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        """Keep test output quiet."""
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Admin test client with OpenAI pointed at the fake streaming server."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeStreamingOpenAI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    FakeStreamingOpenAI.hits = 0
+    FakeStreamingOpenAI.delay = 0.01
+    FakeStreamingOpenAI.drop_after = None
+    FakeStreamingOpenAI.aborted = threading.Event()
+    monkeypatch.setattr(
+        "app.utils.api.openai.BASE_URL", f"http://127.0.0.1:{server.server_address[1]}"
+    )
+    reset_breakers()
+
+    app = create_app("testing")
+    app.config.update(ADMIN_TOKEN=TOKEN, OPENAI_API_KEY="sk-test")
+    client = app.test_client()
+    client.environ_base["HTTP_AUTHORIZATION"] = f"Bearer {TOKEN}"
+    yield client
+    server.shutdown()
+    reset_breakers()
+
+
+def parse_events(body: str) -> list[tuple[str, str]]:
+    """(event, decoded data) pairs of an SSE body."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        event, data = "message", []
+        for line in block.split("\n"):
+            if line.startswith("event: "):
+                event = line.removeprefix("event: ")
+            elif line.startswith("data: "):
+                data.append(line.removeprefix("data: "))
+        events.append((event, json.loads("\n".join(data))))
+    return events
+
+
+URL = "/admin/generate/project-description?title=Site&technologies=Flask"
+
+
+class TestSSE:
+    """Test token relay, result caching and cancellation."""
+
+    def test_tokens_are_relayed_then_cached(self, client):
+        """Each token is its own event; a repeat request is served from cache."""
+        response = client.get(URL)
+        assert response.mimetype == "text/event-stream"
+        assert response.headers["X-Cache"] == "miss"
+
+        events = parse_events(response.get_data(as_text=True))
+        assert events[:-1] == [("message", token) for token in TOKENS]
+        assert events[-1] == ("done", "".join(TOKENS))
+
+        cached = client.get(URL)
+        assert cached.headers["X-Cache"] == "hit"
+        assert parse_events(cached.get_data(as_text=True))[-1][1] == "".join(TOKENS)
+        assert FakeStreamingOpenAI.hits == 1
+
+        client.get(URL + "&refresh=1").close()
+        assert FakeStreamingOpenAI.hits == 2
+
+    def test_tokens_arrive_before_the_completion_ends(self, client):
+        """The first event is relayed while the upstream is still generating."""
+        FakeStreamingOpenAI.delay = 0.3
+        started = time.perf_counter()
+        response = client.get(URL, buffered=False)
+        first = next(response.response)
+        elapsed = time.perf_counter() - started
+        response.close()
+
+        assert parse_events(first.decode()) == [("message", TOKENS[0])]
+        assert elapsed < FakeStreamingOpenAI.delay * 2
+
+    def test_cancellation_aborts_upstream(self, client):
+        """Closing the response closes the upstream call; nothing is cached."""
+        FakeStreamingOpenAI.delay = 0.2
+        cancelled = metrics.value("sse_streams_total", outcome="cancelled")
+        response = client.get(URL, buffered=False)
+        next(response.response)
+        response.close()
+
+        assert FakeStreamingOpenAI.aborted.wait(5)
+        assert metrics.value("sse_streams_total", outcome="cancelled") == cancelled + 1
+        retry = client.get(URL, buffered=False)
+        assert retry.headers["X-Cache"] == "miss"
+        retry.close()
+
+    def test_nothing_generated_is_an_error(self, client):
+        """With the circuit open, the client gets an error event, not ``done``."""
+        breaker = get_breaker("openai")
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+
+        events = parse_events(client.get(URL).get_data(as_text=True))
+        assert events == [("error", "nothing was generated")]
+        assert FakeStreamingOpenAI.hits == 0
+
+    def test_dropped_streams_trip_the_breaker(self, client):
+        """A connection lost mid-stream counts as an OpenAI failure."""
+        FakeStreamingOpenAI.drop_after = 2
+        breaker = get_breaker("openai")
+        for _ in range(breaker.failure_threshold):
+            events = parse_events(client.get(URL).get_data(as_text=True))
+            assert events[:2] == [("message", token) for token in TOKENS[:2]]
+            assert events[-1] == ("error", "generation failed")
+
+        assert breaker.state == OPEN
+        assert FakeStreamingOpenAI.hits == breaker.failure_threshold
+
+    def test_requires_token_and_arguments(self, client):
+        """Only the Authorization header is accepted; arguments are required."""
+        anonymous = {"Authorization": ""}
+        outline = "/admin/generate/blog-outline?topic=x"
+        assert client.get(outline, headers=anonymous).status_code == 404
+        # Query strings end up in access logs, so a token there is refused
+        in_query = client.get(f"{outline}&token={TOKEN}", headers=anonymous)
+        assert in_query.status_code == 404
+        assert client.get("/admin/generate/blog-outline").status_code == 400
+
+    def test_multiline_data_is_framed(self):
+        """Every line of a multi-line payload gets its own ``data:`` field."""
+        assert sse_event("a\nb", event="done") == "event: done\ndata: a\ndata: b\n\n"
@@ -0,0 +1,69 @@
+"""Unit tests for content-hashed static URLs."""
+
+from app import create_app
+from app.core.static_files import load_static_hashes
+
+
+class TestStaticUrls:
+    """Test static URL versioning and cache headers."""
+
+    def setup_method(self):
+        """Create a test client for the real static folder."""
+        self.app = create_app("testing")
+        self.client = self.app.test_client()
+
+    def test_static_url_appends_content_hash(self):
+        """Hashed files get a v parameter, stable files do not."""
+        from app.core.static_files import static_url
+
+        with self.app.test_request_context():
+            logo_url = static_url("images/ksb-logo.png")
+            manifest_url = static_url("manifest.json")
+
+        hashes = load_static_hashes(self.app.static_folder)
+        assert logo_url.endswith(f"?v={hashes['images/ksb-logo.png']}")
+        assert manifest_url.endswith("/static/manifest.json")
+
+    def test_hashed_url_is_immutable(self):
+        """Only a matching hash is cached for a year."""
+        version = load_static_hashes(self.app.static_folder)["images/ksb-logo.png"]
+        response = self.client.get(f"/static/images/ksb-logo.png?v={version}")
+
+        assert response.cache_control.immutable
+        assert response.cache_control.max_age == 31536000
+        response.close()
+
+    def test_unversioned_url_gets_short_ttl_and_etag(self):
+        """Stable or stale URLs revalidate quickly."""
+        response = self.client.get("/static/manifest.json")
+
+        assert not response.cache_control.immutable
+        assert response.cache_control.max_age == 300
+        assert response.headers.get("ETag")
+        response.close()
+
+    def test_edited_file_gets_a_new_hash_with_stat_checks(self, tmp_path):
+        """In development an edited file changes its URL and old hashes expire."""
+        from app.core.static_files import static_file_hash
+
+        (tmp_path / "app.css").write_text("body { color: red; }")
+        self.app.config["CACHE_STAT_CHECKS"] = True
+        with self.app.app_context():
+            before = static_file_hash(str(tmp_path), "app.css")
+            (tmp_path / "app.css").write_text("body { color: blue; margin: 0; }")
+            after = static_file_hash(str(tmp_path), "app.css")
+            assert static_file_hash(str(tmp_path), "../escape.css") is None
+
+        assert before != after
+
+    def test_hash_command_writes_nginx_map(self, tmp_path):
+        """The nginx map has an exact "<uri>:<hash>" key per versioned file."""
+        from app.core.static_files import NGINX_MAP_PATH, write_static_manifest
+
+        (tmp_path / "app.css").write_text("body {}")
+        (tmp_path / "sw.js").write_text("")
+        write_static_manifest(str(tmp_path))
+
+        version = load_static_hashes(str(tmp_path))["app.css"]
+        lines = (tmp_path / NGINX_MAP_PATH).read_text().splitlines()
+        assert lines == [f'"/static/app.css:{version}" 1;']
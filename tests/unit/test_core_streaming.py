@@ -0,0 +1,43 @@
+"""Unit tests for streamed page rendering."""
+
+import pytest
+
+from app import create_app
+from app.core.streaming import buffered_chunks
+
+
+class TestStreaming:
+    """Test head-first flushing and mid-stream failures."""
+
+    def test_head_is_flushed_first(self):
+        """The first chunk ends with the document head, assets included."""
+        app = create_app("testing")
+        app.config["STREAM_TEMPLATES"] = True
+        response = app.test_client().get("/about")
+
+        assert response.content_length is None
+        assert response.headers["X-Accel-Buffering"] == "no"
+        chunks = [chunk.decode() for chunk in response.response]
+        assert "</head>" in chunks[0]
+        assert "main.css" in chunks[0]
+        assert "<main" not in chunks[0]
+        assert "".join(chunks).rstrip().endswith("</html>")
+
+    def test_pages_are_not_streamed_by_default(self):
+        """Without the flag pages render in one piece."""
+        response = create_app("testing").test_client().get("/about")
+        assert response.content_length == len(response.data)
+        assert "X-Accel-Buffering" not in response.headers
+
+    def test_errors_abort_the_stream(self):
+        """A template error propagates instead of ending the page cleanly."""
+        app = create_app("testing")
+
+        def failing():
+            yield "<html><head></head>"
+            raise RuntimeError("template failed")
+
+        stream = buffered_chunks(failing(), app)
+        assert next(stream) == "<html><head></head>"
+        with pytest.raises(RuntimeError):
+            next(stream)
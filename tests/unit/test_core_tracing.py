@@ -0,0 +1,162 @@
+"""Unit tests for request tracing and OTLP/JSON export."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app import create_app
+from app.core.tracing import (
+    NOOP_SPAN,
+    parse_traceparent,
+    should_sample,
+    span,
+)
+from config.testing import TestingConfig
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class Collector(BaseHTTPRequestHandler):
+    """OTLP/HTTP collector stand-in keeping every payload it receives."""
+
+    payloads: list = []
+
+    def do_POST(self):
+        """Store the JSON body."""
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        type(self).payloads.append(json.loads(body))
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        """Keep test output quiet."""
+
+
+@pytest.fixture
+def traced_app(monkeypatch, tmp_path):
+    """An app sampling every request, exporting to a file and a collector."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Collector)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    Collector.payloads = []
+
+    monkeypatch.setattr(TestingConfig, "TRACE_SAMPLE_RATE", 1.0, raising=False)
+    monkeypatch.setattr(
+        TestingConfig,
+        "TRACE_EXPORT_FILE",
+        str(tmp_path / "traces.jsonl"),
+        raising=False,
+    )
+    monkeypatch.setattr(
+        TestingConfig,
+        "TRACE_EXPORT_URL",
+        f"http://127.0.0.1:{server.server_address[1]}/v1/traces",
+        raising=False,
+    )
+    yield create_app("testing")
+    server.shutdown()
+
+
+def exported_spans(app) -> list[dict]:
+    """Flush the exporter and read back every span written to the file."""
+    app.extensions["tracer"].exporter.flush()
+    spans = []
+    with open(app.config["TRACE_EXPORT_FILE"]) as f:
+        for line in f:
+            for resource in json.loads(line)["resourceSpans"]:
+                for scope in resource["scopeSpans"]:
+                    spans.extend(scope["spans"])
+    return spans
+
+
+class TestTracing:
+    """Test sampling, propagation, automatic spans and export."""
+
+    def test_parse_traceparent(self):
+        """Valid W3C headers parse; malformed or all-zero ids are ignored."""
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (
+            TRACE_ID,
+            PARENT_ID,
+            True,
+        )
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00")[2] is False
+        assert parse_traceparent(f"00-{'0' * 32}-{PARENT_ID}-01") is None
+        assert parse_traceparent("garbage") is None
+
+    def test_sampling_is_deterministic(self):
+        """The decision depends only on the trace id and the rate."""
+        assert should_sample(TRACE_ID, 1.0)
+        assert not should_sample(TRACE_ID, 0.0)
+        assert should_sample(TRACE_ID, 0.5) == should_sample(TRACE_ID, 0.5)
+
+    def test_span_is_noop_outside_a_trace(self):
+        """Without a sampled request, span() hands back the shared no-op."""
+        assert span("anything") is NOOP_SPAN
+
+    def test_unsampled_requests_export_nothing(self, tmp_path, monkeypatch):
+        """With the default rate of zero no spans are recorded."""
+        monkeypatch.setattr(
+            TestingConfig, "TRACE_EXPORT_FILE", str(tmp_path / "t.jsonl"), raising=False
+        )
+        app = create_app("testing")
+        app.test_client().get("/projects/1")
+        app.extensions["tracer"].exporter.flush()
+
+        assert not (tmp_path / "t.jsonl").exists()
+
+    def test_request_spans_continue_incoming_trace(self, traced_app):
+        """Root, repository and render spans share the caller's trace id."""
+        response = traced_app.test_client().get(
+            "/projects/1", headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"}
+        )
+        assert response.status_code == 200
+
+        spans = exported_spans(traced_app)
+        by_name = {item["name"]: item for item in spans}
+        root = by_name["GET /projects/<int:project_id>"]
+
+        assert {item["traceId"] for item in spans} == {TRACE_ID}
+        assert root["parentSpanId"] == PARENT_ID
+        assert root["kind"] == 2
+        assert by_name["ProjectRepository.get_by_id"]["parentSpanId"] == root["spanId"]
+        assert any(name.startswith("render ") for name in by_name)
+
+    def test_rules_override_the_rate(self, traced_app):
+        """Endpoints with a zero rule are never traced."""
+        traced_app.test_client().get("/health")
+        traced_app.extensions["tracer"].exporter.flush()
+
+        assert Collector.payloads == []
+
+    def test_collector_receives_otlp(self, traced_app):
+        """The collector gets an ExportTraceServiceRequest with the service name."""
+        traced_app.test_client().get("/about")
+        traced_app.extensions["tracer"].exporter.flush()
+
+        resource = Collector.payloads[0]["resourceSpans"][0]["resource"]
+        assert {
+            "key": "service.name",
+            "value": {"stringValue": "kusse-tech-studio"},
+        } in resource["attributes"]
+
+    def test_export_does_not_wait_for_file_writes(self, traced_app):
+        """Requests keep queueing spans while a flush is writing the file."""
+        exporter = traced_app.extensions["tracer"].exporter
+        client = traced_app.test_client()
+        client.get("/about")
+
+        with exporter._file_lock:
+            flushing = threading.Thread(target=exporter.flush)
+            flushing.start()
+            while exporter._pending:
+                time.sleep(0.001)
+            serving = threading.Thread(target=client.get, args=("/about",))
+            serving.start()
+            serving.join(5)
+            assert not serving.is_alive()
+            assert exporter._pending
+        flushing.join(5)
@@ -0,0 +1,117 @@
+"""Unit tests for the project repository and its content snapshot."""
+
+import os
+
+import pytest
+
+from app.core.memory import mapping_memory, process_memory
+from app.core.segments import SegmentStore, SegmentWriter
+from app.models import snapshot
+from app.models.project import ProjectRepository
+
+
+@pytest.fixture
+def installed_snapshot(tmp_path, monkeypatch):
+    """Serve repository content from a snapshot in a temporary folder."""
+    path = str(tmp_path / "content.segment")
+    snapshot.write_content_snapshot(path)
+    monkeypatch.setattr(snapshot, "_store", SegmentStore(path))
+    monkeypatch.setattr(snapshot, "_snapshot", None)
+    return path
+
+
+class TestSegments:
+    """Test the mapped segment format."""
+
+    def test_entries_are_zero_copy_views(self, tmp_path):
+        """Arrays come back as cast memoryviews over the mapping."""
+        path = str(tmp_path / "data.segment")
+        writer = SegmentWriter({"name": "test"})
+        writer.add_array("numbers", "I", [3, 1, 4])
+        writer.add_json("doc", {"a": 1})
+        writer.write(path)
+
+        store = SegmentStore(path)
+        numbers = store.current.array("numbers")
+        assert isinstance(numbers, memoryview)
+        assert list(numbers) == [3, 1, 4]
+        assert store.current.json("doc") == {"a": 1}
+        assert store.current.meta == {"name": "test"}
+
+    def test_reload_swaps_to_replaced_file(self, tmp_path):
+        """Readers keep the old segment until the file is replaced."""
+        path = str(tmp_path / "data.segment")
+        SegmentWriter({"version": 1}).write(path)
+        store = SegmentStore(path)
+        old = store.current
+
+        assert store.reload() is False
+        SegmentWriter({"version": 2}).write(path)
+        assert store.reload() is True
+        assert store.current.meta == {"version": 2}
+        assert old.meta == {"version": 1}
+
+
+class TestProjectRepository:
+    """Test that snapshot queries match the in-memory data."""
+
+    def test_snapshot_matches_source_data(self, installed_snapshot):
+        """Every query returns the same projects as the raw data."""
+        expected = sorted(ProjectRepository._projects_data, key=lambda p: p["id"])
+        projects = ProjectRepository.get_all()
+
+        assert [p.id for p in projects] == [p["id"] for p in expected]
+        assert (
+            ProjectRepository.get_by_id(expected[0]["id"]).title == expected[0]["title"]
+        )
+        assert ProjectRepository.get_by_id(999999) is None
+        assert {p.id for p in ProjectRepository.get_featured()} == {
+            p["id"] for p in expected if p["featured"]
+        }
+        category = expected[0]["category"]
+        assert {p.id for p in ProjectRepository.get_by_category(category)} == {
+            p["id"] for p in expected if p["category"] == category
+        }
+
+    def test_search_and_technology_facets(self, installed_snapshot):
+        """Search needs every word; technology facets are case-insensitive."""
+        technology = ProjectRepository._projects_data[0]["technologies"][0]
+        by_facet = ProjectRepository.get_by_technology(technology.upper())
+        assert ProjectRepository._projects_data[0]["id"] in {p.id for p in by_facet}
+
+        title_words = ProjectRepository._projects_data[0]["title"]
+        assert ProjectRepository._projects_data[0]["id"] in {
+            p.id for p in ProjectRepository.search(title_words)
+        }
+        assert ProjectRepository.search("zzzz-no-match") == []
+
+    def test_objects_are_built_once_per_segment(self, installed_snapshot):
+        """Queries reuse decoded projects until a new segment is swapped in."""
+        first = ProjectRepository.get_all()
+        assert ProjectRepository.get_all()[0] is first[0]
+        assert ProjectRepository.get_by_id(first[0].id) is first[0]
+
+        snapshot.write_content_snapshot(installed_snapshot, force=True)
+        snapshot._store.reload()
+        assert ProjectRepository.get_all()[0] is not first[0]
+
+    def test_category_is_case_insensitive(self, installed_snapshot, monkeypatch):
+        """The snapshot and the in-memory fallback match categories alike."""
+        category = ProjectRepository._projects_data[0]["category"]
+        from_snapshot = {
+            p.id for p in ProjectRepository.get_by_category(category.upper())
+        }
+        monkeypatch.setattr(snapshot, "_store", None)
+        fallback = {p.id for p in ProjectRepository.get_by_category(category.upper())}
+        assert from_snapshot == fallback
+        assert ProjectRepository._projects_data[0]["id"] in fallback
+
+    @pytest.mark.skipif(
+        not os.path.exists("/proc/self/smaps_rollup"), reason="Linux only"
+    )
+    def test_memory_report(self, installed_snapshot):
+        """Process and per-mapping memory are read from /proc."""
+        ProjectRepository.get_all()
+        usage = process_memory()
+        assert usage["rss"] >= usage["uss"] > 0
+        assert mapping_memory(installed_snapshot)["rss"] > 0